@@ -0,0 +1,193 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import gc
+import statistics
+import timeit
+import tracemalloc
+
+from typing import Callable, List, Tuple
+
+from easyb.bit import create_crc, decode_u16, decode_u32, encode_u32
+from easyb.definitions import Direction, Length, Priority
+from easyb.message import Message
+from easyb.message.stream import Stream
+
+__all__ = [
+    "Result",
+    "measure",
+    "measure_speed",
+    "cases"
+]
+
+#: request "Messwert lesen" for address 1
+request = bytes([0xfe, 0x00, 0x3d])
+
+#: response with value -0.04
+response = bytes([0xfe, 0x0d, 0x1e, 0x72, 0xff, 0x84, 0x00, 0xfc, 0x05])
+
+#: variable length response with 32 triplets
+variable = bytes([0xfe, 0x07, 0x28]) + bytes(item for n in range(32) for item in (n, 255 - n, create_crc(n, 255 - n)))
+
+
+class Result(object):
+
+    __slots__ = ("name", "ops", "memory", "allocations")
+
+    def __init__(self, name: str, ops: float, memory: float, allocations: float):
+        self.name = name
+        self.ops = ops
+        self.memory = memory
+        self.allocations = allocations
+        return
+
+    def to_dict(self) -> dict:
+        data = {
+            "ops": self.ops,
+            "memory": self.memory,
+            "allocations": self.allocations
+        }
+        return data
+
+
+def _stream_encode():
+    stream = Stream(Length.Byte9)
+    stream.set_data([0x01, 0x0d, 0x00, 0x8d, 0xff, 0x00, 0xff, 0xfc, 0x00])
+    stream.encode()
+    return stream
+
+
+def _stream_decode():
+    stream = Stream(Length.Byte3)
+    stream.decode(response)
+    return stream
+
+
+def _stream_verify_crc():
+    stream = Stream(Length.Byte3)
+    stream.decode(variable)
+    return stream
+
+
+def _message_encode():
+    message = Message(address=1, code=15, priority=Priority.NoPriority, length=Length.Byte6,
+                      direction=Direction.FromMaster, param=[202, 0])
+    message.encode()
+    return message
+
+
+def _message_decode():
+    message = Message()
+    message.decode(response[0:3])
+    message.stream.append(response[3:9])
+    message.stream.length = message.length
+    return message
+
+
+def _message_round_trip():
+    message1 = Message(address=1, code=0, priority=Priority.NoPriority, length=Length.Byte3,
+                       direction=Direction.FromMaster)
+    message1.encode()
+
+    message2 = Message()
+    message2.decode(message1.stream.bytes)
+    return message2
+
+
+cases: List[Tuple[str, Callable]] = [
+    ("create_crc", lambda: create_crc(0xfe, 0x00)),
+    ("decode_u16", lambda: decode_u16(0xf7, 0xfc)),
+    ("decode_u32", lambda: decode_u32(0x72, 0xff, 0x00, 0xfc)),
+    ("encode_u32", lambda: encode_u32(53.84)),
+    ("Stream.encode", _stream_encode),
+    ("Stream.decode", _stream_decode),
+    ("Stream.verify_crc", _stream_verify_crc),
+    ("Message.encode", _message_encode),
+    ("Message.decode", _message_decode),
+    ("Message.round_trip", _message_round_trip)
+]
+
+
+def _measure_memory(call: Callable, number: int) -> Tuple[float, float]:
+    # the results are kept alive, so the snapshot difference holds everything allocated by the calls
+    results = [None] * number
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+
+    # caches and free lists are filled before the measurement
+    for n in range(100):
+        call()
+
+    gc.collect()
+    tracemalloc.start()
+
+    start = tracemalloc.take_snapshot().filter_traces(ignore)
+    for n in range(number):
+        results[n] = call()
+    end = tracemalloc.take_snapshot().filter_traces(ignore)
+
+    tracemalloc.stop()
+
+    diff = end.compare_to(start, "filename")
+    size = sum(x.size_diff for x in diff)
+    count = sum(x.count_diff for x in diff)
+
+    del results
+    return float(size) / float(number), float(count) / float(number)
+
+
+def measure_speed(call: Callable, repeat: int = 5) -> float:
+    """Measure the speed of one benchmark case.
+
+    :param call: function to measure.
+    :type call: Callable
+
+    :param repeat: number of timing runs, the fastest is used.
+    :type repeat: int
+
+    :return: operations per second.
+    :rtype: float
+    """
+    timer = timeit.Timer(call)
+    number, _ = timer.autorange()
+
+    best = min(timer.repeat(repeat=repeat, number=number))
+    ops = float(number) / best
+    return ops
+
+
+def measure(name: str, call: Callable, repeat: int = 5) -> Result:
+    """Measure speed and memory of one benchmark case.
+
+    :param name: name of benchmark.
+    :type name: str
+
+    :param call: function to measure.
+    :type call: Callable
+
+    :param repeat: number of runs, the fastest time and the median memory are used.
+    :type repeat: int
+
+    :return: result with operations per second, allocated bytes and allocations per call.
+    :rtype: Result
+    """
+    ops = measure_speed(call, repeat)
+
+    runs = [_measure_memory(call, 10000) for _ in range(repeat)]
+    memory = statistics.median(x[0] for x in runs)
+    allocations = statistics.median(x[1] for x in runs)
+    return Result(name, ops, memory, allocations)
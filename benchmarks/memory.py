@@ -0,0 +1,106 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import gc
+import tracemalloc
+
+import easyb
+
+from typing import Callable, List, Tuple
+
+from easyb.command import Command
+from easyb.config import Error, Status, Unit
+from easyb.data.base import Column, Info, Type
+from easyb.definitions import Length
+from easyb.message import Message
+from easyb.message.stream import Stream
+
+__all__ = [
+    "measure",
+    "run"
+]
+
+
+def _create_error() -> Error:
+    item = Error()
+    item.load({"code": 16352, "text": "Value over measurement range"})
+    return item
+
+
+def _create_status() -> Status:
+    item = Status()
+    item.load({"bit": "0x0001", "text": "Max. alarm"})
+    return item
+
+
+def _create_unit() -> Unit:
+    item = Unit()
+    item.load({"code": 1, "value": "°C"})
+    return item
+
+
+objects = [
+    ("Message", lambda: Message(address=1, code=0)),
+    ("Stream", lambda: Stream(Length.Byte9)),
+    ("Command", lambda: Command(name="Messwert lesen", code=0)),
+    ("Column", lambda: Column(0, "value", "Temperature", Type.float)),
+    ("Info", lambda: Info("ID", Type.string, "")),
+    ("Error", _create_error),
+    ("Status", _create_status),
+    ("Unit", _create_unit)
+]
+
+
+def measure(create: Callable, number: int = 10000) -> float:
+    """Measure the memory of one object.
+
+    :param create: function to create the object.
+    :type create: Callable
+
+    :param number: number of objects to create.
+    :type number: int
+
+    :return: allocated bytes per object.
+    :rtype: float
+    """
+    gc.collect()
+    tracemalloc.start()
+
+    start, _ = tracemalloc.get_traced_memory()
+    items = [create() for _ in range(number)]
+    end, _ = tracemalloc.get_traced_memory()
+
+    tracemalloc.stop()
+
+    result = float(end - start) / float(number)
+    del items
+    return result
+
+
+def run(number: int = 10000) -> List[Tuple[str, float]]:
+    result = []
+
+    for name, create in objects:
+        size = measure(create, number)
+        result.append((name, size))
+        easyb.log.inform("MEMORY", "{0:s}: {1:.1f} bytes per object".format(name.ljust(10), size))
+    return result
+
+
+if __name__ == '__main__':
+    run()
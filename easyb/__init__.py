@@ -21,13 +21,20 @@ __all__ = [
     "devices",
     "message",
 
+    "aio",
     "bit",
+    "bus",
     "command",
     "config",
     "console",
     "definitions",
     "device",
+    "engine",
     "logging",
+    "multiplexer",
+    "process",
+    "scheduler",
+    "timeout",
     "utils"
 ]
 
@@ -0,0 +1,334 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import time
+import weakref
+import asyncio
+import easyb
+import serial
+
+from typing import Any, AsyncIterator, Union
+
+from easyb.data.base import Sample
+from easyb.definitions import Length
+from easyb.device import Device
+from easyb.message import Message, header_table
+from easyb.message.parser import message_size
+
+__all__ = [
+    "AsyncDevice",
+    "get_port_lock"
+]
+
+_port_locks = weakref.WeakKeyDictionary()
+
+
+def get_port_lock(port: Any) -> asyncio.Lock:
+    """Get the lock of a serial port for the running event loop.
+
+    Devices on one serial port share the same lock, so their requests are not interleaved.
+
+    :param port: serial port.
+    :type port: Serial
+
+    :return: lock of the serial port.
+    :rtype: asyncio.Lock
+    """
+    loop = asyncio.get_running_loop()
+
+    locks = _port_locks.get(loop)
+    if locks is None:
+        locks = {}
+        _port_locks[loop] = locks
+
+    lock = locks.get(id(port))
+    if lock is None:
+        lock = asyncio.Lock()
+        locks[id(port)] = lock
+    return lock
+
+
+class AsyncDevice(object):
+    """Coroutine interface for a device.
+
+    The serial port is polled without blocking and waiting is done with asyncio.sleep(), so one event loop can drive
+    many ports. Encoding, decoding and the commands are taken from the wrapped device, every coroutine can be
+    cancelled or limited with asyncio.wait_for().
+    """
+
+    @property
+    def device(self) -> Device:
+        return self._device
+
+    @property
+    def name(self) -> str:
+        return self._device.name
+
+    def __init__(self, device: Device, poll_time: float = 0.0):
+        self._device = device
+        self._poll_time = poll_time
+        return
+
+    def get_poll_time(self) -> float:
+        if self._poll_time > 0.0:
+            return self._poll_time
+
+        # about one character time, 10 bit per character
+        poll_time = 0.001
+        if self._device.baudrate > 0:
+            poll_time = max(10.0 / float(self._device.baudrate), poll_time)
+        return poll_time
+
+    async def connect(self) -> bool:
+        """Open the serial connection without blocking the event loop.
+
+        :return: True if successfull, otherwise false
+        :rtype: bool
+        """
+        device = self._device
+
+        if device.serial is None:
+            device.setup()
+
+        loop = asyncio.get_running_loop()
+        check = await loop.run_in_executor(None, device.connect)
+        return check
+
+    async def disconnect(self) -> bool:
+        loop = asyncio.get_running_loop()
+        check = await loop.run_in_executor(None, self._device.disconnect)
+        return check
+
+    def _read_waiting(self, data: bytearray, number: int) -> bool:
+        ser = self._device.serial
+
+        try:
+            waiting = ser.in_waiting
+            if waiting > 0:
+                if number > 0:
+                    waiting = min(waiting, number - len(data))
+                data.extend(ser.read(waiting))
+        except serial.SerialException as e:
+            easyb.log.error("Problem during reading of message!")
+            easyb.log.exception(e)
+            return False
+        return True
+
+    async def read(self, number: int, deadline: float) -> bytes:
+        """Read a number of bytes, only bytes which are already waiting are read from the port.
+
+        :param number: number of bytes.
+        :type number: int
+
+        :param deadline: end of waiting, from time.monotonic().
+        :type deadline: float
+
+        :return: received bytes, less than number if the deadline has passed.
+        :rtype: bytes
+        """
+        result = bytearray()
+        poll_time = self.get_poll_time()
+
+        while len(result) < number:
+            check = self._read_waiting(result, number)
+            if check is False:
+                break
+
+            if len(result) >= number:
+                break
+
+            now = time.monotonic()
+            if now >= deadline:
+                break
+
+            await asyncio.sleep(min(poll_time, deadline - now))
+
+        return bytes(result)
+
+    async def read_bulk(self, deadline: float) -> bytes:
+        """Read all data until the line is idle for the read gap of the device.
+
+        :param deadline: end of waiting for the first byte, from time.monotonic().
+        :type deadline: float
+
+        :return: received bytes.
+        :rtype: bytes
+        """
+        result = bytearray()
+
+        gap = self._device.get_read_gap()
+        poll_time = gap / 4.0
+        last = None
+
+        while True:
+            number = len(result)
+
+            check = self._read_waiting(result, 0)
+            if check is False:
+                break
+
+            now = time.monotonic()
+
+            if len(result) > number:
+                last = now
+                continue
+
+            if (last is None) and (now >= deadline):
+                break
+
+            if (last is not None) and ((now - last) >= gap):
+                break
+
+            await asyncio.sleep(poll_time)
+
+        return bytes(result)
+
+    async def execute(self, command) -> Union[None, Message]:
+        """Send a command and wait for the response.
+
+        The request is done while holding the lock of the serial port, devices on one serial port share the same lock.
+
+        :param command: command to send.
+        :type command: Command
+
+        :return: received message or None.
+        :rtype: Message, None
+        """
+        async with get_port_lock(self._device.serial):
+            message = await self._execute(command)
+        return message
+
+    async def _execute(self, command) -> Union[None, Message]:
+        device = self._device
+
+        frame = device.compile(command)
+        if frame is None:
+            return None
+
+        try:
+            # drop the rest of a cancelled request
+            device.serial.reset_input_buffer()
+        except serial.SerialException as e:
+            easyb.log.error("Problem during reset of serial port!")
+            easyb.log.exception(e)
+            return None
+
+        loop = asyncio.get_running_loop()
+        start = time.monotonic()
+
+        check = await loop.run_in_executor(None, device.send_frame, frame)
+        if check is False:
+            return None
+
+        # same turnaround as Device.wait_response(), nothing is read before the wait time has passed
+        minimum = start + device.wait_time
+        now = time.monotonic()
+        if now < minimum:
+            await asyncio.sleep(minimum - now)
+
+        deadline = start + device.get_timeout(command.address)
+
+        data = await self.read(3, deadline)
+        if len(data) < 3:
+            easyb.log.warn(self.name, "No response from address {0:d}!".format(command.address))
+
+            if device.adaptive is not None:
+                device.adaptive.miss(command.address)
+            return None
+
+        if device.adaptive is not None:
+            device.adaptive.add(command.address, time.monotonic() - start)
+
+        length = header_table[data[1]][2]
+
+        if length is Length.Variable:
+            data = data + await self.read_bulk(time.monotonic() + device.timeout)
+        else:
+            number = message_size.get(length, 3)
+            if number > 3:
+                data = data + await self.read(number - 3, time.monotonic() + device.timeout)
+
+            if len(data) < number:
+                easyb.log.error("Response of address {0:d} is incomplete!".format(command.address))
+                return None
+
+            command.response_size = number
+
+        message = device.create_message(data)
+        return message
+
+    async def run_command(self, number: int) -> bool:
+        command = self._device.get_command(number)
+
+        if command is None:
+            return False
+
+        message = await self.execute(command)
+        if message is None:
+            return False
+
+        check = command.call(message)
+        return check
+
+    async def samples(self, number: int = 0, interval: float = None, count: int = 0) -> AsyncIterator[Sample]:
+        """Measure periodically and yield the decoded values.
+
+        Every sample is also stored in the data of the device.
+
+        :param number: number of the measurement command.
+        :type number: int
+
+        :param interval: time between measurements, default is the device interval.
+        :type interval: float
+
+        :param count: number of measurements, 0 to measure until cancelled.
+        :type count: int
+        """
+        device = self._device
+        command = device.get_command(number)
+
+        if command is None:
+            return
+
+        if interval is None:
+            interval = device.interval
+
+        counter = 0
+        next_time = time.monotonic()
+
+        while (count == 0) or (counter < count):
+            message = await self.execute(command)
+
+            if message is not None:
+                error, value = device.decode_value(message)
+                device.store_value(error, value)
+                yield device.sample
+
+            device.interval_counter += 1
+            counter += 1
+
+            if (count != 0) and (counter >= count):
+                break
+
+            next_time += interval
+            now = time.monotonic()
+            if next_time > now:
+                await asyncio.sleep(next_time - now)
+            else:
+                next_time = now
+        return
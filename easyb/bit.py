@@ -19,10 +19,13 @@
 import easyb
 import sys
 
-from typing import Tuple, List, Union
+from typing import Tuple, List, Union, Any
 from easyb.config import Error
 
 import math
+import numpy
+
+from collections import OrderedDict
 
 __all__ = [
     "debug_data",
@@ -32,10 +35,18 @@ __all__ = [
     "convert_u32",
 
     "decode_u16",
+    "decode_u16_many",
+    "get_u16_error",
     "decode_u32",
+    "decode_u32_many",
+
+    "ErrorCodes",
+    "DecodeCache",
 
+    "crc_table",
     "create_crc",
-    "check_crc"
+    "check_crc",
+    "verify_crc_batch"
 ]
 
 
@@ -108,7 +119,7 @@ def convert_u32(inputa: int, inputb: int) -> int:
     return data
 
 
-def decode_u16(byte3: int, byte4: int) -> Tuple[int, float]:
+def _decode_u16_calc(byte3: int, byte4: int) -> Tuple[int, float]:
     u16_integer = convert_u16(byte3, byte4)
 
     float_pos = crop_u16(u16_integer & 0xc000)
@@ -118,14 +129,85 @@ def decode_u16(byte3: int, byte4: int) -> Tuple[int, float]:
     u16_integer = crop_u16(u16_integer & 0x3fff)
 
     if (u16_integer >= 0x3fe0) and (u16_integer <= 0x3fff):
-        error = int(u16_integer) - 16352
+        error = int(u16_integer)
         return error, 0.0
 
     nenner = 10 ** int(float_pos)
     zaehler = float(u16_integer) - 2048.0
 
     float_value = float(zaehler / nenner)
-    return 0, float_value
+    return -1, float_value
+
+
+def _create_u16_tables() -> Tuple[numpy.ndarray, numpy.ndarray]:
+    index = numpy.arange(65536, dtype=numpy.uint32)
+    u16_integer = index ^ 0xff00
+
+    float_pos = u16_integer >> 14
+    u16_integer = u16_integer & 0x3fff
+
+    is_error = u16_integer >= 0x3fe0
+
+    errors = numpy.where(is_error, u16_integer, -1).astype(numpy.int16)
+    values = (u16_integer.astype(numpy.float64) - 2048.0) / (10.0 ** float_pos)
+    values[is_error] = 0.0
+
+    errors.setflags(write=False)
+    values.setflags(write=False)
+    return errors, values
+
+
+#: precomputed error codes (-1 if there is no error) and values of decode_u16, index is (byte3 << 8) | byte4
+u16_errors, u16_values = _create_u16_tables()
+
+
+def decode_u16(byte3: int, byte4: int) -> Tuple[int, float]:
+    """Decode a 16 bit measurement.
+
+    :return: error code (-1 if there is no error) and value.
+    :rtype: Tuple[int, float]
+    """
+    index = ((byte3 & 0xff) << 8) | (byte4 & 0xff)
+    return int(u16_errors[index]), float(u16_values[index])
+
+
+def decode_u16_many(data: Any) -> Tuple[numpy.ndarray, numpy.ndarray]:
+    """Decode an array of (byte3, byte4) pairs.
+
+    :param data: bytes or array with a sequence of byte pairs.
+    :type data: bytes, bytearray, numpy.ndarray
+
+    :return: array with error codes (-1 if there is no error) and array with values.
+    :rtype: Tuple[numpy.ndarray, numpy.ndarray]
+    """
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        pairs = numpy.frombuffer(data, dtype=numpy.uint8)
+    else:
+        pairs = numpy.asarray(data, dtype=numpy.uint8)
+
+    if (pairs.size % 2) != 0:
+        raise ValueError("Data size is not a pair! ({0:d})".format(pairs.size))
+
+    pairs = pairs.reshape(-1, 2)
+
+    index = (pairs[:, 0].astype(numpy.uint16) << 8) | pairs[:, 1]
+    return u16_errors[index], u16_values[index]
+
+
+def get_u16_error(code: int) -> Union[Error, None]:
+    """Map an error code of decode_u16 to the configured error.
+
+    :param code: error code of decode_u16, -1 if the value is valid.
+    :type code: int
+
+    :return: error or None.
+    :rtype: Error, None
+    """
+    if code < 0:
+        return None
+
+    error = easyb.conf.get_error(code)
+    return error
 
 
 def decode_u32(byte3: int, byte4: int, byte6: int, byte7: int) -> Tuple[Union[Error, None], float]:
@@ -156,6 +238,142 @@ def decode_u32(byte3: int, byte4: int, byte6: int, byte7: int) -> Tuple[Union[Er
     return None, float_value
 
 
+class DecodeCache(object):
+    """Bounded LRU cache for decode_u32, keyed on the raw payload bytes."""
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def len(self) -> int:
+        return len(self._items)
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    @property
+    def evictions(self) -> int:
+        return self._evictions
+
+    def __init__(self, size: int = 256):
+        if size < 1:
+            raise ValueError("Cache size must be at least 1: {0:d}".format(size))
+
+        self._size = size
+        self._items = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        return
+
+    def clear(self):
+        self._items.clear()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        return
+
+    def decode_u32(self, byte3: int, byte4: int, byte6: int, byte7: int) -> Tuple[Union[Error, None], float]:
+        key = (byte3 << 24) | (byte4 << 16) | (byte6 << 8) | byte7
+
+        result = self._items.get(key, None)
+        if result is not None:
+            self._items.move_to_end(key)
+            self._hits += 1
+            return result
+
+        self._misses += 1
+
+        result = decode_u32(byte3, byte4, byte6, byte7)
+        self._items[key] = result
+
+        if len(self._items) > self._size:
+            self._items.popitem(last=False)
+            self._evictions += 1
+        return result
+
+
+#: divisors of decode_u32 for all decimal positions, index is (255 - byte3) >> 3
+u32_divisors = numpy.array([float(10.0) ** float(float_pos - 15) for float_pos in range(32)], dtype=numpy.float64)
+
+
+class ErrorCodes(object):
+    """Error codes of decode_u32_many, mapped to Error objects only when accessed."""
+
+    @property
+    def codes(self) -> numpy.ndarray:
+        return self._codes
+
+    def __init__(self, codes: numpy.ndarray):
+        self._codes = codes
+        return
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def __getitem__(self, index: int) -> Union[Error, None]:
+        code = int(self._codes[index])
+        if code < 0:
+            return None
+
+        error = easyb.conf.get_error(code)
+        return error
+
+    def __iter__(self):
+        for index in range(len(self._codes)):
+            yield self[index]
+
+
+def decode_u32_many(data: Any) -> Tuple[ErrorCodes, numpy.ndarray]:
+    """Decode an array of Byte9 messages.
+
+    :param data: bytes or array with a sequence of 9 byte messages, e.g. as (N, 9) uint8 array.
+    :type data: bytes, bytearray, numpy.ndarray
+
+    :return: error codes (-1 if there is no error) and array with values.
+    :rtype: Tuple[ErrorCodes, numpy.ndarray]
+    """
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        frames = numpy.frombuffer(data, dtype=numpy.uint8)
+    else:
+        frames = numpy.asarray(data, dtype=numpy.uint8)
+
+    if (frames.size % 9) != 0:
+        raise ValueError("Data size is not a Byte9 message! ({0:d})".format(frames.size))
+
+    frames = frames.reshape(-1, 9)
+
+    byte3 = 255 - frames[:, 3].astype(numpy.uint32)
+    byte4 = frames[:, 4].astype(numpy.uint32)
+    byte6 = 255 - frames[:, 6].astype(numpy.uint32)
+    byte7 = frames[:, 7].astype(numpy.uint32)
+
+    u32_integer = (byte3 << 24) | (byte4 << 16) | (byte6 << 8) | byte7
+    u32_integer = u32_integer & 0x07ffffff
+
+    divisor = u32_divisors[byte3 >> 3]
+
+    is_valid = u32_integer < (100000000 + 0x2000000)
+    codes = numpy.where(is_valid, -1, u32_integer.astype(numpy.int64) - 0x02000000 - 100000000)
+
+    is_negative = (u32_integer & 0x04000000) != 0
+
+    u32_integer = numpy.where(is_negative, u32_integer | 0xf8000000, u32_integer)
+    u32_integer = u32_integer + numpy.uint32(0x02000000)
+
+    i32_integer = u32_integer.astype(numpy.uint32).view(numpy.int32)
+    values = i32_integer.astype(numpy.float64) / divisor
+    values[~is_valid] = 0.0
+
+    return ErrorCodes(codes.astype(numpy.int32)), values
+
+
 def encode_u32(float_value: float) -> List[int]:
     float_pos = len(str(math.floor(float_value)))
 
@@ -186,7 +404,7 @@ def encode_u32(float_value: float) -> List[int]:
     return result
 
 
-def create_crc(byte1: int, byte2: int) -> int:
+def _create_crc_bitwise(byte1: int, byte2: int) -> int:
     ui16_integer = (byte1 << 8) | byte2
 
     counter = 0
@@ -205,8 +423,29 @@ def create_crc(byte1: int, byte2: int) -> int:
     return crc
 
 
+def _create_crc_table() -> bytes:
+    # The checksum is a CRC-8 (polynomial 0x07) over both bytes, so the 256 single byte remainders are enough to
+    # build the complete table: crc(byte1, byte2) = 255 - crc8[crc8[byte1] ^ byte2]
+    crc8 = [255 - _create_crc_bitwise(0, value) for value in range(256)]
+
+    table = bytes(255 - crc8[crc8[byte1] ^ byte2] for byte1 in range(256) for byte2 in range(256))
+    return table
+
+
+#: precomputed checksums for all byte pairs, index is (byte1 << 8) | byte2
+crc_table = _create_crc_table()
+
+#: the checksum table as numpy array for batch operations
+crc_array = numpy.frombuffer(crc_table, dtype=numpy.uint8)
+
+
+def create_crc(byte1: int, byte2: int) -> int:
+    crc = crc_table[((byte1 & 0xff) << 8) | (byte2 & 0xff)]
+    return crc
+
+
 def check_crc(byte1: int, byte2: int, crc: int) -> bool:
-    value_crc = create_crc(byte1, byte2)
+    value_crc = crc_table[((byte1 & 0xff) << 8) | (byte2 & 0xff)]
 
     if value_crc == crc:
         return True
@@ -215,3 +454,29 @@ def check_crc(byte1: int, byte2: int, crc: int) -> bool:
                                                                                      hex(value_crc))
     easyb.log.error(error_text)
     return False
+
+
+def verify_crc_batch(data: Any) -> Tuple[numpy.ndarray, int]:
+    """Verify the checksums of a buffer of triplets in one pass.
+
+    :param data: bytes, bytearray or numpy array with a sequence of triplets.
+    :type data: bytes, bytearray, numpy.ndarray
+
+    :return: boolean mask with one entry per triplet (True if the checksum is valid) and the number of failures.
+    :rtype: Tuple[numpy.ndarray, int]
+    """
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        triplets = numpy.frombuffer(data, dtype=numpy.uint8)
+    else:
+        triplets = numpy.asarray(data, dtype=numpy.uint8)
+
+    if (triplets.size % 3) != 0:
+        raise ValueError("Data size is not a triplet! ({0:d})".format(triplets.size))
+
+    triplets = triplets.reshape(-1, 3)
+
+    index = (triplets[:, 0].astype(numpy.uint16) << 8) | triplets[:, 1]
+    mask = crc_array[index] == triplets[:, 2]
+
+    failed = int(mask.size - numpy.count_nonzero(mask))
+    return mask, failed
@@ -0,0 +1,296 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import threading
+import easyb
+import serial
+
+from serial import Serial
+from typing import Dict, List, Union
+
+from easyb.device import Device
+from easyb.devices import get_device
+from easyb.scheduler import Ticker, CommandScheduler
+
+__all__ = [
+    "BusMaster"
+]
+
+
+class BusMaster(object):
+    """Bus master for several devices on one serial line.
+
+    Every address gets its own device object with its own data, all devices share one serial connection and are
+    polled one after another in a round-robin cycle.
+    """
+
+    name: str = "BUS"
+
+    # members for serial communication
+    serial: Serial = None
+    lock: threading.RLock = None
+    port: str = ""
+    baudrate: int = 0
+    timeout: float = 2
+    write_timeout: float = 2
+
+    # members for reading via thread
+    interval: float = 2.0
+    abort: bool = False
+    status: bool = False
+    active: bool = False
+    interval_counter: int = 0
+    ticker: Ticker = None
+
+    @property
+    def devices(self) -> Dict[int, Device]:
+        return self._devices
+
+    @property
+    def addresses(self) -> List[int]:
+        return list(self._devices.keys())
+
+    def __init__(self, **kwargs):
+        self._devices = {}
+        self.lock = threading.RLock()
+
+        item = kwargs.get("port", "")
+        if item is not None:
+            self.port = item
+
+        item = kwargs.get("baudrate", 4800)
+        if item is not None:
+            self.baudrate = item
+
+        item = kwargs.get("timeout", 2)
+        if item is not None:
+            self.timeout = item
+
+        item = kwargs.get("write_timeout", 2)
+        if item is not None:
+            self.write_timeout = item
+
+        item = kwargs.get("interval", 2.0)
+        if item is not None:
+            self.interval = item
+        return
+
+    def get_device(self, address: int) -> Union[None, Device]:
+        device = self._devices.get(address, None)
+
+        if device is None:
+            easyb.log.error("Address is unknown: {0:d}".format(address))
+        return device
+
+    def add_device(self, address: int, device_name: str, **kwargs) -> Union[None, Device]:
+        """Create a device for an address on the bus.
+
+        :param address: bus address of the device.
+        :type address: int
+
+        :param device_name: name of the device type, see easyb.devices.get_devices().
+        :type device_name: str
+
+        :param kwargs: further options for the device.
+
+        :return: created device or None.
+        :rtype: Device, None
+        """
+        if address in self._devices:
+            easyb.log.error("Address is already used: {0:d}".format(address))
+            return None
+
+        c = get_device(device_name)
+        if c is None:
+            easyb.log.error("Device {0:s} is unknown!".format(device_name))
+            return None
+
+        # noinspection PyCallingNonCallable
+        device = c(address=address, port=self.port, baudrate=self.baudrate, timeout=self.timeout,
+                   write_timeout=self.write_timeout, interval=self.interval, **kwargs)
+        device.serial = self.serial
+        device.lock = self.lock
+
+        self._devices[address] = device
+        return device
+
+    def setup(self):
+        ser = Serial(baudrate=self.baudrate,
+                     bytesize=serial.EIGHTBITS,
+                     parity=serial.PARITY_NONE,
+                     stopbits=serial.STOPBITS_ONE,
+                     timeout=self.timeout,
+                     xonxoff=0,
+                     rtscts=0,
+                     dsrdtr=0,
+                     interCharTimeout=None,
+                     writeTimeout=self.write_timeout)
+        self.serial = ser
+
+        for device in self._devices.values():
+            device.serial = ser
+        return
+
+    def connect(self) -> bool:
+        """Open the shared serial connection.
+
+        :return: True if successfull, otherwise false
+        :rtype: bool
+        """
+
+        if self.port == "":
+            easyb.log.error("Port is missing/not configured!")
+            return False
+
+        if self.serial is None:
+            easyb.log.error("Serial port is not set up!")
+            return False
+
+        easyb.log.debug1(self.name, "Port:          {0:s}".format(self.port))
+        easyb.log.debug1(self.name, "Baudrate:      {0:d}".format(self.baudrate))
+        easyb.log.debug1(self.name, "Addresses:     {0:s}".format(", ".join(str(x) for x in self.addresses)))
+        easyb.log.debug1(self.name, "Timeout:       {0:.3f}".format(self.timeout))
+        easyb.log.debug1(self.name, "Write timeout: {0:.3f}".format(self.write_timeout))
+
+        self.serial.port = self.port
+
+        try:
+            self.serial.open()
+        except serial.SerialException as e:
+            easyb.log.error("Problem during opening of serial port!")
+            easyb.log.exception(e)
+            return False
+
+        easyb.log.inform(self.name, "Establish connection to {0:s}".format(self.port))
+        return True
+
+    def disconnect(self) -> bool:
+        """Close the shared serial connection.
+        """
+
+        if self.serial is None:
+            easyb.log.error("Serial port is not set up!")
+            return False
+
+        if self.serial.is_open is False:
+            easyb.log.warn(self.name, "Connection to {0:s} is already closed!".format(self.port))
+            return False
+
+        try:
+            self.serial.close()
+        except serial.SerialException as e:
+            easyb.log.error("Problem during closing of serial port!")
+            easyb.log.exception(e)
+            return False
+
+        easyb.log.inform(self.name, "Disconnect from {0:s}".format(self.port))
+        return True
+
+    def prepare(self) -> bool:
+        result = True
+
+        for (address, device) in self._devices.items():
+            check = device.prepare()
+            if check is False:
+                easyb.log.warn(self.name, "Unable to prepare address {0:d}!".format(address))
+                result = False
+        return result
+
+    def poll(self) -> bool:
+        """Run one measurement for every address on the bus.
+
+        :return: True if all devices have answered, otherwise False.
+        :rtype: bool
+        """
+        result = True
+
+        for (address, device) in self._devices.items():
+            check = device.run()
+            device.status = check
+            device.interval_counter += 1
+
+            if check is False:
+                easyb.log.warn(self.name, "No measurement from address {0:d}!".format(address))
+                result = False
+        return result
+
+    # noinspection PyUnusedLocal
+    def do_abort(self, signum, frame):
+        self.abort = True
+        return
+
+    def run_schedule(self):
+        """Run the scheduled commands of all devices until the loop is aborted."""
+        scheduler = CommandScheduler()
+
+        for device in self._devices.values():
+            scheduler.add_device(device)
+        easyb.log.inform(self.name, "Start {0:d} scheduled commands".format(len(scheduler.jobs)))
+
+        while self.abort is False:
+            scheduler.step()
+
+        self.status = all(x.status for x in self._devices.values())
+        easyb.log.inform(self.name, "Stop measurements")
+        scheduler.report()
+        return
+
+    def run_loop(self):
+        self.active = True
+
+        if any(len(x.get_schedule()) > 0 for x in self._devices.values()):
+            self.run_schedule()
+            self.active = False
+            return
+
+        self.ticker = Ticker(self.interval)
+        easyb.log.inform(self.name, "Start measurements")
+
+        while True:
+            self.status = self.poll()
+            self.interval_counter += 1
+
+            missed = self.ticker.wait()
+            if missed > 0:
+                easyb.log.warn(self.name, "Missed {0:d} measurements!".format(missed))
+
+            if self.abort is True:
+                easyb.log.inform(self.name, "Stop measurements")
+                break
+
+        self.ticker.report(self.name)
+        self.active = False
+        return
+
+    def close(self) -> bool:
+        result = True
+
+        for device in self._devices.values():
+            check = device.close()
+            if check is False:
+                result = False
+        return result
+
+    def store(self, file_type: str, filename: str) -> bool:
+        result = True
+
+        for (address, device) in self._devices.items():
+            check = device.store(file_type, "{0:s}_{1:03d}".format(filename, address))
+            if check is False:
+                result = False
+        return result
@@ -15,20 +15,32 @@
 #
 #    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
 #
-from typing import List, Any
+from typing import List, Tuple, Union
 
-from easyb.definitions import Length
+from easyb.definitions import Length, Priority
 
 
 class Command(object):
 
-    number = 0
-    address = 1
+    __slots__ = ("_name", "_address", "_frame", "_response_size", "_code", "_length", "_param", "_func_call", "number",
+                 "period", "priority", "sample")
 
     @property
     def name(self) -> str:
         return self._name
 
+    @property
+    def address(self) -> int:
+        return self._address
+
+    @address.setter
+    def address(self, value: int):
+        if value != self._address:
+            self._frame = None
+            self._response_size = 0
+        self._address = value
+        return
+
     @property
     def code(self) -> int:
         return self._code
@@ -38,9 +50,37 @@ class Command(object):
         return self._length
 
     @property
-    def param(self) -> List[int]:
+    def param(self) -> Tuple[int, ...]:
+        """Parameters of the request, a copy so the compiled frame can not get stale."""
         return self._param
 
+    @param.setter
+    def param(self, value: List[int]):
+        self._frame = None
+        self._response_size = 0
+        self._param = tuple(value)
+        return
+
+    @property
+    def frame(self) -> Union[None, bytes]:
+        """Encoded request, None if it is not compiled yet or address or param have changed."""
+        return self._frame
+
+    @frame.setter
+    def frame(self, value: Union[None, bytes]):
+        self._frame = value
+        return
+
+    @property
+    def response_size(self) -> int:
+        """Size of the last response in bytes, 0 if it is unknown."""
+        return self._response_size
+
+    @response_size.setter
+    def response_size(self, value: int):
+        self._response_size = value
+        return
+
     def call(self, message) -> bool:
         check = self._func_call(message)
         return check
@@ -56,16 +96,26 @@ class Command(object):
         * length: message length
         * param: command param
         * func_call: function call for command
+        * period: time between two runs for the scheduler, 0 if it is not scheduled
+        * priority: priority for the scheduler
+        * sample: response is a measurement, the scheduler runs it with run() of the device
 
         :param kwargs: keyworded variable length of arguments.
         :type kwargs: **dict
         """
 
+        self.number = 0
         self._name = ""
+        self._address = 1
+        self._frame = None
+        self._response_size = 0
         self._code = 0
         self._length = Length.Byte3
-        self._param = []
+        self._param = ()
         self._func_call = None
+        self.period = 0.0
+        self.priority = Priority.NoPriority
+        self.sample = False
 
         item = kwargs.get("name", "")
         if item is not None:
@@ -89,9 +139,21 @@ class Command(object):
 
         item = kwargs.get("param", [])
         if item is not None:
-            self._param = item
+            self._param = tuple(item)
 
         item = kwargs.get("func_call", None)
         if item is not None:
             self._func_call = item
+
+        item = kwargs.get("period", 0.0)
+        if item is not None:
+            self.period = item
+
+        item = kwargs.get("priority", Priority.NoPriority)
+        if item is not None:
+            self.priority = item
+
+        item = kwargs.get("sample", False)
+        if item is not None:
+            self.sample = item
         return
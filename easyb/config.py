@@ -31,8 +31,12 @@ __all__ = [
 
 class Error(object):
 
-    code: int = 0
-    text: str = ""
+    __slots__ = ("code", "text")
+
+    def __init__(self):
+        self.code = 0
+        self.text = ""
+        return
 
     def load(self, data: dict) -> bool:
         check = check_dict(data, ["code", "text"])
@@ -46,9 +50,13 @@ class Error(object):
 
 class Status(object):
 
-    bit: int = 0
-    text: str = ""
-    is_set: bool = False
+    __slots__ = ("bit", "text", "is_set")
+
+    def __init__(self):
+        self.bit = 0
+        self.text = ""
+        self.is_set = False
+        return
 
     def load(self, data: dict) -> bool:
         check = check_dict(data, ["bit", "text"])
@@ -59,11 +67,22 @@ class Status(object):
         self.text = data["text"]
         return True
 
+    def copy(self) -> 'Status':
+        status = Status()
+        status.bit = self.bit
+        status.text = self.text
+        status.is_set = self.is_set
+        return status
+
 
 class Unit(object):
 
-    code: int = 0
-    value: str = ""
+    __slots__ = ("code", "value")
+
+    def __init__(self):
+        self.code = 0
+        self.value = ""
+        return
 
     def load(self, data: dict) -> bool:
         check = check_dict(data, ["code", "value"])
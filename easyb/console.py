@@ -24,8 +24,10 @@ import threading
 import easyb
 import easyb.devices
 
+from typing import List
 from optparse import OptionParser, OptionGroup
 
+from easyb.bus import BusMaster
 from easyb.device import Device
 from easyb.devices import get_device, get_devices
 
@@ -46,6 +48,14 @@ class Console(object):
     def device(self) -> Device:
         return self._device
 
+    @property
+    def bus(self) -> BusMaster:
+        return self._bus
+
+    @property
+    def addresses(self) -> List[int]:
+        return self._addresses
+
     def __init__(self):
 
         usage = "usage: %prog [options] arg1 arg2"
@@ -61,15 +71,20 @@ class Console(object):
         device = OptionGroup(parser, "Device Options", "Set device type, command or address to use.")
         device.add_option("-d", "--device", help="use device", type="string", default="")
         device.add_option("-c", "--command", help="run command", metavar="0", type="int", default=None)
+        device.add_option("--address", help="device addresses, comma separated, several only for read mode",
+                          metavar="1,2,3", type="string", default="1")
 
         parser.add_option_group(device)
 
         serial = OptionGroup(parser, "Serial Options", "Set serial port options.")
         serial.add_option("-p", "--port", help="serial port", metavar="/dev/ttyUSB0", type="string", default="")
         serial.add_option("-b", "--baudrate", help="serial port baudrate", metavar="4800", type="int", default=4800)
-        serial.add_option("-t", "--timeout", help="serial port timeout (in seconds)", metavar="2", type="int",
-                          default=2)
-        serial.add_option("-w", "--writetimeout", help="serial port write timeout", metavar="2", type="int", default=2)
+        serial.add_option("-t", "--timeout", help="serial port timeout (in seconds)", metavar="2.0", type="float",
+                          default=2.0)
+        serial.add_option("-w", "--writetimeout", help="serial port write timeout (in seconds)", metavar="2.0",
+                          type="float", default=2.0)
+        serial.add_option("-a", "--adaptive", help="adapt timeout to measured response times", action="store_true",
+                          default=False)
 
         parser.add_option_group(serial)
 
@@ -84,8 +99,56 @@ class Console(object):
         self._parser = parser
 
         self._device = None
+        self._bus = None
+        self._addresses = []
         return
 
+    def _parse_addresses(self) -> bool:
+        self._addresses = []
+
+        for item in self.options.address.split(","):
+            try:
+                address = int(item.strip())
+            except ValueError:
+                easyb.log.error("Address is not a number: {0:s}".format(item))
+                return False
+
+            if (address < 0) or (address > 255):
+                easyb.log.error("Address is out of range: {0:d}".format(address))
+                return False
+
+            if address in self._addresses:
+                easyb.log.error("Address is given twice: {0:d}".format(address))
+                return False
+
+            self._addresses.append(address)
+
+        if (len(self._addresses) > 1) and (self.options.read is False):
+            easyb.log.error("Several addresses are only supported in read mode!")
+            return False
+
+        return True
+
+    def _prepare_bus(self) -> bool:
+        self._bus = BusMaster(port=self.options.port, baudrate=self.options.baudrate, timeout=self.options.timeout,
+                              write_timeout=self.options.writetimeout, interval=self.options.interval)
+
+        for address in self.addresses:
+            device = self.bus.add_device(address, self.options.device, adaptive=self.options.adaptive)
+            if device is None:
+                return False
+
+            device.default_schedule()
+
+        self.bus.setup()
+
+        check = self.bus.connect()
+        if check is False:
+            return False
+
+        check = self.bus.prepare()
+        return check
+
     def _check_params(self) -> bool:
         if self.options.list is True:
             return True
@@ -165,11 +228,20 @@ class Console(object):
             self._list_commands()
             return True
 
+        check = self._parse_addresses()
+        if check is False:
+            return False
+
+        if len(self.addresses) > 1:
+            check = self._prepare_bus()
+            return check
+
         c = get_device(self.options.device)
 
         # noinspection PyCallingNonCallable
-        self._device = c(address=1, port=self.options.port, baudrate=self.options.baudrate,
-                         timeout=self.options.timeout, write_timeout=self.options.writetimeout)
+        self._device = c(address=self.addresses[0], port=self.options.port, baudrate=self.options.baudrate,
+                         timeout=self.options.timeout, write_timeout=self.options.writetimeout,
+                         interval=self.options.interval, adaptive=self.options.adaptive)
         if self.device is None:
             easyb.log.error("Device {0:s} is unknown!".format(options.device))
             return False
@@ -189,6 +261,8 @@ class Console(object):
         if self.options.read is False:
             return True
 
+        self.device.default_schedule()
+
         check = self.device.prepare()
         return check
 
@@ -200,21 +274,24 @@ class Console(object):
         return check
 
     def run_continuously(self) -> bool:
+        worker = self.device
+        if self.bus is not None:
+            worker = self.bus
 
-        signal.signal(signal.SIGINT, self.device.do_abort)
+        signal.signal(signal.SIGINT, worker.do_abort)
 
-        thread = threading.Thread(target=self.device.run_loop)
+        thread = threading.Thread(target=worker.run_loop)
         thread.start()
 
         while True:
-            check = self.device.active
+            check = worker.active
 
             if check is False:
                 break
 
             time.sleep(0.1)
 
-        status = self.device.status
+        status = worker.status
         return status
 
     def run(self) -> bool:
@@ -248,15 +325,19 @@ class Console(object):
         if self.options.read is False:
             return True
 
-        check = self.device.close()
+        worker = self.device
+        if self.bus is not None:
+            worker = self.bus
+
+        check = worker.close()
         if check is False:
             return False
 
-        if self.device is not None:
-            self.device.disconnect()
+        if worker is not None:
+            worker.disconnect()
 
         if self.options.output != "none":
-            check = self.device.store(self.options.output, self.options.filename)
+            check = worker.store(self.options.output, self.options.filename)
             if check is False:
                 return False
 
@@ -16,17 +16,21 @@
 #
 
 import abc
+import time
 
-from typing import List, Any
+from typing import List, Any, Union
 
 from enum import Enum
 from abc import ABCMeta
 
+from easyb.config import Error
+
 __all__ = [
     "Type",
     "Column",
     "Info",
     "Row",
+    "Sample",
     "Collection",
     "Storage"
 ]
@@ -43,10 +47,7 @@ class Type(Enum):
 
 class Column(object):
 
-    index: int = 0
-    name: str = ""
-    description: str = ""
-    type: Type = None
+    __slots__ = ("index", "name", "description", "type")
 
     def __init__(self, index: int, name: str, desc: str, column_type: Type):
         self.index = index
@@ -58,9 +59,7 @@ class Column(object):
 
 class Info(object):
 
-    name: str = ""
-    type: Type = None
-    value: Any = None
+    __slots__ = ("name", "type", "value")
 
     def __init__(self, name: str, type: Type, value: Any):
         self.name = name
@@ -77,13 +76,28 @@ class Row(object):
         return
 
 
+class Sample(object):
+
+    __slots__ = ("address", "number", "time", "error", "value")
+
+    def __init__(self, address: int, number: int, error: Union[None, Error], value: float):
+        self.address = address
+        self.number = number
+        self.time = time.time()
+        self.error = error
+        self.value = value
+        return
+
+
 class Collection(object):
 
-    rows: List[Row] = []
-    columns: List[Column] = []
-    infos: List[Info] = []
-    status: List[Info] = []
-    filename: str = ""
+    def __init__(self):
+        self.rows: List[Row] = []
+        self.columns: List[Column] = []
+        self.infos: List[Info] = []
+        self.status: List[Info] = []
+        self.filename = ""
+        return
 
 
 class Storage(metaclass=ABCMeta):
@@ -18,19 +18,23 @@
 
 import time
 import abc
+import threading
 import easyb
 import serial
 
 from serial import Serial
-from typing import List, Union, Any
+from typing import Dict, List, Union, Any, Tuple
 
 from easyb.data import Data
-from easyb.data.base import Type
-from easyb.bit import debug_data
-from easyb.message import Message
+from easyb.data.base import Type, Sample
+from easyb.bit import crc_table, debug_data, decode_u16, decode_u32, get_u16_error, DecodeCache
+from easyb.message import Message, LazyMessage, header_table
+from easyb.message.parser import Parser, message_size
 from easyb.command import Command
-from easyb.definitions import Length
-from easyb.config import Status
+from easyb.definitions import Length, Priority
+from easyb.config import Status, Error
+from easyb.timeout import AdaptiveTimeout
+from easyb.scheduler import Ticker, CommandScheduler
 
 from abc import ABCMeta
 
@@ -40,18 +44,23 @@ class Device(metaclass=ABCMeta):
     # device members
     name: str = ""
     address: int = 0
-    commands: List[Command] = []
-    command_list: List[int] = []
+    commands: List[Command] = None
+    command_index: Dict[int, Command] = None
+    command_list: List[int] = None
     command_counter: int = 0
-    device_status: List[Status] = []
+    device_status: List[Status] = None
 
     # members for serial communication
     serial: Serial = None
+    lock: threading.RLock = None
     port: str = ""
     baudrate: int = 0
-    timeout: int = 2
-    write_timeout: int = 2
+    timeout: float = 2
+    write_timeout: float = 2
+    adaptive: AdaptiveTimeout = None
     wait_time: float = 0.0
+    read_gap: float = 0.0
+    read_limit: int = 1024
 
     # members for reading via thread
     interval: float = 2.0
@@ -59,13 +68,32 @@ class Device(metaclass=ABCMeta):
     status: bool = False
     active: bool = False
     interval_counter: int = 0
+    ticker: Ticker = None
 
     # data type members
-    data: Data = Data()
+    data: Data = None
+    sample: Sample = None
+
+    # cache for decoding of measurements
+    decode_cache: DecodeCache = None
+
+    # parser for received messages
+    parser: Parser = None
+
+    # decode measurements on demand
+    lazy: bool = False
 
     def __init__(self, **kwargs):
         self._name = ""
 
+        self.commands = []
+        self.command_index = {}
+        self.command_list = []
+        self.command_counter = 0
+        self.device_status = []
+        self.data = Data()
+        self.lock = threading.RLock()
+
         item = kwargs.get("name", "")
         if item is not None:
             self.name = item
@@ -78,7 +106,7 @@ class Device(metaclass=ABCMeta):
         if item is not None:
             self.address = item
 
-        item = kwargs.get("wait_time", 0.1)
+        item = kwargs.get("wait_time", 0.0)
         if item is not None:
             self.wait_time = item
 
@@ -90,6 +118,14 @@ class Device(metaclass=ABCMeta):
         if item is not None:
             self.timeout = item
 
+        item = kwargs.get("read_gap", 0.0)
+        if item is not None:
+            self.read_gap = item
+
+        item = kwargs.get("read_limit", 1024)
+        if item is not None:
+            self.read_limit = item
+
         item = kwargs.get("interval", 2.0)
         if item is not None:
             self.interval = item
@@ -98,13 +134,28 @@ class Device(metaclass=ABCMeta):
         if item is not None:
             self.write_timeout = item
 
+        item = kwargs.get("adaptive", False)
+        if item is True:
+            floor = kwargs.get("timeout_floor", 0.05)
+            self.adaptive = AdaptiveTimeout(floor=min(floor, self.timeout), ceiling=self.timeout)
+
+        self.parser = Parser()
+
+        item = kwargs.get("lazy", False)
+        if item is not None:
+            self.lazy = item
+
+        item = kwargs.get("cache_size", 0)
+        if (item is not None) and (item > 0):
+            self.decode_cache = DecodeCache(item)
+
         self.init_commands()
 
         self.data.add_column("datetime", "Time", Type.datetime)
         self.data.add_column("number", "Number", Type.integer)
 
         for item in easyb.conf.status:
-            self.device_status.append(item)
+            self.device_status.append(item.copy())
         return
 
     def get_status(self) -> List[Status]:
@@ -126,17 +177,27 @@ class Device(metaclass=ABCMeta):
         return counter
 
     def get_command(self, number: int) -> Union[None, Command]:
-        command = None
+        command = self.command_index.get(number, None)
 
-        for item in self.commands:
-            if item.number == number:
-                command = item
+        if command is None:
+            # commands which are not added with add_command()
+            for item in self.commands:
+                if item.number == number:
+                    command = item
+                    self.command_index[number] = item
+                    break
 
         if command is None:
             easyb.log.error("Command number is unknown: " + str(number))
 
         return command
 
+    def decode_u32(self, byte3: int, byte4: int, byte6: int, byte7: int) -> Tuple[Union[Error, None], float]:
+        if self.decode_cache is None:
+            return decode_u32(byte3, byte4, byte6, byte7)
+
+        return self.decode_cache.decode_u32(byte3, byte4, byte6, byte7)
+
     def setup(self):
         # baudrate: int = 4800, timeout: int = 6, write_timeout: int = 2
 
@@ -171,8 +232,8 @@ class Device(metaclass=ABCMeta):
         easyb.log.debug1(self.name, "Port:          {0:s}".format(self.port))
         easyb.log.debug1(self.name, "Baudrate:      {0:d}".format(self.baudrate))
         easyb.log.debug1(self.name, "Address:       {0:d}".format(self.address))
-        easyb.log.debug1(self.name, "Timeout:       {0:d}".format(self.timeout))
-        easyb.log.debug1(self.name, "Write timeout: {0:d}".format(self.write_timeout))
+        easyb.log.debug1(self.name, "Timeout:       {0:.3f}".format(self.timeout))
+        easyb.log.debug1(self.name, "Write timeout: {0:.3f}".format(self.write_timeout))
 
         self.serial.port = self.port
 
@@ -216,7 +277,7 @@ class Device(metaclass=ABCMeta):
 
         message.info("SEND")
 
-        stream = message.stream.bytes
+        stream = message.stream.data
 
         try:
             self.serial.write(stream)
@@ -227,45 +288,153 @@ class Device(metaclass=ABCMeta):
 
         return True
 
-    def read_unit_timeout(self) -> bytes:
-        result = []
+    def get_read_gap(self) -> float:
+        """Inter-byte gap that ends a message with variable length.
 
-        while True:
-            check = False
-            try:
-                _in = self.serial.read()
+        :return: configured read_gap or four character times at the current baudrate.
+        :rtype: float
+        """
+        if self.read_gap > 0.0:
+            return self.read_gap
 
-                for item in _in:
-                    check = True
-                    value = int(item)
-                    result.append(value)
+        gap = 0.002
+        if self.baudrate > 0:
+            gap = max(40.0 / float(self.baudrate), gap)
+        return gap
+
+    def read_bulk(self) -> bytearray:
+        """Read all data until the line is idle for the read gap.
+
+        A line which never gets idle is read at most for twice the timeout or up to read_limit bytes.
+
+        :return: received data.
+        :rtype: bytearray
+        """
+        result = bytearray()
 
+        gap = self.get_read_gap()
+        poll_time = gap / 4.0
+
+        now = time.monotonic()
+        deadline = now + self.timeout
+        end = now + 2.0 * self.timeout
+        last = None
+
+        while True:
+            try:
+                number = min(self.serial.in_waiting, self.read_limit - len(result))
+                if number > 0:
+                    result.extend(self.serial.read(number))
+                    last = time.monotonic()
             except serial.SerialException as e:
                 easyb.log.error("Problem during reading of message body!")
                 easyb.log.exception(e)
                 break
 
-            if check is False:
+            now = time.monotonic()
+
+            if (len(result) >= self.read_limit) or (now >= end):
+                easyb.log.warn(self.name, "Stop reading after {0:d} bytes!".format(len(result)))
                 break
 
-        res = bytes(result)
+            if number > 0:
+                continue
+
+            if (last is None) and (now >= deadline):
+                break
+
+            if (last is not None) and ((now - last) >= gap):
+                break
+
+            time.sleep(poll_time)
+
+        return result
+
+    def read_unit_timeout(self) -> bytes:
+        res = bytes(self.read_bulk())
         return res
 
-    def receive(self) -> Union[None, Message]:
+    def receive_lazy(self) -> Union[None, LazyMessage]:
         try:
-            header = self.serial.read(3)
+            data = self.serial.read(3)
         except serial.SerialException as e:
             easyb.log.error("Problem during reading of message header!")
             easyb.log.exception(e)
             return None
 
+        if len(data) != 3:
+            easyb.log.error("Header is not valid!")
+            return None
+
+        # the length and code of a corrupted header can not be trusted
+        if crc_table[(data[0] << 8) | data[1]] != data[2]:
+            message = self.resync(data)
+            if message is None:
+                return None
+
+            message = LazyMessage(message.stream.bytes, self.decode_u32)
+            return message
+
+        length = header_table[data[1]][2]
+        number = 0
+
+        if length is Length.Byte6:
+            number = 3
+
+        if length is Length.Byte9:
+            number = 6
+
+        try:
+            if length is Length.Variable:
+                data = data + self.read_bulk()
+            elif number > 0:
+                data = data + self.serial.read(number)
+        except serial.SerialException as e:
+            easyb.log.error("Problem during reading of message body!")
+            easyb.log.exception(e)
+            return None
+
+        message = LazyMessage(data, self.decode_u32)
+        message.info("RECEIVE")
+
+        if message.code == 5:
+            easyb.log.warn(self.name, "Command not supported!")
+            return None
+
+        return message
+
+    def receive(self, prefix: bytes = bytes()) -> Union[None, Message]:
+        """Receive a message, the size of the body is taken from the header.
+
+        :param prefix: bytes of the message which have already been read.
+        :type prefix: bytes
+
+        :return: received message or None.
+        :rtype: Message, None
+        """
+        header = bytes(prefix[0:3])
+        body = bytes(prefix[3:])
+
+        if len(header) < 3:
+            try:
+                header = header + self.serial.read(3 - len(header))
+            except serial.SerialException as e:
+                easyb.log.error("Problem during reading of message header!")
+                easyb.log.exception(e)
+                return None
+
         debug = debug_data(header)
         easyb.log.debug1("SERIAL", "Header: {0:s}".format(debug))
 
+        if len(header) < 3:
+            easyb.log.error("Header is not valid!")
+            return None
+
         message = Message()
         check = message.decode(header)
         if check is False:
-            return None
+            message = self.resync(header + body)
+            return message
 
         message.info("RECEIVE")
 
@@ -284,17 +453,22 @@ class Device(metaclass=ABCMeta):
         if message.length is Length.Variable:
             number = -1
 
+        if (number >= 0) and (len(body) > number):
+            easyb.log.warn(self.name, "Drop {0:d} bytes after message!".format(len(body) - number))
+            body = body[0:number]
+
         if number == 0:
             easyb.log.warn(self.name, "Message body has no size!")
-            message.data = header
             return message
 
         if number == -1:
             easyb.log.warn(self.name, "Message body is variable!")
-            data = self.read_unit_timeout()
+            data = body + self.read_bulk()
         else:
             try:
-                data = self.serial.read(number)
+                data = body
+                if len(data) < number:
+                    data = data + self.serial.read(number - len(data))
             except serial.SerialException as e:
                 easyb.log.error("Problem during reading of message body!")
                 easyb.log.exception(e)
@@ -316,22 +490,337 @@ class Device(metaclass=ABCMeta):
 
         return message
 
-    def execute(self, command: Command) -> Union[None, Message]:
+    def resync(self, data: bytes) -> Union[None, Message]:
+        """Search the next valid message after a corrupted header.
+
+        The received bytes are fed into the parser, which skips everything up to the next valid header. More bytes
+        are read until a message is complete or the line is idle.
+
+        :param data: bytes which have already been read.
+        :type data: bytes
+
+        :return: received message or None.
+        :rtype: Message, None
+        """
+        easyb.log.warn(self.name, "Search next valid message!")
+
+        self.parser.reset()
+        messages = self.parser.feed(data)
+
+        while len(messages) == 0:
+            try:
+                number = self.serial.in_waiting
+                data = self.serial.read(max(number, 1))
+            except serial.SerialException as e:
+                easyb.log.error("Problem during reading of message!")
+                easyb.log.exception(e)
+                break
+
+            if len(data) == 0:
+                messages = self.parser.flush()
+                break
+
+            messages = self.parser.feed(data)
+
+        self.parser.reset()
+
+        if len(messages) == 0:
+            easyb.log.error("No valid message received!")
+            return None
+
+        if len(messages) > 1:
+            easyb.log.warn(self.name, "Drop {0:d} messages after message!".format(len(messages) - 1))
+
+        message = messages[0]
+        message.info("RECEIVE")
+
+        if message.code == 5:
+            easyb.log.warn(self.name, "Command not supported!")
+            return None
+
+        return message
+
+    def create_message(self, data: bytes) -> Union[None, Message]:
+        """Create a message from a complete response.
+
+        :param data: received bytes of header and body.
+        :type data: bytes
+
+        :return: received message or None.
+        :rtype: Message, None
+        """
+        message = Message()
+        check = message.decode(data)
+        if check is False:
+            return None
+
+        message.stream.length = message.length
+        message.info("RECEIVE")
+
+        if message.code == 5:
+            easyb.log.warn(self.name, "Command not supported!")
+            return None
+
+        return message
+
+    def receive_expected(self, command: Command) -> Union[None, Message]:
+        """Receive the response of a command with one read of the known response size.
+
+        If fewer bytes are waiting only the header is read first, so a shorter response does not block for the
+        whole timeout. If the response does not match the expected size, the header driven path of receive() is used
+        to read the rest of the message.
+
+        :param command: command with known response size.
+        :type command: Command
+
+        :return: received message or None.
+        :rtype: Message, None
+        """
+        number = command.response_size
+
+        try:
+            if self.serial.in_waiting >= number:
+                data = self.serial.read(number)
+            else:
+                data = self.serial.read(3)
+
+            if len(data) >= 3:
+                length = header_table[data[1]][2]
+                size = message_size.get(length, 0)
+
+                if (size == number) and (len(data) < number):
+                    data = data + self.serial.read(number - len(data))
+        except serial.SerialException as e:
+            easyb.log.error("Problem during reading of message!")
+            easyb.log.exception(e)
+            return None
+
+        if len(data) >= 3:
+            length = header_table[data[1]][2]
+            size = message_size.get(length, 0)
+
+            if (size == number) and (len(data) == number):
+                message = self.create_message(data)
+                return message
+
+        easyb.log.debug1(self.name, "Response size differs from {0:d} bytes".format(number))
+        command.response_size = 0
+
+        message = self.receive(data)
+        if (message is not None) and (message.length is not Length.Variable):
+            command.response_size = message.stream.len
+        return message
+
+    def receive_messages(self) -> List[Message]:
+        """Read all waiting bytes and return the messages completed by them.
+
+        When nothing is received within the timeout the line is idle and pending messages are flushed.
+
+        :return: list with received messages.
+        :rtype: List[Message]
+        """
+        try:
+            number = self.serial.in_waiting
+            data = self.serial.read(max(number, 1))
+        except serial.SerialException as e:
+            easyb.log.error("Problem during reading of messages!")
+            easyb.log.exception(e)
+            return []
+
+        if len(data) == 0:
+            return self.parser.flush()
+
+        result = self.parser.feed(data)
+        return result
+
+    def send_frame(self, frame: bytes) -> bool:
+        if easyb.log.level > 1:
+            easyb.log.debug2("SEND", debug_data(frame))
+
+        try:
+            self.serial.write(frame)
+        except serial.SerialException as e:
+            easyb.log.error("Problem during write to serial port!")
+            easyb.log.exception(e)
+            return False
+
+        return True
+
+    def compile(self, command: Command) -> Union[None, bytes]:
+        frame = command.frame
+        if frame is not None:
+            return frame
+
         message = Message()
         message.command(command)
 
-        check = self.send(message)
+        check = message.encode()
         if check is False:
             return None
 
-        time.sleep(self.wait_time)
+        frame = message.stream.bytes
+        command.frame = frame
+        return frame
+
+    def get_timeout(self, address: int) -> float:
+        if self.adaptive is None:
+            return self.timeout
+
+        return self.adaptive.get(address)
+
+    def wait_response(self, start: float, timeout: float = None, size: int = 1) -> bool:
+        """Wait until a response of the given size has arrived.
+
+        A shorter response is accepted when the line is idle for the read gap or the timeout has passed.
+
+        :param start: time of the request, from time.monotonic().
+        :type start: float
+
+        :param timeout: time to wait for the response, default is the device timeout.
+        :type timeout: float
+
+        :param size: number of bytes to wait for.
+        :type size: int
+
+        :return: True if data is waiting, False if the timeout has passed.
+        :rtype: bool
+        """
+        if timeout is None:
+            timeout = self.timeout
+
+        minimum = start + self.wait_time
+        deadline = start + timeout
+
+        # poll about once per character time, 10 bit per character
+        poll_time = 0.001
+        if self.baudrate > 0:
+            poll_time = max(10.0 / float(self.baudrate), poll_time)
+
+        gap = self.get_read_gap()
+        received = 0
+        last = 0.0
+
+        while True:
+            now = time.monotonic()
+
+            if now < minimum:
+                time.sleep(minimum - now)
+                continue
+
+            try:
+                number = self.serial.in_waiting
+            except serial.SerialException as e:
+                easyb.log.error("Problem during waiting for response!")
+                easyb.log.exception(e)
+                return False
+
+            if number >= size:
+                return True
+
+            if number > received:
+                received = number
+                last = now
+            elif (number > 0) and ((now - last) >= gap):
+                return True
+
+            if now >= deadline:
+                return number > 0
+
+            time.sleep(min(poll_time, deadline - now))
 
-        data = self.receive()
+    def execute(self, command: Command, lazy: bool = False) -> Union[None, Message]:
+        """Send a command and receive the response.
+
+        The request is done while holding the lock of the device, devices on one serial port share the same lock.
+
+        :param command: command to send.
+        :type command: Command
+
+        :param lazy: return a LazyMessage.
+        :type lazy: bool
+
+        :return: received message or None.
+        :rtype: Message, None
+        """
+        with self.lock:
+            message = self._execute(command, lazy)
+        return message
+
+    def _execute(self, command: Command, lazy: bool) -> Union[None, Message]:
+        frame = self.compile(command)
+        if frame is None:
+            return None
+
+        start = time.monotonic()
+
+        check = self.send_frame(frame)
+        if check is False:
+            return None
+
+        size = 1
+        if lazy is False:
+            size = max(command.response_size, 1)
+
+        check = self.wait_response(start, self.get_timeout(command.address), size)
+        if check is False:
+            easyb.log.warn(self.name, "No response from address {0:d}!".format(command.address))
+
+            if self.adaptive is not None:
+                self.adaptive.miss(command.address)
+            return None
+
+        if self.adaptive is not None:
+            self.adaptive.add(command.address, time.monotonic() - start)
+
+        if lazy is True:
+            data = self.receive_lazy()
+        elif command.response_size > 0:
+            data = self.receive_expected(command)
+        else:
+            data = self.receive()
+
+            if (data is not None) and (data.length is not Length.Variable):
+                command.response_size = data.stream.len
         if data is None:
             return None
 
         return data
 
+    def decode_value(self, message: Message) -> Tuple[Union[Error, None], float]:
+        """Decode the measurement of a response.
+
+        :param message: received message.
+        :type message: Message
+
+        :return: error or None and the measured value.
+        :rtype: Tuple[Error, float]
+        """
+        data = message.stream.data
+
+        if (message.length is Length.Byte6) and (len(data) >= 6):
+            code, value = decode_u16(data[3], data[4])
+            return get_u16_error(code), value
+
+        if (message.length is Length.Byte9) and (len(data) >= 9):
+            return self.decode_u32(data[3], data[4], data[6], data[7])
+
+        return None, 0.0
+
+    def store_value(self, error: Union[Error, None], value: float) -> bool:
+        """Store a decoded measurement, the base class keeps it as last sample.
+
+        :param error: error or None.
+        :type error: Error, None
+
+        :param value: measured value.
+        :type value: float
+
+        :return: True if successful, otherwise False.
+        :rtype: bool
+        """
+        self.sample = Sample(self.address, self.interval_counter, error, value)
+        return True
+
     def create_row(self) -> Any:
         row = self.data.create_row()
 
@@ -355,7 +844,7 @@ class Device(metaclass=ABCMeta):
         return check
 
     def default_command(self, message: Message):
-        logging = debug_data(message.stream.bytes)
+        logging = debug_data(message.stream.data)
         easyb.log.inform(self.name, logging)
         return True
 
@@ -364,10 +853,50 @@ class Device(metaclass=ABCMeta):
             easyb.log.inform(self.name, "Command {0:d}: {1:s}".format(command.number, command.name))
         return
 
+    def set_schedule(self, number: int, period: float, priority: Priority = Priority.NoPriority) -> bool:
+        """Set how often a command is run by the scheduler.
+
+        :param number: command number.
+        :type number: int
+
+        :param period: time between two runs, 0 to remove the command from the schedule.
+        :type period: float
+
+        :param priority: commands with priority are run first when several are due.
+        :type priority: Priority
+
+        :return: True if successfull, otherwise False.
+        :rtype: bool
+        """
+        command = self.get_command(number)
+        if command is None:
+            return False
+
+        if period < 0.0:
+            easyb.log.error("Period is invalid: {0:.3f}".format(period))
+            return False
+
+        command.period = period
+        command.priority = priority
+        return True
+
+    def get_schedule(self) -> List[Command]:
+        schedule = []
+
+        for command in self.commands:
+            if command.period > 0.0:
+                schedule.append(command)
+        return schedule
+
+    def default_schedule(self):
+        """Set the periods of the commands for the measurement loop, the base class has no schedule."""
+        return
+
     def add_command(self, command: Command):
         command.number = self.command_counter
         command.address = self.address
         self.commands.append(command)
+        self.command_index[command.number] = command
         self.command_list.append(command.number)
         self.command_counter += 1
         return
@@ -377,20 +906,43 @@ class Device(metaclass=ABCMeta):
         self.abort = True
         return
 
+    def run_schedule(self):
+        """Run the scheduled commands until the loop is aborted."""
+        scheduler = CommandScheduler()
+        scheduler.add_device(self)
+        easyb.log.inform(self.name, "Start {0:d} scheduled commands".format(len(scheduler.jobs)))
+
+        while self.abort is False:
+            scheduler.step()
+
+        easyb.log.inform(self.name, "Stop measurements")
+        scheduler.report()
+        return
+
     def run_loop(self):
         self.active = True
+
+        if len(self.get_schedule()) > 0:
+            self.run_schedule()
+            self.active = False
+            return
+
+        self.ticker = Ticker(self.interval)
         easyb.log.inform(self.name, "Start measurements")
 
         while True:
             self.status = self.run()
             self.interval_counter += 1
 
-            time.sleep(self.interval)
+            missed = self.ticker.wait()
+            if missed > 0:
+                easyb.log.warn(self.name, "Missed {0:d} measurements!".format(missed))
 
             if self.abort is True:
                 easyb.log.inform(self.name, "Stop measurements")
                 break
 
+        self.ticker.report(self.name)
         self.active = False
         return
 
@@ -19,13 +19,15 @@
 import easyb
 
 from datetime import datetime
+from typing import Union
 
 from easyb.data.base import Type, Info
-from easyb.definitions import Length
+from easyb.definitions import Length, Priority
 from easyb.command import Command
+from easyb.config import Error
 from easyb.message import Message
 from easyb.device import Device
-from easyb.bit import convert_u16, convert_u32, decode_u16, decode_u32
+from easyb.bit import convert_u16, convert_u32
 
 __all__ = [
     "GMH3710"
@@ -52,15 +54,7 @@ class GMH3710(Device):
         return
 
     def messwert_lesen(self, message: Message) -> bool:
-        data = message.stream.data
-        error = 0
-        value = 0.0
-
-        if message.length is Length.Byte6:
-            error, value = decode_u16(data[3], data[4])
-
-        if message.length is Length.Byte9:
-            error, value = decode_u32(data[3], data[4], data[6], data[7])
+        error, value = self.decode_value(message)
 
         if error is not None:
             easyb.log.warn(self.name, "Error: {0:s}".format(error.text))
@@ -87,15 +81,7 @@ class GMH3710(Device):
         return True
 
     def minwert_lesen(self, message: Message) -> bool:
-        data = message.stream.data
-        error = None
-        value = 0.0
-
-        if message.length is Length.Byte6:
-            error, value = decode_u16(data[3], data[4])
-
-        if message.length is Length.Byte9:
-            error, value = decode_u32(data[3], data[4], data[6], data[7])
+        error, value = self.decode_value(message)
 
         if error is not None:
             easyb.log.warn(self.name, "Error: {0:s}".format(error.text))
@@ -105,15 +91,7 @@ class GMH3710(Device):
         return True
 
     def maxwert_lesen(self, message: Message) -> bool:
-        data = message.stream.data
-        error = None
-        value = 0.0
-
-        if message.length is Length.Byte6:
-            error, value = decode_u16(data[3], data[4])
-
-        if message.length is Length.Byte9:
-            error, value = decode_u32(data[3], data[4], data[6], data[7])
+        error, value = self.decode_value(message)
 
         if error is not None:
             easyb.log.warn(self.name, "Error: {0:s}".format(error.text))
@@ -156,7 +134,7 @@ class GMH3710(Device):
 
     def init_commands(self):
 
-        command = Command(name="Messwert lesen", code=0, func_call=self.messwert_lesen)
+        command = Command(name="Messwert lesen", code=0, sample=True, func_call=self.messwert_lesen)
         self.add_command(command)
 
         command = Command(name="Systemstatus lesen", code=3, func_call=self.systemstatus_lesen)
@@ -224,6 +202,15 @@ class GMH3710(Device):
         self.add_command(command)
         return
 
+    def default_schedule(self):
+        """Measurement with the device interval, status every 30 seconds, range and unit every 10 minutes."""
+        self.set_schedule(0, self.interval, Priority.Priority)
+        self.set_schedule(1, 30.0)
+
+        for number in [2, 3, 5, 6, 12]:
+            self.set_schedule(number, 600.0)
+        return
+
     def prepare(self) -> bool:
         self.start_measure = datetime.now()
 
@@ -246,22 +233,8 @@ class GMH3710(Device):
             return False
         return True
 
-    def run(self) -> bool:
-        command = self.get_command(0)
-
-        message = self.execute(command)
-        if message is None:
-            return False
-
-        data = message.stream.data
-        error = 0
-        value = 0.0
-
-        if message.length is Length.Byte6:
-            error, value = decode_u16(data[3], data[4])
-
-        if message.length is Length.Byte9:
-            error, value = decode_u32(data[3], data[4], data[6], data[7])
+    def store_value(self, error: Union[None, Error], value: float) -> bool:
+        Device.store_value(self, error, value)
 
         row = self.create_row()
 
@@ -276,6 +249,25 @@ class GMH3710(Device):
             easyb.log.inform(self.name, debug)
         return True
 
+    def run(self) -> bool:
+        command = self.get_command(0)
+
+        if self.lazy is True:
+            message = self.execute(command, True)
+            if (message is None) or (message.valid is False):
+                return False
+
+            error, value = message.value
+        else:
+            message = self.execute(command)
+            if message is None:
+                return False
+
+            error, value = self.decode_value(message)
+
+        check = self.store_value(error, value)
+        return check
+
     def close(self) -> bool:
         self.end_measure = datetime.now()
 
@@ -0,0 +1,298 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import time
+import threading
+import easyb
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple, Union
+
+from easyb.data.base import Sample
+from easyb.bus import BusMaster
+from easyb.device import Device
+from easyb.scheduler import Ticker
+
+__all__ = [
+    "Sink",
+    "Throughput",
+    "Engine"
+]
+
+
+class Sink(object):
+    """Thread-safe store for the samples of all ports."""
+
+    @property
+    def len(self) -> int:
+        with self._lock:
+            result = sum(len(x) for x in self._samples.values())
+        return result
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = {}
+        return
+
+    def add(self, port: str, sample: Sample):
+        with self._lock:
+            samples = self._samples.get(port, None)
+            if samples is None:
+                samples = []
+                self._samples[port] = samples
+            samples.append(sample)
+        return
+
+    def get(self, port: str) -> List[Sample]:
+        with self._lock:
+            result = list(self._samples.get(port, []))
+        return result
+
+    def take(self) -> Dict[str, List[Sample]]:
+        """Remove and return all samples.
+
+        :return: samples of every port.
+        :rtype: Dict[str, List[Sample]]
+        """
+        with self._lock:
+            result = self._samples
+            self._samples = {}
+        return result
+
+
+class Throughput(object):
+
+    __slots__ = ("port", "cycles", "samples", "errors", "duration")
+
+    def __init__(self, port: str):
+        self.port = port
+        self.cycles = 0
+        self.samples = 0
+        self.errors = 0
+        self.duration = 0.0
+        return
+
+    @property
+    def rate(self) -> float:
+        """Samples per second of bus time."""
+        if self.duration <= 0.0:
+            return 0.0
+        return self.samples / self.duration
+
+
+class Engine(object):
+    """Acquisition on several ports with a bounded thread pool.
+
+    Every port is driven by a bus master, the devices on one port share its serial connection and lock. In every
+    cycle one job per port is run on the pool, the last sample of every device is merged into the sink.
+    """
+
+    name: str = "ENGINE"
+
+    # members for reading via thread
+    interval: float = 2.0
+    abort: bool = False
+    status: bool = False
+    active: bool = False
+    interval_counter: int = 0
+    ticker: Ticker = None
+
+    @property
+    def sink(self) -> Sink:
+        return self._sink
+
+    @property
+    def buses(self) -> Dict[str, BusMaster]:
+        return self._buses
+
+    @property
+    def throughput(self) -> Dict[str, Throughput]:
+        return self._throughput
+
+    def __init__(self, specs: List[Tuple[str, int, str]] = None, workers: int = 4, sink: Sink = None, **kwargs):
+        """Create the engine.
+
+        :param specs: list of port, address and device type.
+        :type specs: List[Tuple[str, int, str]]
+
+        :param workers: maximum number of threads.
+        :type workers: int
+
+        :param sink: store for the samples, default is a new Sink.
+        :type sink: Sink
+
+        :param kwargs: options for the serial ports, see BusMaster.
+        """
+        if workers < 1:
+            raise ValueError("Number of workers is invalid: {0:d}".format(workers))
+
+        self._workers = workers
+        self._options = kwargs
+        self._buses = {}
+        self._throughput = {}
+        self._sink = sink
+
+        if self._sink is None:
+            self._sink = Sink()
+
+        item = kwargs.get("interval", 2.0)
+        if item is not None:
+            self.interval = item
+
+        if specs is not None:
+            for (port, address, device_name) in specs:
+                self.add(port, address, device_name)
+        return
+
+    def add(self, port: str, address: int, device_name: str) -> Union[None, Device]:
+        bus = self._buses.get(port, None)
+
+        if bus is None:
+            bus = BusMaster(port=port, **self._options)
+            self._buses[port] = bus
+            self._throughput[port] = Throughput(port)
+
+        device = bus.add_device(address, device_name)
+        return device
+
+    def _map(self, call, items: list) -> list:
+        with ThreadPoolExecutor(max_workers=min(self._workers, max(len(items), 1))) as executor:
+            result = list(executor.map(call, items))
+        return result
+
+    @staticmethod
+    def _connect(bus: BusMaster) -> bool:
+        bus.setup()
+
+        check = bus.connect()
+        return check
+
+    def connect(self) -> bool:
+        result = self._map(self._connect, list(self._buses.values()))
+        return all(result)
+
+    def disconnect(self) -> bool:
+        result = self._map(lambda x: x.disconnect(), list(self._buses.values()))
+        return all(result)
+
+    def prepare(self) -> bool:
+        result = self._map(lambda x: x.prepare(), list(self._buses.values()))
+        return all(result)
+
+    def close(self) -> bool:
+        result = self._map(lambda x: x.close(), list(self._buses.values()))
+        return all(result)
+
+    def _measure(self, port: str, device: Device) -> bool:
+        with device.lock:
+            device.sample = None
+
+            check = device.run()
+            if (check is True) and (device.sample is not None):
+                self._sink.add(port, device.sample)
+
+            device.status = check
+            device.interval_counter += 1
+        return check
+
+    def _poll(self, port: str) -> bool:
+        bus = self._buses[port]
+        throughput = self._throughput[port]
+        result = True
+
+        start = time.monotonic()
+
+        for device in bus.devices.values():
+            check = self._measure(port, device)
+            if check is False:
+                throughput.errors += 1
+                result = False
+                continue
+            throughput.samples += 1
+
+        throughput.duration += time.monotonic() - start
+        throughput.cycles += 1
+        return result
+
+    def cycle(self, executor: ThreadPoolExecutor) -> bool:
+        """Run one measurement on every device, the ports are polled in parallel.
+
+        :param executor: pool to run the jobs.
+        :type executor: ThreadPoolExecutor
+
+        :return: True if all devices have answered, otherwise False.
+        :rtype: bool
+        """
+        result = list(executor.map(self._poll, list(self._buses.keys())))
+        return all(result)
+
+    def run(self, count: int = 0) -> bool:
+        """Measure periodically until aborted or count cycles are done.
+
+        :param count: number of cycles, 0 to run until aborted.
+        :type count: int
+
+        :return: status of the last cycle.
+        :rtype: bool
+        """
+        workers = min(self._workers, max(len(self._buses), 1))
+
+        self.ticker = Ticker(self.interval)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            counter = 0
+
+            while (count == 0) or (counter < count):
+                self.status = self.cycle(executor)
+                self.interval_counter += 1
+                counter += 1
+
+                if self.abort is True:
+                    break
+
+                if (count != 0) and (counter >= count):
+                    break
+
+                missed = self.ticker.wait()
+                if missed > 0:
+                    easyb.log.warn(self.name, "Missed {0:d} cycles!".format(missed))
+        return self.status
+
+    # noinspection PyUnusedLocal
+    def do_abort(self, signum, frame):
+        self.abort = True
+        return
+
+    def run_loop(self):
+        self.active = True
+        easyb.log.inform(self.name, "Start measurements on {0:d} ports".format(len(self._buses)))
+
+        self.run()
+
+        easyb.log.inform(self.name, "Stop measurements")
+        self.ticker.report(self.name)
+        self.report()
+        self.active = False
+        return
+
+    def report(self):
+        for (port, throughput) in self._throughput.items():
+            logging = "{0:d} cycles, {1:d} samples, {2:d} errors, {3:.1f} samples/s".format(
+                throughput.cycles, throughput.samples, throughput.errors, throughput.rate)
+            easyb.log.inform(port, logging)
+        return
@@ -18,23 +18,58 @@
 
 import easyb
 
-from typing import List
+from typing import List, Tuple, Dict, Callable, Any
 
 from easyb.command import Command
 from easyb.message.stream import Stream
 
 from easyb.definitions import Direction, get_direction, Length, get_length, Priority, get_priority
-from easyb.bit import debug_data, crop_u8
+from easyb.bit import debug_data, crop_u8, crc_table, decode_u16, decode_u32, get_u16_error
 
 __all__ = [
+    "parser",
     "stream",
 
-    "Message"
+    "header_table",
+    "header_index",
+    "message_size",
+
+    "Message",
+    "LazyMessage"
 ]
 
 
+def _create_header_table() -> List[Tuple[int, Priority, Length, Direction]]:
+    table = []
+
+    for byte1 in range(256):
+        code = (byte1 & 0xf0) >> 4
+        priority = get_priority((byte1 & 0x8) >> 3)
+        length = get_length((byte1 & 0x6) >> 1)
+        direction = get_direction(byte1 & 0x1)
+
+        table.append((code, priority, length, direction))
+    return table
+
+
+#: decoded header fields (code, priority, length, direction) for every header byte
+header_table = _create_header_table()
+
+#: header byte for every combination of header fields (code, priority, length, direction)
+header_index: Dict[Tuple[int, Priority, Length, Direction], int] = {item: n for n, item in enumerate(header_table)}
+
+#: number of message bytes for every fixed length
+message_size = {
+    Length.Byte3: 3,
+    Length.Byte6: 6,
+    Length.Byte9: 9
+}
+
+
 class Message(object):
 
+    __slots__ = ("_address", "_code", "_priority", "_length", "_direction", "_value", "_param", "_stream")
+
     @property
     def address(self) -> int:
         return self._address
@@ -104,7 +139,7 @@ class Message(object):
         self._priority = Priority.NoPriority
         self._length = command.length
         self._direction = Direction.FromMaster
-        self._param = command.param
+        self._param = list(command.param)
         return True
 
     def _verify_param(self) -> bool:
@@ -129,35 +164,14 @@ class Message(object):
         return True
 
     def _encode_header(self):
-        u8 = 0
-
-        direction = crop_u8(self.direction.value)
-        length = crop_u8(self.length.value << 1)
-        priority = crop_u8(self.priority.value << 3)
-        code = crop_u8(self.code << 4)
-
-        u8 = crop_u8(u8 | direction)
-        u8 = crop_u8(u8 | length)
-        u8 = crop_u8(u8 | priority)
-        u8 = crop_u8(u8 | code)
-
-        result = int(u8)
+        result = header_index[(self.code & 0x0f, self.priority, self.length, self.direction)]
         return result
 
     def _decode_header(self):
-        byte0 = self.stream.data[0]
-        byte1 = self.stream.data[1]
-
-        self._address = 255 - byte0
-        self._code = (byte1 & 0xf0) >> 4
-
-        priority = (byte1 & 0x8) >> 3
-        length = (byte1 & 0x6) >> 1
-        direction = byte1 & 0x1
+        data = self.stream.data
 
-        self._priority = get_priority(priority)
-        self._length = get_length(length)
-        self._direction = get_direction(direction)
+        self._address = 255 - data[0]
+        self._code, self._priority, self._length, self._direction = header_table[data[1]]
         return
 
     def encode(self) -> bool:
@@ -214,6 +228,124 @@ class Message(object):
                                                                           self.length.name, self.direction.name)
         easyb.log.debug2(debug, logging)
 
-        logging = debug_data(self.stream.bytes)
+        logging = debug_data(self.stream.data)
         easyb.log.debug2(debug, logging)
         return
+
+
+class LazyMessage(Message):
+    """Received message which keeps the raw data and decodes fields on first access.
+
+    The checksums are not verified on creation, check valid before using the content.
+    """
+
+    __slots__ = ("_data", "_decoded", "_valid", "_decode_u32_call")
+
+    @property
+    def data(self) -> bytes:
+        return self._data
+
+    @property
+    def address(self) -> int:
+        self._decode_header()
+        return self._address
+
+    @property
+    def code(self) -> int:
+        self._decode_header()
+        return self._code
+
+    @property
+    def priority(self) -> Priority:
+        self._decode_header()
+        return self._priority
+
+    @property
+    def length(self) -> Length:
+        self._decode_header()
+        return self._length
+
+    @property
+    def direction(self) -> Direction:
+        self._decode_header()
+        return self._direction
+
+    @property
+    def stream(self) -> Stream:
+        if self._stream is None:
+            stream = Stream(Length.Byte3)
+            stream.data[:] = self._data
+            stream.length = self.length
+            self._stream = stream
+        return self._stream
+
+    @property
+    def valid(self) -> bool:
+        if self._valid is None:
+            self._valid = self._verify_crc()
+        return self._valid
+
+    @property
+    def value(self) -> Tuple[Any, float]:
+        if self._value is None:
+            self._value = self._decode_value()
+        return self._value
+
+    def __init__(self, data: bytes, decode_u32_call: Callable = decode_u32):
+        Message.__init__(self)
+
+        self._data = data
+        self._decoded = False
+        self._valid = None
+        self._decode_u32_call = decode_u32_call
+        return
+
+    def _decode_header(self):
+        if self._decoded is True:
+            return
+
+        self._address = 255 - self._data[0]
+        self._code, self._priority, self._length, self._direction = header_table[self._data[1]]
+        self._decoded = True
+        return
+
+    def _verify_crc(self) -> bool:
+        data = self._data
+        length = len(data)
+
+        if (length == 0) or ((length % 3) != 0):
+            easyb.log.error("Data size is not a triplet! ({0:d})".format(length))
+            return False
+
+        size = message_size.get(self.length, length)
+        if length != size:
+            easyb.log.error("Data size does not match {0:s}! ({1:d})".format(self.length.name, length))
+            return False
+
+        pos_set = 0
+        while pos_set < length:
+            if crc_table[(data[pos_set] << 8) | data[pos_set + 1]] != data[pos_set + 2]:
+                easyb.log.error("CRC check failed at {0:d}: {1:s}".format(pos_set, debug_data(data)))
+                return False
+            pos_set += 3
+        return True
+
+    def _decode_value(self) -> Tuple[Any, float]:
+        data = self._data
+        length = self.length
+
+        if (length is Length.Byte6) and (len(data) >= 6):
+            code, value = decode_u16(data[3], data[4])
+            return get_u16_error(code), value
+
+        if (length is Length.Byte9) and (len(data) >= 9):
+            return self._decode_u32_call(data[3], data[4], data[6], data[7])
+
+        return None, 0.0
+
+    def info(self, debug: str):
+        if easyb.log.level < 2:
+            return
+
+        Message.info(self, debug)
+        return
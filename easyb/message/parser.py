@@ -0,0 +1,155 @@
+#!/usr/bin/python3
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import easyb
+
+from typing import List, Union
+
+from easyb.definitions import Length
+from easyb.bit import crc_table, debug_data
+from easyb.message import Message, header_table, message_size
+
+__all__ = [
+    "Parser"
+]
+
+
+class Parser(object):
+    """Incremental parser for a stream of messages.
+
+    Chunks of arbitrary size are added with feed(). Bytes which do not belong to a valid message are skipped until
+    the next valid header is found. Messages with variable length are completed with flush(), when the line is idle.
+    """
+
+    @property
+    def buffer(self) -> bytearray:
+        return self._buffer
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped
+
+    @property
+    def messages(self) -> int:
+        return self._messages
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._dropped = 0
+        self._messages = 0
+        return
+
+    def reset(self):
+        self._buffer.clear()
+        return
+
+    def _check_triplets(self, start: int, end: int) -> bool:
+        data = self._buffer
+
+        pos_set = start
+        while pos_set < end:
+            if crc_table[(data[pos_set] << 8) | data[pos_set + 1]] != data[pos_set + 2]:
+                return False
+            pos_set += 3
+        return True
+
+    def _drop(self, number: int):
+        easyb.log.debug1("PARSER", "Skip: {0:s}".format(debug_data(self._buffer[0:number])))
+
+        del self._buffer[0:number]
+        self._dropped += number
+        return
+
+    def _create(self, number: int) -> Message:
+        data = bytes(self._buffer[0:number])
+        del self._buffer[0:number]
+
+        message = Message()
+        message.decode(data)
+        message.stream.length = message.length
+
+        self._messages += 1
+        return message
+
+    def _next(self, flush: bool) -> Union[None, Message]:
+        data = self._buffer
+
+        while len(data) >= 3:
+            if crc_table[(data[0] << 8) | data[1]] != data[2]:
+                self._drop(1)
+                continue
+
+            length = header_table[data[1]][2]
+
+            if length is Length.Variable:
+                if flush is False:
+                    return None
+
+                number = 3
+                while (number + 3) <= len(data):
+                    if self._check_triplets(number, number + 3) is False:
+                        break
+                    number += 3
+
+                return self._create(number)
+
+            number = message_size[length]
+            if len(data) < number:
+                return None
+
+            if self._check_triplets(3, number) is False:
+                self._drop(1)
+                continue
+
+            return self._create(number)
+        return None
+
+    def feed(self, data: bytes) -> List[Message]:
+        """Add received bytes and return all messages completed by them.
+
+        :param data: received bytes.
+        :type data: bytes
+
+        :return: list with complete messages.
+        :rtype: List[Message]
+        """
+        self._buffer.extend(data)
+
+        result = []
+        while True:
+            message = self._next(False)
+            if message is None:
+                break
+            result.append(message)
+        return result
+
+    def flush(self) -> List[Message]:
+        """Complete pending messages with variable length and drop incomplete data.
+
+        :return: list with complete messages.
+        :rtype: List[Message]
+        """
+        result = []
+        while True:
+            message = self._next(True)
+            if message is None:
+                break
+            result.append(message)
+
+        if len(self._buffer) > 0:
+            self._drop(len(self._buffer))
+        return result
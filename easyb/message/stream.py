@@ -17,19 +17,28 @@
 
 import easyb
 
-from typing import List
+from contextlib import contextmanager
+from typing import Iterator, Tuple
+
 from easyb.definitions import Length
-from easyb.bit import debug_data, check_crc, crop_u8, create_crc
+from easyb.bit import debug_data, check_crc, crc_table, verify_crc_batch
 
 __all__ = [
     "Stream"
 ]
 
+#: minimum number of bytes to verify the checksums with numpy, e.g. for variable length bodies
+batch_size = 48
+
 
 class Stream(object):
 
+    __slots__ = ("_data", "_length", "_verified", "_failed")
+
     def __init__(self, length: Length):
-        self._data = []
+        self._data = bytearray()
+        self._verified = 0
+        self._failed = -1
         self.length = length
         return
 
@@ -52,7 +61,7 @@ class Stream(object):
         return
 
     @property
-    def data(self) -> List[int]:
+    def data(self) -> bytearray:
         return self._data
 
     @property
@@ -60,33 +69,67 @@ class Stream(object):
         res = bytes(self._data)
         return res
 
+    @property
+    def header(self) -> bytes:
+        """Copy of the header triplet."""
+        return bytes(self._data[0:3])
+
+    @property
+    def payload(self) -> bytes:
+        """Copy of the payload triplets."""
+        return bytes(self._data[3:])
+
+    @contextmanager
+    def views(self) -> Iterator[Tuple[memoryview, memoryview]]:
+        """Zero-copy views of header and payload triplets.
+
+        The views are released when the block is left, a held view blocks the resizing of the stream.
+
+        :return: views of header and payload.
+        :rtype: Tuple[memoryview, memoryview]
+        """
+        data = memoryview(self._data)
+        header = data[0:3]
+        payload = data[3:]
+
+        try:
+            yield header, payload
+        finally:
+            header.release()
+            payload.release()
+            data.release()
+        return
+
     @property
     def len(self) -> int:
         return len(self._data)
 
+    @property
+    def verified(self) -> int:
+        """Number of bytes with verified checksums."""
+        return self._verified
+
+    @property
+    def failed(self) -> int:
+        """Index of the first triplet with an invalid checksum, -1 if there is none."""
+        return self._failed
+
     def __str__(self):
-        return debug_data(self.bytes)
+        return debug_data(self._data)
 
     def __repr__(self):
-        return debug_data(self.bytes)
+        return debug_data(self._data)
 
     def _expand_data(self, number):
-        if number == self.len:
+        if number <= self.len:
             return
 
-        n = self.len
-        while n < number:
-            self._data.append(0)
-            n += 1
+        self._data.extend(bytes(number - self.len))
         return
 
     def encode(self) -> bool:
         length = len(self.data)
-        check = False
-
-        for item in self.data:
-            if item != 0:
-                check = True
+        check = any(self._data)
 
         if check is False:
             easyb.log.error("Data is empty!")
@@ -101,22 +144,24 @@ class Stream(object):
             pos2 = pos_set + 1
             pos3 = pos_set + 2
 
-            byte1 = crop_u8(255 - self.data[pos1])
+            byte1 = (255 - self.data[pos1]) & 0xff
             byte2 = self.data[pos2]
-            crc = create_crc(byte1, byte2)
+            crc = crc_table[(byte1 << 8) | byte2]
 
             self.data[pos1] = byte1
             self.data[pos2] = byte2
             self.data[pos3] = crc
 
             pos_set += 3
+
+        self._verified = length
+        self._failed = -1
         return True
 
     def decode(self, data_input: bytes):
-        self._data = []
-
-        for item in data_input:
-            self._data.append(int(item))
+        self._data = bytearray(data_input)
+        self._verified = 0
+        self._failed = -1
 
         length = len(self.data)
 
@@ -144,8 +189,7 @@ class Stream(object):
             easyb.log.error("Data size is not a triplet! ({0:d})".format(length))
             return False
 
-        for item in data_input:
-            self._data.append(int(item))
+        self._data.extend(data_input)
 
         check = self.verify_crc()
         return check
@@ -177,24 +221,54 @@ class Stream(object):
         return True
 
     def verify_crc(self) -> bool:
-        length = len(self.data)
+        """Verify the checksums of all triplets added since the last successful verification.
 
-        pos_set = 0
+        :return: True if all checksums are valid, otherwise False and failed is set.
+        :rtype: bool
+        """
+        data = self._data
+        length = len(data)
+
+        if (length - self._verified) >= batch_size:
+            return self._verify_crc_batch()
+
+        pos_set = self._verified
         while True:
-            if pos_set >= length:
+            if (pos_set + 3) > length:
                 break
 
-            byte1 = self.data[pos_set + 0]
-            byte2 = self.data[pos_set + 1]
-            crc = self.data[pos_set + 2]
+            byte1 = data[pos_set + 0]
+            byte2 = data[pos_set + 1]
+            crc = data[pos_set + 2]
 
-            check = check_crc(byte1, byte2, crc)
-            if check is False:
+            if crc_table[(byte1 << 8) | byte2] != crc:
+                check_crc(byte1, byte2, crc)
+                self._verified = pos_set
+                self._failed = pos_set // 3
                 return False
 
             pos_set += 3
+
+        self._verified = pos_set
+        self._failed = -1
         return True
 
+    def _verify_crc_batch(self) -> bool:
+        start = self._verified
+        end = len(self._data) - (len(self._data) % 3)
+
+        mask, failed = verify_crc_batch(self._data[start:end])
+        if failed == 0:
+            self._verified = end
+            self._failed = -1
+            return True
+
+        pos_set = start + int(mask.argmin()) * 3
+        check_crc(self._data[pos_set + 0], self._data[pos_set + 1], self._data[pos_set + 2])
+        self._verified = pos_set
+        self._failed = pos_set // 3
+        return False
+
     def set_data(self, data_input) -> bool:
         length = len(data_input)
 
@@ -202,9 +276,7 @@ class Stream(object):
             easyb.log.error("Invalid data size of {0:d}, need {1:d}!".format(length, self.len))
             return False
 
-        n = 0
-        for item in data_input:
-            value = int(item)
-            self.data[n] = value
-            n += 1
+        self._data[0:length] = bytes(data_input)
+        self._verified = 0
+        self._failed = -1
         return True
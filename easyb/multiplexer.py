@@ -0,0 +1,372 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import time
+import selectors
+import easyb
+import serial
+
+from enum import Enum
+from typing import List, Union
+
+from easyb.command import Command
+from easyb.definitions import Length
+from easyb.bit import debug_data
+from easyb.device import Device
+from easyb.message import header_table
+from easyb.message.parser import message_size
+
+__all__ = [
+    "State",
+    "Channel",
+    "Multiplexer"
+]
+
+
+class State(Enum):
+
+    Idle = 0
+    Header = 1
+    Body = 2
+    Variable = 3
+
+
+class Channel(object):
+    """Request/response state of one port."""
+
+    __slots__ = ("device", "command", "state", "fd", "write_timeout", "output", "buffer", "size", "start", "deadline",
+                 "next_time", "last", "requests", "responses", "timeouts", "status")
+
+    def __init__(self, device: Device, command: Command):
+        self.device = device
+        self.command = command
+        self.state = State.Idle
+        self.fd = -1
+        self.write_timeout = None
+        self.output = bytearray()
+        self.buffer = bytearray()
+        self.size = 0
+        self.start = 0.0
+        self.deadline = 0.0
+        self.next_time = 0.0
+        self.last = 0.0
+        self.requests = 0
+        self.responses = 0
+        self.timeouts = 0
+        self.status = False
+        return
+
+    def get_wakeup(self) -> float:
+        if self.state is State.Idle:
+            return self.next_time
+
+        if self.state is State.Variable:
+            return min(self.deadline, self.last + self.device.get_read_gap())
+
+        return self.deadline
+
+
+class Multiplexer(object):
+    """Drive the measurements of many ports from one thread.
+
+    The file descriptors of all serial ports are registered with a selector. Every port runs a small state machine
+    for request and response with its own deadline, no thread is needed per port.
+    """
+
+    name: str = "MULTIPLEXER"
+
+    # members for reading via thread
+    abort: bool = False
+    status: bool = False
+    active: bool = False
+
+    @property
+    def channels(self) -> List[Channel]:
+        return list(self._channels.values())
+
+    def __init__(self):
+        self._selector = selectors.DefaultSelector()
+        self._channels = {}
+        self._finished = 0
+        return
+
+    def add(self, device: Device, number: int = 0) -> Union[None, Channel]:
+        """Register a connected device.
+
+        :param device: device with an open serial port.
+        :type device: Device
+
+        :param number: number of the measurement command.
+        :type number: int
+
+        :return: channel of the device or None.
+        :rtype: Channel, None
+        """
+        command = device.get_command(number)
+        if command is None:
+            return None
+
+        if device.serial is None:
+            easyb.log.error("Serial port is not set up!")
+            return None
+
+        try:
+            fd = device.serial.fileno()
+        except (AttributeError, OSError, serial.SerialException) as e:
+            easyb.log.error("Serial port has no file descriptor!")
+            easyb.log.exception(e)
+            return None
+
+        if fd in self._channels:
+            easyb.log.error("Serial port is already registered: {0:s}".format(device.port))
+            return None
+
+        channel = Channel(device, command)
+        channel.next_time = time.monotonic()
+        channel.fd = fd
+
+        # writes must not block the other ports, the rest of a frame is sent when the port is writable
+        channel.write_timeout = getattr(device.serial, "write_timeout", None)
+        device.serial.write_timeout = 0
+
+        self._selector.register(fd, selectors.EVENT_READ, channel)
+        self._channels[fd] = channel
+        return channel
+
+    def remove(self, device: Device) -> bool:
+        for (fd, channel) in self._channels.items():
+            if channel.device is not device:
+                continue
+
+            self._selector.unregister(fd)
+            del self._channels[fd]
+            device.serial.write_timeout = channel.write_timeout
+            return True
+
+        easyb.log.error("Device is not registered: {0:s}".format(device.name))
+        return False
+
+    def _send(self, channel: Channel, now: float):
+        device = channel.device
+
+        frame = device.compile(channel.command)
+        if frame is None:
+            channel.next_time = now + device.interval
+            return
+
+        channel.buffer.clear()
+        channel.size = 0
+        channel.start = now
+        channel.deadline = now + device.get_timeout(channel.command.address)
+        channel.state = State.Header
+        channel.requests += 1
+
+        if easyb.log.level > 1:
+            easyb.log.debug2("SEND", debug_data(frame))
+
+        channel.output.clear()
+        channel.output.extend(frame)
+        self._write(channel, now)
+        return
+
+    def _write(self, channel: Channel, now: float):
+        ser = channel.device.serial
+
+        try:
+            number = ser.write(bytes(channel.output))
+            del channel.output[0:number]
+        except serial.SerialException as e:
+            easyb.log.error("Problem during write to serial port!")
+            easyb.log.exception(e)
+            channel.output.clear()
+            self._finish(channel, now, False)
+
+        events = selectors.EVENT_READ
+        if len(channel.output) > 0:
+            events |= selectors.EVENT_WRITE
+
+        if self._selector.get_key(channel.fd).events != events:
+            self._selector.modify(channel.fd, events, channel)
+        return
+
+    def _finish(self, channel: Channel, now: float, status: bool):
+        device = channel.device
+
+        self._finished += 1
+
+        channel.status = status
+        channel.state = State.Idle
+        channel.buffer.clear()
+        device.status = status
+        device.interval_counter += 1
+
+        channel.next_time += device.interval
+        if channel.next_time < now:
+            channel.next_time = now
+        return
+
+    def _complete(self, channel: Channel, now: float):
+        device = channel.device
+
+        message = device.create_message(bytes(channel.buffer))
+        if message is None:
+            self._finish(channel, now, False)
+            return
+
+        if message.length is not Length.Variable:
+            channel.command.response_size = len(channel.buffer)
+
+        error, value = device.decode_value(message)
+        device.store_value(error, value)
+
+        channel.responses += 1
+        self._finish(channel, now, True)
+        return
+
+    def _read(self, channel: Channel, now: float):
+        ser = channel.device.serial
+
+        try:
+            number = ser.in_waiting
+
+            # a spurious event, reading would block until the timeout of the port
+            if number == 0:
+                return
+
+            data = ser.read(number)
+        except serial.SerialException as e:
+            easyb.log.error("Problem during reading of message!")
+            easyb.log.exception(e)
+            self._finish(channel, now, False)
+            return
+
+        if channel.state is State.Idle:
+            easyb.log.warn(channel.device.name, "Drop {0:d} bytes without request!".format(len(data)))
+            return
+
+        channel.buffer.extend(data)
+        channel.last = now
+
+        if channel.state is State.Header:
+            if len(channel.buffer) < 3:
+                return
+
+            device = channel.device
+            if device.adaptive is not None:
+                device.adaptive.add(channel.command.address, now - channel.start)
+
+            length = header_table[channel.buffer[1]][2]
+            if length is Length.Variable:
+                channel.state = State.Variable
+                channel.deadline = now + device.timeout
+                return
+
+            channel.size = message_size.get(length, 3)
+            channel.deadline = now + device.timeout
+            channel.state = State.Body
+
+        if (channel.state is State.Body) and (len(channel.buffer) >= channel.size):
+            del channel.buffer[channel.size:]
+            self._complete(channel, now)
+        return
+
+    def _check(self, channel: Channel, now: float):
+        if channel.state is State.Idle:
+            if now >= channel.next_time:
+                self._send(channel, now)
+            return
+
+        if channel.state is State.Variable:
+            if (now - channel.last) >= channel.device.get_read_gap():
+                self._complete(channel, now)
+                return
+
+        if now >= channel.deadline:
+            channel.timeouts += 1
+            easyb.log.warn(channel.device.name, "No response from address {0:d}!".format(channel.command.address))
+
+            if channel.device.adaptive is not None:
+                channel.device.adaptive.miss(channel.command.address)
+            self._finish(channel, now, False)
+        return
+
+    def poll(self, timeout: float = 1.0) -> int:
+        """Wait for data or the next deadline and advance all state machines once.
+
+        :param timeout: maximum time to wait.
+        :type timeout: float
+
+        :return: number of completed requests.
+        :rtype: int
+        """
+        now = time.monotonic()
+        counter = self._finished
+
+        for channel in self._channels.values():
+            self._check(channel, now)
+
+        now = time.monotonic()
+        wait = timeout
+        for channel in self._channels.values():
+            wait = min(wait, channel.get_wakeup() - now)
+
+        events = self._selector.select(max(wait, 0.0))
+
+        now = time.monotonic()
+        for (key, mask) in events:
+            if mask & selectors.EVENT_WRITE:
+                self._write(key.data, now)
+
+            if mask & selectors.EVENT_READ:
+                self._read(key.data, now)
+
+        for channel in self._channels.values():
+            if channel.state is not State.Idle:
+                self._check(channel, now)
+
+        result = self._finished - counter
+        return result
+
+    # noinspection PyUnusedLocal
+    def do_abort(self, signum, frame):
+        self.abort = True
+        return
+
+    def run_loop(self):
+        self.active = True
+        easyb.log.inform(self.name, "Start measurements on {0:d} ports".format(len(self._channels)))
+
+        while True:
+            self.poll()
+
+            if self.abort is True:
+                easyb.log.inform(self.name, "Stop measurements")
+                break
+
+        self.status = all(x.status for x in self._channels.values())
+        self.active = False
+        return
+
+    def close(self):
+        for (fd, channel) in self._channels.items():
+            self._selector.unregister(fd)
+            channel.device.serial.write_timeout = channel.write_timeout
+
+        self._channels.clear()
+        self._selector.close()
+        return
@@ -0,0 +1,352 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import multiprocessing
+import easyb
+import numpy
+
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Dict, List, Tuple
+
+from easyb.data.base import Sample
+from easyb.engine import Engine, Sink
+from easyb.scheduler import Ticker
+
+__all__ = [
+    "sample_type",
+    "RingBuffer",
+    "RingSink",
+    "ProcessEngine"
+]
+
+
+#: record of one sample in shared memory, error is -1 if the measurement is valid
+sample_type = numpy.dtype([
+    ("time", numpy.float64),
+    ("port", numpy.int32),
+    ("address", numpy.int32),
+    ("value", numpy.float64),
+    ("error", numpy.int32)
+])
+
+#: write index, read index and dropped samples in front of the records
+header_type = numpy.dtype(numpy.uint64)
+header_size = 3
+
+
+class RingBuffer(object):
+    """Ring buffer of samples in shared memory for one writer and one reader process.
+
+    The writer only moves the write index and the reader only moves the read index, so no lock is needed. When the
+    buffer is full new samples are dropped and counted.
+    """
+
+    @property
+    def name(self) -> str:
+        return self._memory.name
+
+    @property
+    def memory(self) -> SharedMemory:
+        return self._memory
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def len(self) -> int:
+        return int(self._header[0] - self._header[1])
+
+    @property
+    def dropped(self) -> int:
+        return int(self._header[2])
+
+    def __init__(self, size: int = 4096, memory: SharedMemory = None):
+        """Create a new ring buffer or attach to an existing one.
+
+        :param size: maximum number of samples.
+        :type size: int
+
+        :param memory: shared memory of an existing ring buffer.
+        :type memory: SharedMemory
+        """
+        if size < 1:
+            raise ValueError("Size of ring buffer is invalid: {0:d}".format(size))
+
+        offset = header_size * header_type.itemsize
+        number = offset + size * sample_type.itemsize
+
+        self._owner = memory is None
+        if memory is None:
+            memory = SharedMemory(create=True, size=number)
+
+        self._memory = memory
+        self._size = size
+        self._header = numpy.ndarray((header_size,), dtype=header_type, buffer=memory.buf)
+        self._records = numpy.ndarray((size,), dtype=sample_type, buffer=memory.buf, offset=offset)
+
+        if self._owner is True:
+            self._header[:] = 0
+        return
+
+    def write(self, port: int, sample: Sample) -> bool:
+        head = int(self._header[0])
+        tail = int(self._header[1])
+
+        if (head - tail) >= self._size:
+            self._header[2] += 1
+            return False
+
+        error = -1
+        if sample.error is not None:
+            error = sample.error.code
+
+        self._records[head % self._size] = (sample.time, port, sample.address, sample.value, error)
+        self._header[0] = head + 1
+        return True
+
+    def read(self) -> numpy.ndarray:
+        """Remove and return all waiting samples.
+
+        :return: copy of the samples with dtype sample_type.
+        :rtype: numpy.ndarray
+        """
+        head = int(self._header[0])
+        tail = int(self._header[1])
+
+        start = tail % self._size
+        number = head - tail
+        end = start + number
+
+        if end <= self._size:
+            result = self._records[start:end].copy()
+        else:
+            result = numpy.concatenate((self._records[start:], self._records[0:end - self._size]))
+
+        self._header[1] = head
+        return result
+
+    def close(self):
+        # views have to be released before the memory is closed
+        self._header = None
+        self._records = None
+
+        self._memory.close()
+        if self._owner is True:
+            self._memory.unlink()
+        return
+
+
+class RingSink(Sink):
+    """Sink of a worker process which writes the samples into a ring buffer."""
+
+    def __init__(self, ring: RingBuffer, ports: Dict[str, int]):
+        Sink.__init__(self)
+        self._ring = ring
+        self._ports = ports
+        return
+
+    def add(self, port: str, sample: Sample):
+        self._ring.write(self._ports[port], sample)
+        return
+
+
+def _start(engine: Engine) -> bool:
+    check = engine.connect()
+    if check is False:
+        return False
+
+    check = engine.prepare()
+    return check
+
+
+def _worker(memory: SharedMemory, size: int, specs: List[Tuple[str, int, str]], ports: Dict[str, int],
+            stop: multiprocessing.Event, count: int, start: Callable, options: dict):
+    ring = RingBuffer(size, memory)
+    sink = RingSink(ring, ports)
+
+    engine = Engine(specs, sink=sink, **options)
+    started = False
+
+    try:
+        started = start(engine)
+        if started is False:
+            easyb.log.error("Unable to start worker for {0:s}".format(", ".join(engine.buses.keys())))
+            return
+
+        # the stop event wakes up the ticker early
+        ticker = Ticker(engine.interval, sleep=stop.wait)
+
+        counter = 0
+        with ThreadPoolExecutor(max_workers=max(len(engine.buses), 1)) as executor:
+            while (count == 0) or (counter < count):
+                engine.cycle(executor)
+                counter += 1
+
+                if (count != 0) and (counter >= count):
+                    break
+
+                missed = ticker.wait()
+                if stop.is_set() is True:
+                    break
+
+                if missed > 0:
+                    easyb.log.warn(engine.name, "Missed {0:d} cycles!".format(missed))
+    finally:
+        try:
+            if started is True:
+                engine.close()
+        finally:
+            engine.disconnect()
+            ring.close()
+    return
+
+
+class ProcessEngine(object):
+    """Acquisition with several worker processes.
+
+    The ports are distributed over the processes, every process runs an engine for its ports and writes the samples
+    into its own ring buffer in shared memory. The parent reads them as numpy records without pickling.
+    """
+
+    name: str = "PROCESSES"
+
+    @property
+    def ports(self) -> List[str]:
+        return self._ports
+
+    @property
+    def rings(self) -> List[RingBuffer]:
+        return self._rings
+
+    @property
+    def shards(self) -> List[List[Tuple[str, int, str]]]:
+        return self._shards
+
+    @property
+    def alive(self) -> bool:
+        return any(x.is_alive() for x in self._processes)
+
+    @property
+    def dropped(self) -> int:
+        return sum(x.dropped for x in self._rings)
+
+    @property
+    def exitcodes(self) -> List[int]:
+        return [x.exitcode for x in self._processes]
+
+    def __init__(self, specs: List[Tuple[str, int, str]], processes: int = 0, size: int = 4096,
+                 start: Callable = _start, **kwargs):
+        """Create the engine.
+
+        :param specs: list of port, address and device type.
+        :type specs: List[Tuple[str, int, str]]
+
+        :param processes: number of worker processes, default is the number of cores.
+        :type processes: int
+
+        :param size: number of samples in the ring buffer of each process.
+        :type size: int
+
+        :param start: function to open and prepare the ports of an engine, called in the worker process.
+        :type start: Callable
+
+        :param kwargs: options for the serial ports, see BusMaster.
+        """
+        if processes == 0:
+            processes = multiprocessing.cpu_count()
+
+        if processes < 1:
+            raise ValueError("Number of processes is invalid: {0:d}".format(processes))
+
+        self._ports = []
+        for (port, _, _) in specs:
+            if port not in self._ports:
+                self._ports.append(port)
+
+        # all addresses of one port stay in one process
+        number = min(processes, max(len(self._ports), 1))
+        self._shards = [[] for _ in range(number)]
+        for spec in specs:
+            index = self._ports.index(spec[0])
+            self._shards[index % number].append(spec)
+
+        self._size = size
+        self._start = start
+        self._options = kwargs
+        self._rings = []
+        self._processes = []
+        self._stop = multiprocessing.Event()
+        return
+
+    def start(self, count: int = 0):
+        """Start the worker processes.
+
+        :param count: number of cycles, 0 to run until stopped.
+        :type count: int
+        """
+        indices = {port: index for (index, port) in enumerate(self._ports)}
+
+        self._stop.clear()
+
+        for shard in self._shards:
+            ring = RingBuffer(self._size)
+            ports = {x[0]: indices[x[0]] for x in shard}
+
+            process = multiprocessing.Process(target=_worker, args=(ring.memory, self._size, shard, ports, self._stop,
+                                                                    count, self._start, self._options))
+            process.start()
+
+            self._rings.append(ring)
+            self._processes.append(process)
+        return
+
+    def read(self) -> numpy.ndarray:
+        """Remove and return the waiting samples of all workers.
+
+        :return: samples with dtype sample_type, use ErrorCodes to map the error codes.
+        :rtype: numpy.ndarray
+        """
+        result = [x.read() for x in self._rings]
+        if len(result) == 0:
+            return numpy.zeros(0, dtype=sample_type)
+        return numpy.concatenate(result)
+
+    def join(self, timeout: float = None):
+        for process in self._processes:
+            process.join(timeout)
+        return
+
+    def stop(self) -> numpy.ndarray:
+        """Stop the workers and release the shared memory.
+
+        :return: samples which are not read yet.
+        :rtype: numpy.ndarray
+        """
+        self._stop.set()
+        self.join()
+
+        result = self.read()
+
+        for ring in self._rings:
+            ring.close()
+
+        self._rings = []
+        self._processes = []
+        return result
@@ -0,0 +1,366 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import heapq
+import math
+import time
+import easyb
+
+from typing import Callable, List, Union
+
+from easyb.command import Command
+from easyb.definitions import Priority
+
+__all__ = [
+    "Ticker",
+    "Job",
+    "CommandScheduler"
+]
+
+
+class Ticker(object):
+    """Periodic ticks on fixed deadlines of the monotonic clock.
+
+    Tick n is due at start + n * interval, the time needed by the measurement does not shift the following ticks.
+    Ticks which are missed completely are skipped and counted as missed. If skip is False they are run late one after
+    another instead, nothing is dropped and so nothing is counted.
+    """
+
+    @property
+    def interval(self) -> float:
+        return self._interval
+
+    @property
+    def ticks(self) -> int:
+        return self._ticks
+
+    @property
+    def missed(self) -> int:
+        return self._missed
+
+    @property
+    def deadline(self) -> float:
+        return self._deadline
+
+    @property
+    def rate(self) -> float:
+        """Achieved ticks per second."""
+        if (self._ticks < 2) or (self._last <= self._first):
+            return 0.0
+        return (self._ticks - 1) / (self._last - self._first)
+
+    @property
+    def jitter_mean(self) -> float:
+        return self._mean
+
+    @property
+    def jitter_max(self) -> float:
+        return self._max
+
+    @property
+    def jitter_std(self) -> float:
+        if self._ticks < 2:
+            return 0.0
+        return math.sqrt(self._m2 / (self._ticks - 1))
+
+    def __init__(self, interval: float, skip: bool = True, clock: Callable = time.monotonic,
+                 sleep: Callable = time.sleep):
+        """Create the ticker.
+
+        :param interval: time between two ticks.
+        :type interval: float
+
+        :param skip: skip missed ticks, otherwise they are run late.
+        :type skip: bool
+
+        :param clock: monotonic clock.
+        :type clock: Callable
+
+        :param sleep: function to wait.
+        :type sleep: Callable
+        """
+        if interval < 0.0:
+            raise ValueError("Interval is invalid: {0:.3f}".format(interval))
+
+        self._interval = interval
+        self._skip = skip
+        self._clock = clock
+        self._sleep = sleep
+        self.start()
+        return
+
+    def start(self):
+        """Reset the statistics and take the current time as first tick."""
+        now = self._clock()
+
+        self._deadline = now
+        self._first = now
+        self._last = now
+        self._ticks = 1
+        self._missed = 0
+        self._mean = 0.0
+        self._max = 0.0
+        self._m2 = 0.0
+        return
+
+    def _add(self, jitter: float, now: float):
+        self._ticks += 1
+        self._last = now
+
+        # running mean and variance
+        delta = jitter - self._mean
+        self._mean += delta / (self._ticks - 1)
+        self._m2 += delta * (jitter - self._mean)
+        self._max = max(self._max, jitter)
+        return
+
+    def wait(self) -> int:
+        """Wait for the next tick.
+
+        :return: number of ticks dropped before this tick, always 0 if missed ticks are not skipped.
+        :rtype: int
+        """
+        deadline = self._deadline + self._interval
+
+        now = self._clock()
+        if now < deadline:
+            self._sleep(deadline - now)
+            now = self._clock()
+
+        missed = 0
+        if (self._skip is True) and (self._interval > 0.0) and ((now - deadline) >= self._interval):
+            missed = int((now - deadline) // self._interval)
+            self._missed += missed
+            deadline += missed * self._interval
+
+        self._deadline = deadline
+        self._add(max(now - deadline, 0.0), now)
+        return missed
+
+    def report(self, name: str):
+        logging = "{0:d} ticks, {1:d} missed, {2:.3f} per second".format(self._ticks, self._missed, self.rate)
+        easyb.log.inform(name, logging)
+
+        logging = "Jitter: mean {0:.2f} ms, max {1:.2f} ms, std {2:.2f} ms".format(self._mean * 1000.0,
+                                                                                   self._max * 1000.0,
+                                                                                   self.jitter_std * 1000.0)
+        easyb.log.inform(name, logging)
+        return
+
+
+class Job(object):
+    """Scheduled command of a device."""
+
+    __slots__ = ("device", "command", "deadline", "runs", "missed", "errors")
+
+    def __init__(self, device, command: Command, deadline: float):
+        self.device = device
+        self.command = command
+        self.deadline = deadline
+        self.runs = 0
+        self.missed = 0
+        self.errors = 0
+        return
+
+
+class CommandScheduler(object):
+    """Run the commands of several devices with their own period.
+
+    Every command with a period is a job with a deadline, the jobs are kept in one heap per priority. Of all due jobs
+    a job with priority is run first, otherwise the job with the earliest deadline. Jobs which are late by more than
+    their period skip the missed runs, so a slow command can not pile up and starve the others.
+
+    A due job without priority gets at least every second run, so jobs with priority which are always due can not
+    starve it. Commands which are marked as sample are run with run() of the device, so their value is stored like in
+    the measurement loop.
+    """
+
+    name: str = "SCHEDULER"
+
+    # members for reading via thread
+    abort: bool = False
+    status: bool = False
+    active: bool = False
+
+    @property
+    def jobs(self) -> List[Job]:
+        return self._jobs
+
+    def __init__(self, clock: Callable = time.monotonic, sleep: Callable = time.sleep):
+        self._clock = clock
+        self._sleep = sleep
+        self._jobs = []
+        self._counter = 0
+        self._waiting = False
+        self._heaps = {
+            Priority.Priority: [],
+            Priority.NoPriority: []
+        }
+        return
+
+    def _push(self, job: Job):
+        # the counter keeps the order of jobs with the same deadline
+        heapq.heappush(self._heaps[job.command.priority], (job.deadline, self._counter, job))
+        self._counter += 1
+        return
+
+    def add(self, device, command: Command) -> Union[None, Job]:
+        """Add a command to the schedule, it is due immediately.
+
+        :param device: device of the command.
+        :type device: Device
+
+        :param command: command with period and priority.
+        :type command: Command
+
+        :return: job of the command or None.
+        :rtype: Job, None
+        """
+        if command.period <= 0.0:
+            easyb.log.error("Command has no period: {0:s}".format(command.name))
+            return None
+
+        job = Job(device, command, self._clock())
+        self._jobs.append(job)
+        self._push(job)
+        return job
+
+    def add_device(self, device) -> int:
+        """Add all commands of a device with a period.
+
+        :param device: device to add.
+        :type device: Device
+
+        :return: number of added commands.
+        :rtype: int
+        """
+        counter = 0
+
+        for command in device.get_schedule():
+            job = self.add(device, command)
+            if job is not None:
+                counter += 1
+        return counter
+
+    def _get_next(self, now: float) -> Union[None, Job]:
+        high = self._heaps[Priority.Priority]
+        low = self._heaps[Priority.NoPriority]
+
+        high_due = (len(high) > 0) and (high[0][0] <= now)
+        low_due = (len(low) > 0) and (low[0][0] <= now)
+
+        # a job without priority which was passed over once runs next
+        if (high_due is True) and ((low_due is False) or (self._waiting is False)):
+            self._waiting = low_due
+            return heapq.heappop(high)[2]
+
+        if low_due is True:
+            self._waiting = False
+            return heapq.heappop(low)[2]
+        return None
+
+    def get_deadline(self) -> Union[None, float]:
+        deadlines = [x[0][0] for x in self._heaps.values() if len(x) > 0]
+
+        if len(deadlines) == 0:
+            return None
+        return min(deadlines)
+
+    def next(self) -> Union[None, Job]:
+        """Wait until a job is due and remove it from the schedule.
+
+        :return: next job or None if the schedule is empty.
+        :rtype: Job, None
+        """
+        while True:
+            deadline = self.get_deadline()
+            if deadline is None:
+                return None
+
+            now = self._clock()
+
+            job = self._get_next(now)
+            if job is not None:
+                return job
+
+            self._sleep(deadline - now)
+
+    def _reschedule(self, job: Job, now: float):
+        period = job.command.period
+
+        job.deadline += period
+        if job.deadline <= now - period:
+            missed = int((now - job.deadline) // period)
+            job.deadline += missed * period
+            job.missed += missed
+
+        self._push(job)
+        return
+
+    def step(self) -> bool:
+        """Run the next due command.
+
+        :return: True if the command was successful, otherwise False.
+        :rtype: bool
+        """
+        job = self.next()
+        if job is None:
+            return False
+
+        device = job.device
+
+        if job.command.sample is True:
+            check = device.run()
+            device.status = check
+            device.interval_counter += 1
+        else:
+            check = device.run_command(job.command.number)
+
+        job.runs += 1
+        if check is False:
+            job.errors += 1
+
+        self._reschedule(job, self._clock())
+        return check
+
+    # noinspection PyUnusedLocal
+    def do_abort(self, signum, frame):
+        self.abort = True
+        return
+
+    def run_loop(self):
+        self.active = True
+        easyb.log.inform(self.name, "Start {0:d} scheduled commands".format(len(self._jobs)))
+
+        while True:
+            self.status = self.step()
+
+            if self.abort is True:
+                easyb.log.inform(self.name, "Stop measurements")
+                break
+
+        self.report()
+        self.active = False
+        return
+
+    def report(self):
+        for job in self._jobs:
+            logging = "{0:s}: {1:d} runs, {2:d} missed, {3:d} errors".format(job.command.name, job.runs, job.missed,
+                                                                              job.errors)
+            easyb.log.inform(job.device.name, logging)
+        return
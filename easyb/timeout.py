@@ -0,0 +1,125 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import math
+
+from collections import deque
+from typing import Dict
+
+__all__ = [
+    "AdaptiveTimeout"
+]
+
+
+class AdaptiveTimeout(object):
+    """Read timeout per address, derived from a rolling percentile of measured round trip times.
+
+    The timeout is the percentile multiplied with a safety factor, limited by floor and ceiling. Addresses without
+    measurements get the ceiling. After a missed response the address keeps the short timeout, or the floor if it
+    has no measurements, and is only probed with the ceiling after 1, 2, 4, ... consecutive misses and then after
+    every probe misses, so a dead device does not cost the ceiling on every request.
+    """
+
+    @property
+    def floor(self) -> float:
+        return self._floor
+
+    @property
+    def ceiling(self) -> float:
+        return self._ceiling
+
+    def __init__(self, floor: float = 0.05, ceiling: float = 2.0, percentile: float = 95.0, factor: float = 2.0,
+                 window: int = 32, probe: int = 64):
+        if floor > ceiling:
+            raise ValueError("Timeout floor {0:.3f} is above ceiling {1:.3f}!".format(floor, ceiling))
+
+        if probe < 1:
+            raise ValueError("Probe interval is invalid: {0:d}".format(probe))
+
+        self._floor = floor
+        self._ceiling = ceiling
+        self._percentile = percentile
+        self._factor = factor
+        self._window = window
+        self._probe = probe
+        self._samples: Dict[int, deque] = {}
+        self._misses: Dict[int, int] = {}
+        return
+
+    def add(self, address: int, round_trip: float):
+        samples = self._samples.get(address, None)
+        if samples is None:
+            samples = deque(maxlen=self._window)
+            self._samples[address] = samples
+
+        samples.append(round_trip)
+        self._misses[address] = 0
+        return
+
+    def miss(self, address: int):
+        """Count a missed response of an address."""
+        self._misses[address] = self._misses.get(address, 0) + 1
+        return
+
+    def get_misses(self, address: int) -> int:
+        return self._misses.get(address, 0)
+
+    def _is_probe(self, misses: int) -> bool:
+        if misses >= self._probe:
+            return (misses % self._probe) == 0
+
+        # exponential backoff, probe after 1, 2, 4, 8, ... misses
+        return (misses & (misses - 1)) == 0
+
+    def get_percentile(self, address: int) -> float:
+        samples = self._samples.get(address, None)
+        if (samples is None) or (len(samples) == 0):
+            return 0.0
+
+        values = sorted(samples)
+        index = int(math.ceil(self._percentile / 100.0 * len(values))) - 1
+        index = min(max(index, 0), len(values) - 1)
+        return values[index]
+
+    def get(self, address: int) -> float:
+        samples = self._samples.get(address, None)
+        empty = (samples is None) or (len(samples) == 0)
+
+        timeout = self._ceiling
+        if empty is False:
+            timeout = self.get_percentile(address) * self._factor
+            timeout = min(max(timeout, self._floor), self._ceiling)
+
+        misses = self._misses.get(address, 0)
+        if misses == 0:
+            return timeout
+
+        if self._is_probe(misses) is True:
+            return self._ceiling
+
+        if empty is True:
+            return self._floor
+        return timeout
+
+    def reset(self, address: int):
+        if address in self._samples:
+            del self._samples[address]
+
+        if address in self._misses:
+            del self._misses[address]
+        return
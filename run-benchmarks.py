@@ -0,0 +1,182 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import os
+import sys
+import json
+
+import easyb
+
+from typing import List
+from optparse import OptionParser
+
+from easyb.utils import check_dict, openjson
+from benchmarks.codec import Result, cases, measure, measure_speed
+
+
+class BenchmarkTask(object):
+
+    options = None
+    parser = OptionParser("usage: %prog [options]")
+
+    def __init__(self):
+        """The constructor.
+        """
+
+        self.parser.add_option("-b", "--baseline", help="baseline file", metavar="FILE", type="string",
+                               default="benchmarks-baseline.json")
+        self.parser.add_option("-s", "--save", help="save results as new baseline", action="store_true",
+                               default=False)
+        self.parser.add_option("-t", "--tolerance", help="allowed slowdown and memory growth (in percent)",
+                               metavar="20", type="float", default=20.0)
+        self.parser.add_option("-n", "--name", help="run benchmark", metavar="NAME", type="string", default="")
+
+        self._results = []
+        """stores benchmark results."""
+        return
+
+    @property
+    def results(self) -> List[Result]:
+        return self._results
+
+    def prepare(self) -> bool:
+        """Parse the options.
+
+        :returns: True if successfull, otherwise False.
+        :rtype: bool
+        """
+
+        (options, args) = self.parser.parse_args()
+
+        if options is None:
+            easyb.log.error("Unable to parse options!")
+            return False
+
+        self.options = options
+        return True
+
+    def run(self) -> bool:
+        """Run the benchmarks.
+
+        :returns: True if successfull, otherwise False.
+        :rtype: bool
+        """
+        for name, call in cases:
+            if (self.options.name != "") and (self.options.name != name):
+                continue
+
+            result = measure(name, call)
+            self._results.append(result)
+
+            logline = "{0:s} {1:12.0f} ops/s {2:8.1f} bytes/call {3:6.2f} allocations/call".format(
+                name.ljust(20), result.ops, result.memory, result.allocations)
+            easyb.log.inform("BENCHMARK", logline)
+
+        if len(self.results) == 0:
+            easyb.log.error("No benchmarks to run!")
+            return False
+        return True
+
+    def save(self) -> bool:
+        """Store the results as baseline.
+
+        :returns: True if successfull, otherwise False.
+        :rtype: bool
+        """
+        filename = os.path.abspath(os.path.normpath(self.options.baseline))
+
+        data = {}
+        for result in self.results:
+            data[result.name] = result.to_dict()
+
+        f = open(filename, mode='w', encoding="utf-8")
+        json.dump(data, f, indent=4)
+        f.close()
+
+        easyb.log.inform("BASELINE", "Stored: " + filename)
+        return True
+
+    def compare(self) -> bool:
+        """Compare the results with the baseline.
+
+        :returns: True if there is no regression, otherwise False.
+        :rtype: bool
+        """
+        filename = os.path.abspath(os.path.normpath(self.options.baseline))
+
+        if os.path.exists(filename) is False:
+            easyb.log.warn("BASELINE", "File not found: " + filename)
+            return True
+
+        data = openjson(filename)
+        limit = 1.0 - (self.options.tolerance / 100.0)
+        growth = 1.0 + (self.options.tolerance / 100.0)
+        calls = dict(cases)
+        check = True
+
+        for result in self.results:
+            if result.name not in data:
+                easyb.log.warn("BASELINE", "No baseline for {0:s}".format(result.name))
+                continue
+
+            item = data[result.name]
+            if check_dict(item, ["ops", "memory", "allocations"]) is False:
+                easyb.log.error("Baseline for {0:s} is invalid!".format(result.name))
+                continue
+
+            # a slowdown is confirmed by timing again, a busy machine slows single runs
+            retry = 0
+            while ((result.ops / item["ops"]) < limit) and (retry < 2):
+                result.ops = max(result.ops, measure_speed(calls[result.name]))
+                retry += 1
+
+            ratio = result.ops / item["ops"]
+            logline = "{0:s} {1:6.2f}x speed, {2:+8.1f} bytes/call, {3:+6.2f} allocations/call".format(
+                result.name.ljust(20), ratio, result.memory - item["memory"], result.allocations - item["allocations"])
+
+            # bands of one pointer and half an allocation per call keep small baselines from flagging noise
+            memory = (result.memory > max(item["memory"] * growth, item["memory"] + 8.0)) or \
+                     (result.allocations > max(item["allocations"] * growth, item["allocations"] + 0.5))
+
+            if (ratio < limit) or memory:
+                easyb.log.warn("REGRESSION", logline)
+                check = False
+            else:
+                easyb.log.inform("COMPARE", logline)
+
+        return check
+
+
+if __name__ == '__main__':
+
+    main = BenchmarkTask()
+
+    if main.prepare() is False:
+        sys.exit(1)
+
+    if main.run() is False:
+        sys.exit(1)
+
+    if main.options.save is True:
+        main.save()
+        sys.exit(0)
+
+    if main.compare() is False:
+        sys.exit(1)
+
+    sys.exit(0)
@@ -42,7 +42,8 @@ setup(
     ],
     install_requires=[
         'colorama',
-        "pyserial"
+        "pyserial",
+        "numpy"
     ]
 )
 
@@ -0,0 +1,237 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import unittest
+import asyncio
+import time
+
+from easyb.aio import AsyncDevice
+from easyb.bit import create_crc
+from easyb.definitions import Length
+from easyb.devices.gmh3710 import GMH3710
+from easyb.timeout import AdaptiveTimeout
+
+
+class TestAsyncSerial(object):
+    """Serial port of one device, the measurement response is waiting after a delay."""
+
+    def __init__(self, delay: float = 0.0, silent: bool = False):
+        self.buffer = bytearray()
+        self.delay = delay
+        self.silent = silent
+        self.ready = 0.0
+        self.frames = []
+        self.resets = 0
+        return
+
+    @property
+    def in_waiting(self) -> int:
+        if time.monotonic() < self.ready:
+            return 0
+        return len(self.buffer)
+
+    def reset_input_buffer(self):
+        self.resets += 1
+        self.buffer.clear()
+        return
+
+    def write(self, frame: bytes) -> int:
+        self.frames.append(bytes(frame))
+        self.ready = time.monotonic() + self.delay
+
+        if self.silent is True:
+            return len(frame)
+
+        byte1 = frame[0]
+        byte2 = 0x0d
+        self.buffer.extend([byte1, byte2, create_crc(byte1, byte2)])
+        self.buffer.extend([0x72, 0xff, 0x84, 0x00, 0xfc, 0x05])
+        return len(frame)
+
+    def read(self, count=1) -> bytes:
+        result = bytes(self.buffer[0:count])
+        del self.buffer[0:count]
+        return result
+
+
+def create_device(address: int = 1, delay: float = 0.0, silent: bool = False) -> AsyncDevice:
+    device = GMH3710(address=address, timeout=0.5)
+    device.serial = TestAsyncSerial(delay, silent)
+    return AsyncDevice(device)
+
+
+# noinspection DuplicatedCode
+class TestAsyncDevice(unittest.TestCase):
+    """Testing class for asyncio device module."""
+
+    def setUp(self):
+        """set up test.
+        """
+        return
+
+    def tearDown(self):
+        """tear down test.
+        """
+        return
+
+    def test_execute_1(self):
+        device = create_device(delay=0.01)
+        command = device.device.get_command(0)
+
+        message = asyncio.run(device.execute(command))
+
+        self.assertIsNotNone(message)
+        self.assertIs(message.length, Length.Byte9)
+        self.assertEqual(message.address, 1)
+        self.assertEqual(command.response_size, 9)
+        self.assertEqual(device.device.serial.frames[0], bytes([254, 0, 61]))
+        return
+
+    def test_execute_2(self):
+        device = create_device(silent=True)
+        device.device.timeout = 0.05
+        command = device.device.get_command(0)
+
+        message = asyncio.run(device.execute(command))
+
+        self.assertIsNone(message)
+        return
+
+    def test_execute_3(self):
+        device = create_device(delay=0.2)
+        command = device.device.get_command(0)
+
+        async def run():
+            try:
+                await asyncio.wait_for(device.execute(command), 0.05)
+            except asyncio.TimeoutError:
+                pass
+
+            device.device.serial.delay = 0.0
+            result = await device.execute(command)
+            return result
+
+        message = asyncio.run(run())
+
+        self.assertIsNotNone(message)
+        self.assertEqual(device.device.serial.resets, 2)
+        self.assertEqual(len(device.device.serial.frames), 2)
+        return
+
+    def test_execute_4(self):
+        device = create_device(silent=True)
+        device.device.timeout = 0.05
+        device.device.adaptive = AdaptiveTimeout(floor=0.01, ceiling=0.05)
+        command = device.device.get_command(0)
+
+        async def run():
+            result1 = await device.execute(command)
+            result2 = await device.execute(command)
+            return result1, result2
+
+        message1, message2 = asyncio.run(run())
+
+        self.assertIsNone(message1)
+        self.assertIsNone(message2)
+        self.assertEqual(device.device.adaptive.get_misses(1), 2)
+        return
+
+    def test_execute_5(self):
+        device = create_device()
+        device.device.wait_time = 0.1
+        command = device.device.get_command(0)
+
+        start = time.monotonic()
+        message = asyncio.run(device.execute(command))
+        duration = time.monotonic() - start
+
+        self.assertIsNotNone(message)
+        self.assertGreaterEqual(duration, 0.1)
+        self.assertLess(duration, 0.4)
+        return
+
+    def test_execute_6(self):
+        device1 = create_device(address=1, delay=0.05)
+        device2 = create_device(address=2)
+        device2.device.serial = device1.device.serial
+
+        async def run():
+            command1 = device1.device.get_command(0)
+            command2 = device2.device.get_command(0)
+            result = await asyncio.gather(device1.execute(command1), device2.execute(command2))
+            return result
+
+        message1, message2 = asyncio.run(run())
+
+        self.assertIsNotNone(message1)
+        self.assertIsNotNone(message2)
+        self.assertEqual(message1.address, 1)
+        self.assertEqual(message2.address, 2)
+        self.assertEqual(device1.device.serial.resets, 2)
+        return
+
+    def test_run_command_1(self):
+        device = create_device()
+
+        check1 = asyncio.run(device.run_command(0))
+        check2 = asyncio.run(device.run_command(99))
+
+        self.assertTrue(check1)
+        self.assertFalse(check2)
+        return
+
+    def test_samples_1(self):
+        device = create_device()
+
+        async def run():
+            result = []
+            async for sample in device.samples(interval=0.01, count=3):
+                result.append(sample)
+            return result
+
+        samples = asyncio.run(run())
+
+        self.assertEqual(len(samples), 3)
+        self.assertEqual([x.number for x in samples], [0, 1, 2])
+        self.assertIsNone(samples[0].error)
+        self.assertEqual(samples[0].address, 1)
+        self.assertEqual(device.device.data.len, 3)
+        self.assertIs(samples[2], device.device.sample)
+        return
+
+    def test_samples_2(self):
+        devices = [create_device(address=n + 1, delay=0.1) for n in range(10)]
+
+        async def collect(device: AsyncDevice):
+            result = []
+            async for sample in device.samples(interval=0.0, count=2):
+                result.append(sample)
+            return result
+
+        async def run():
+            result = await asyncio.gather(*[collect(x) for x in devices])
+            return result
+
+        start = time.monotonic()
+        samples = asyncio.run(run())
+        duration = time.monotonic() - start
+
+        self.assertEqual([len(x) for x in samples], [2] * 10)
+        self.assertEqual([x[0].address for x in samples], list(range(1, 11)))
+        self.assertLess(duration, 1.0)
+        return
@@ -18,6 +18,7 @@
 
 
 import unittest
+import numpy
 
 import easyb.bit
 
@@ -46,6 +47,22 @@ class TestBit(unittest.TestCase):
         self.assertEqual(crc, 0x3d, "Failed: crc: " + hex(crc))
         return
 
+    def test_create_crc_table(self):
+
+        failed = []
+
+        for byte1 in range(256):
+            for byte2 in range(256):
+                crc1 = easyb.bit._create_crc_bitwise(byte1, byte2)
+                crc2 = easyb.bit.create_crc(byte1, byte2)
+
+                if crc1 != crc2:
+                    failed.append((byte1, byte2))
+
+        self.assertEqual(len(easyb.bit.crc_table), 65536)
+        self.assertListEqual(failed, [], "Failed: crc table")
+        return
+
     def test_check_crc_1(self):
 
         check = easyb.bit.check_crc(0xfe, 0x00, 0x3d)
@@ -60,6 +77,68 @@ class TestBit(unittest.TestCase):
         self.assertIs(check, False, "Failed: crc")
         return
 
+    def test_verify_crc_batch_1(self):
+        data = bytes([0xfe, 0x00, 0x3d, 0xfe, 0x00, 0x3c, 0xfe, 0x05, 0x26])
+
+        mask, failed = easyb.bit.verify_crc_batch(data)
+
+        self.assertListEqual(mask.tolist(), [True, False, True], "Failed: crc mask")
+        self.assertEqual(failed, 1, "Failed: crc failures")
+        return
+
+    def test_verify_crc_batch_2(self):
+        data = numpy.array([[0xfe, 0x00, 0x3d], [0xfe, 0x05, 0x26]], dtype=numpy.uint8)
+
+        mask, failed = easyb.bit.verify_crc_batch(data)
+
+        self.assertListEqual(mask.tolist(), [True, True], "Failed: crc mask")
+        self.assertEqual(failed, 0, "Failed: crc failures")
+        return
+
+    def test_verify_crc_batch_3(self):
+        data = bytes([0xfe, 0x00, 0x3d, 0xfe])
+
+        with self.assertRaises(ValueError):
+            easyb.bit.verify_crc_batch(data)
+        return
+
+    def test_decode_u16_table(self):
+        failed = []
+
+        for byte3 in range(256):
+            for byte4 in range(256):
+                result1 = easyb.bit._decode_u16_calc(byte3, byte4)
+                result2 = easyb.bit.decode_u16(byte3, byte4)
+
+                if result1 != result2:
+                    failed.append((byte3, byte4))
+
+        self.assertListEqual(failed, [], "Failed: decode 16 table")
+        return
+
+    def test_decode_u16_many(self):
+        data = bytes([0xf7, 0xfc, 0xc0, 0xe2, 0xff, 0x00])
+
+        errors, values = easyb.bit.decode_u16_many(data)
+
+        for n in range(3):
+            error, value = easyb.bit.decode_u16(data[n * 2], data[n * 2 + 1])
+            self.assertEqual(errors[n], error, "Failed: decode 16 error")
+            self.assertEqual(values[n], value, "Failed: decode 16 value")
+
+        self.assertEqual(errors[0], -1, "Failed: decode 16 error")
+        self.assertEqual(errors[1], 16354, "Failed: decode 16 error")
+        return
+
+    def test_decode_u16_error(self):
+        # 0x3fe0 is the first error code and must not be taken for a valid value
+        error, value = easyb.bit.decode_u16(0xc0, 0xe0)
+
+        self.assertEqual(error, 16352, "Failed: decode 16 error")
+        self.assertEqual(value, 0.0, "Failed: decode 16 value")
+        self.assertIsNone(easyb.bit.get_u16_error(-1))
+        return
+
     def test_decode_u32(self):
         error, value = easyb.bit.decode_u32(0x72, 0xff, 0x00, 0xfc)
 
@@ -67,6 +146,79 @@ class TestBit(unittest.TestCase):
         self.assertEqual(value, -0.04, "Failed: decode 32: " + str(value))
         return
 
+    def test_decode_u32_many_1(self):
+        frame1 = [0xfe, 0x0d, 0x1c, 0x72, 0xff, 0x84, 0x00, 0xfc, 0x05]
+        frame2 = [0xfe, 0x0d, 0x1c, 0x71, 0x00, 0x48, 0xe3, 0x54, 0x28]
+        data = numpy.array([frame1, frame2], dtype=numpy.uint8)
+
+        errors, values = easyb.bit.decode_u32_many(data)
+
+        self.assertEqual(len(errors), 2, "Failed: decode 32 errors")
+        self.assertListEqual(errors.codes.tolist(), [-1, -1], "Failed: decode 32 errors")
+        self.assertIsNone(errors[0], "Failed: decode 32 errors")
+
+        for n, frame in enumerate([frame1, frame2]):
+            error, value = easyb.bit.decode_u32(frame[3], frame[4], frame[6], frame[7])
+            self.assertEqual(values[n], value, "Failed: decode 32 value")
+        return
+
+    def test_decode_u32_many_2(self):
+        frame = [0xfe, 0x0d, 0x1c, 0xf8, 0xf6, 0x00, 0xdf, 0xe0, 0x00]
+
+        errors, values = easyb.bit.decode_u32_many(bytes(frame))
+
+        self.assertListEqual(errors.codes.tolist(), [16352], "Failed: decode 32 errors")
+        self.assertListEqual(values.tolist(), [0.0], "Failed: decode 32 values")
+        return
+
+    def test_decode_u32_many_3(self):
+        data = bytes([0xfe, 0x0d, 0x1c, 0x72, 0xff])
+
+        with self.assertRaises(ValueError):
+            easyb.bit.decode_u32_many(data)
+        return
+
+    def test_decode_cache_1(self):
+        cache = easyb.bit.DecodeCache(4)
+
+        error1, value1 = cache.decode_u32(0x72, 0xff, 0x00, 0xfc)
+        error2, value2 = cache.decode_u32(0x72, 0xff, 0x00, 0xfc)
+        error3, value3 = easyb.bit.decode_u32(0x72, 0xff, 0x00, 0xfc)
+
+        self.assertEqual(value1, value3, "Failed: decode cache")
+        self.assertEqual(value2, value3, "Failed: decode cache")
+        self.assertIs(error1, error3, "Failed: decode cache")
+        self.assertEqual(cache.hits, 1, "Failed: decode cache hits")
+        self.assertEqual(cache.misses, 1, "Failed: decode cache misses")
+        self.assertEqual(cache.evictions, 0, "Failed: decode cache evictions")
+        self.assertEqual(cache.len, 1, "Failed: decode cache len")
+        return
+
+    def test_decode_cache_2(self):
+        cache = easyb.bit.DecodeCache(2)
+
+        cache.decode_u32(0x72, 0xff, 0x00, 0xfc)
+        cache.decode_u32(0x72, 0xff, 0x00, 0xfd)
+        cache.decode_u32(0x72, 0xff, 0x00, 0xfc)
+        cache.decode_u32(0x72, 0xff, 0x00, 0xfe)
+        cache.decode_u32(0x72, 0xff, 0x00, 0xfc)
+        cache.decode_u32(0x72, 0xff, 0x00, 0xfd)
+
+        self.assertEqual(cache.hits, 2, "Failed: decode cache hits")
+        self.assertEqual(cache.misses, 4, "Failed: decode cache misses")
+        self.assertEqual(cache.evictions, 2, "Failed: decode cache evictions")
+        self.assertEqual(cache.len, 2, "Failed: decode cache len")
+
+        cache.clear()
+        self.assertEqual(cache.len, 0, "Failed: decode cache clear")
+        self.assertEqual(cache.hits, 0, "Failed: decode cache clear")
+        return
+
+    def test_decode_cache_3(self):
+        with self.assertRaises(ValueError):
+            easyb.bit.DecodeCache(0)
+        return
+
     def test_encode_u32_1(self):
         value = -0.04
         check = [0x72, 0xff, 0x84, 0x00, 0xfc, 0x05]
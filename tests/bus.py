@@ -0,0 +1,176 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import unittest.mock as mock
+import unittest
+
+from easyb.bit import create_crc
+from easyb.bus import BusMaster
+
+mock_serial = mock.Mock()
+
+
+class TestBusSerial(object):
+    """Serial line with several devices, every request gets a measurement response from the addressed device."""
+
+    def __init__(self, silent: list = None):
+        self.buffer = bytearray()
+        self.frames = []
+        self.silent = silent or []
+        self.is_open = True
+        return
+
+    def close(self):
+        self.is_open = False
+        return
+
+    @property
+    def in_waiting(self) -> int:
+        return len(self.buffer)
+
+    def write(self, frame: bytes) -> int:
+        self.frames.append(bytes(frame))
+
+        address = 255 - frame[0]
+        if address in self.silent:
+            return len(frame)
+
+        byte1 = 255 - address
+        byte2 = 0x0d
+        self.buffer.extend([byte1, byte2, create_crc(byte1, byte2)])
+        self.buffer.extend([0x72, 0xff, 0x84, 0x00, 0xfc, 0x05])
+        return len(frame)
+
+    def read(self, count=1) -> bytes:
+        result = bytes(self.buffer[0:count])
+        del self.buffer[0:count]
+        return result
+
+
+# noinspection DuplicatedCode
+class TestBus(unittest.TestCase):
+    """Testing class for bus master module."""
+
+    def setUp(self):
+        """set up test.
+        """
+        return
+
+    def tearDown(self):
+        """tear down test.
+        """
+        return
+
+    def test_constructor(self):
+        bus = BusMaster(port="TEST", baudrate=9600, timeout=0.5, interval=1.0)
+
+        self.assertEqual(bus.port, "TEST")
+        self.assertEqual(bus.baudrate, 9600)
+        self.assertEqual(bus.timeout, 0.5)
+        self.assertEqual(bus.interval, 1.0)
+        self.assertEqual(bus.addresses, [])
+        return
+
+    def test_add_device_1(self):
+        bus = BusMaster(port="TEST")
+
+        device1 = bus.add_device(1, "GMH 3710")
+        device2 = bus.add_device(2, "GMH 3710")
+
+        self.assertIsNotNone(device1)
+        self.assertIsNotNone(device2)
+        self.assertEqual(bus.addresses, [1, 2])
+        self.assertEqual(device1.address, 1)
+        self.assertEqual(device2.address, 2)
+        self.assertEqual(device1.get_command(0).address, 1)
+        self.assertEqual(device2.get_command(0).address, 2)
+        self.assertIsNot(device1.data, device2.data)
+        self.assertIs(bus.get_device(2), device2)
+        return
+
+    def test_add_device_2(self):
+        bus = BusMaster(port="TEST")
+
+        device1 = bus.add_device(1, "GMH 3710")
+        device2 = bus.add_device(1, "GMH 3710")
+        device3 = bus.add_device(2, "GMH")
+
+        self.assertIsNotNone(device1)
+        self.assertIsNone(device2)
+        self.assertIsNone(device3)
+        self.assertEqual(bus.addresses, [1])
+        self.assertIsNone(bus.get_device(2))
+        return
+
+    @mock.patch('easyb.bus.Serial', new=mock_serial)
+    def test_setup(self):
+        bus = BusMaster(port="TEST")
+
+        device1 = bus.add_device(1, "GMH 3710")
+        bus.setup()
+        device2 = bus.add_device(2, "GMH 3710")
+
+        self.assertIsNotNone(bus.serial)
+        self.assertIs(device1.serial, bus.serial)
+        self.assertIs(device2.serial, bus.serial)
+        self.assertEqual(mock_serial.call_count, 1)
+        return
+
+    def test_poll_1(self):
+        bus = BusMaster(port="TEST", timeout=0.1)
+
+        device1 = bus.add_device(1, "GMH 3710")
+        device2 = bus.add_device(2, "GMH 3710")
+        device3 = bus.add_device(3, "GMH 3710")
+
+        serial = TestBusSerial()
+        bus.serial = serial
+        for device in bus.devices.values():
+            device.serial = serial
+
+        check1 = bus.poll()
+        check2 = bus.poll()
+
+        self.assertTrue(check1)
+        self.assertTrue(check2)
+        self.assertEqual([255 - x[0] for x in serial.frames], [1, 2, 3, 1, 2, 3])
+        self.assertEqual(device1.data.len, 2)
+        self.assertEqual(device2.data.len, 2)
+        self.assertEqual(device3.data.len, 2)
+        self.assertEqual(device2.data.rows[1].number, 1)
+        return
+
+    def test_poll_2(self):
+        bus = BusMaster(port="TEST", timeout=0.05)
+
+        device1 = bus.add_device(1, "GMH 3710")
+        device2 = bus.add_device(2, "GMH 3710")
+
+        serial = TestBusSerial(silent=[1])
+        bus.serial = serial
+        device1.serial = serial
+        device2.serial = serial
+
+        check = bus.poll()
+
+        self.assertFalse(check)
+        self.assertFalse(device1.status)
+        self.assertTrue(device2.status)
+        self.assertEqual(device1.data.len, 0)
+        self.assertEqual(device2.data.len, 1)
+        return
@@ -30,6 +30,7 @@ class TestOptions(object):
 
     device = ""
     command = 0
+    address = "1"
     port = ""
     verbose = 0
     list = False
@@ -74,6 +75,21 @@ class TestOptions(object):
         self.verbose = 0
         self.read = True
 
+    def test_9(self):
+        self.device = "GMH 3710"
+        self.command = 0
+        self.address = "1,2"
+        self.port = "TEST"
+        self.verbose = 0
+
+    def test_10(self):
+        self.device = "GMH 3710"
+        self.command = 0
+        self.address = "1,x"
+        self.port = "TEST"
+        self.verbose = 0
+        self.read = True
+
 
 # noinspection DuplicatedCode
 class TestConsole(unittest.TestCase):
@@ -280,6 +296,36 @@ class TestConsole(unittest.TestCase):
         self.assertTrue(check)
         return
 
+    def test_prepare_12(self):
+        options = TestOptions()
+        options.test_9()
+
+        console = Console()
+        console._parser = mock.Mock()
+        console._parser.parse_args = mock.Mock()
+        console._parser.parse_args.return_value = (options, None)
+
+        check = console.prepare()
+
+        self.assertFalse(check)
+        self.assertIsNone(console.device)
+        return
+
+    def test_prepare_13(self):
+        options = TestOptions()
+        options.test_10()
+
+        console = Console()
+        console._parser = mock.Mock()
+        console._parser.parse_args = mock.Mock()
+        console._parser.parse_args.return_value = (options, None)
+
+        check = console.prepare()
+
+        self.assertFalse(check)
+        self.assertIsNone(console.bus)
+        return
+
     @mock.patch('easyb.device.Serial', new=mock_serial)
     def test_run_1(self):
         """tear down test.
@@ -18,6 +18,7 @@
 
 import unittest.mock as mock
 import unittest
+import time
 
 import easyb
 
@@ -113,6 +114,92 @@ class TestRead(object):
         return result
 
 
+class TestSerial(object):
+
+    def __init__(self, data: bytes, chunk: int = 0):
+        self.buffer = bytearray(data)
+        self.chunk = chunk
+        self.reads = 0
+        self.write = mock.Mock()
+        return
+
+    @property
+    def in_waiting(self) -> int:
+        if self.chunk == 0:
+            return len(self.buffer)
+
+        return min(self.chunk, len(self.buffer))
+
+    def read(self, count=1) -> bytes:
+        self.reads += 1
+
+        result = bytes(self.buffer[0:count])
+        del self.buffer[0:count]
+        return result
+
+
+class TestDelaySerial(object):
+
+    def __init__(self, data: bytes, delay: float):
+        self.data = data
+        self.delay = delay
+        self.buffer = bytearray()
+        self.start = 0.0
+        return
+
+    @property
+    def in_waiting(self) -> int:
+        if (time.monotonic() - self.start) < self.delay:
+            return 0
+        return len(self.buffer)
+
+    def write(self, frame: bytes) -> int:
+        self.start = time.monotonic()
+        self.buffer = bytearray(self.data)
+        return len(frame)
+
+    def read(self, count=1) -> bytes:
+        result = bytes(self.buffer[0:count])
+        del self.buffer[0:count]
+        return result
+
+
+class TestChunkSerial(object):
+    """Response arrives in chunks with a delay between them."""
+
+    def __init__(self, data: bytes, chunk: int, delay: float):
+        self.data = data
+        self.chunk = chunk
+        self.delay = delay
+        self.buffer = bytearray()
+        self.start = 0.0
+        self.consumed = 0
+        self.reads = 0
+        return
+
+    @property
+    def in_waiting(self) -> int:
+        number = self.chunk * (1 + int((time.monotonic() - self.start) / self.delay))
+        return min(number, len(self.buffer)) - self.consumed
+
+    def write(self, frame: bytes) -> int:
+        self.start = time.monotonic()
+        self.buffer = bytearray(self.data)
+        self.consumed = 0
+        return len(frame)
+
+    def read(self, count=1) -> bytes:
+        self.reads += 1
+
+        # like a blocking port, wait until enough bytes have arrived
+        while self.in_waiting < min(count, len(self.buffer) - self.consumed):
+            time.sleep(0.001)
+
+        result = bytes(self.buffer[self.consumed:self.consumed + count])
+        self.consumed += len(result)
+        return result
+
+
 class TestControl(unittest.TestCase):
     """Testing class for locking module."""
 
@@ -312,6 +399,22 @@ class TestControl(unittest.TestCase):
         self.assertIsNone(command)
         return
 
+    def test_get_command_3(self):
+        device = TestDevice()
+
+        command1 = Command(name="Systemstatus lesen", code=3)
+        command2 = Command(name="Minwert lesen", code=6)
+        device.add_command(command1)
+        device.add_command(command2)
+
+        self.assertEqual(command1.number, 0)
+        self.assertEqual(command2.number, 1)
+        self.assertEqual(command2.address, 1)
+        self.assertIs(device.command_index[1], command2)
+        self.assertIs(device.get_command(1), command2)
+        self.assertEqual(device.command_list, [0, 1])
+        return
+
     def test_send_1(self):
         device = TestDevice()
 
@@ -369,6 +472,434 @@ class TestControl(unittest.TestCase):
         self.assertFalse(check)
         return
 
+    def test_compile_1(self):
+        device = TestDevice()
+        command = Command(name="Messwert lesen", code=0, address=1)
+
+        frame1 = device.compile(command)
+        frame2 = device.compile(command)
+
+        self.assertEqual(frame1, bytes([254, 0, 61]))
+        self.assertIs(frame1, frame2)
+        self.assertIs(command.frame, frame1)
+
+        command.address = 2
+        self.assertIsNone(command.frame)
+
+        frame3 = device.compile(command)
+        self.assertEqual(frame3[0], 253)
+        return
+
+    def test_compile_2(self):
+        device = TestDevice()
+        command = Command(name="Anzeige Einheit lesen", code=15, address=1, length=Length.Byte6, param=[202, 0])
+
+        frame1 = device.compile(command)
+        command.param = [200, 0]
+        frame2 = device.compile(command)
+
+        self.assertIsNotNone(frame1)
+        self.assertIsNotNone(frame2)
+        self.assertNotEqual(frame1, frame2)
+        return
+
+    def test_execute_1(self):
+        device = TestDevice()
+        device.wait_time = 0.0
+
+        test_read = TestRead()
+
+        mock_serial = mock.Mock()
+        mock_serial.write = mock.Mock()
+        mock_serial.read = test_read.test_read_1
+        mock_serial.in_waiting = 9
+
+        device.serial = mock_serial
+
+        command = Command(name="Messwert lesen", code=0, address=1)
+
+        message = device.execute(command)
+
+        args, _ = mock_serial.write.call_args
+
+        self.assertIsNotNone(message)
+        self.assertIs(message.length, Length.Byte9)
+        self.assertEqual(args[0], bytes([254, 0, 61]))
+        self.assertIs(args[0], command.frame)
+        return
+
+    def test_execute_2(self):
+        device = TestDevice()
+        device.wait_time = 0.0
+
+        test_read = TestRead()
+
+        mock_serial = mock.Mock()
+        mock_serial.write = mock.Mock()
+        mock_serial.read = test_read.test_read_1
+        mock_serial.in_waiting = 9
+
+        device.serial = mock_serial
+
+        command = Command(name="Messwert lesen", code=0, address=1)
+
+        message = device.execute(command, True)
+
+        self.assertIsInstance(message, easyb.message.LazyMessage)
+        self.assertTrue(message.valid)
+        self.assertIs(message.length, Length.Byte9)
+        self.assertEqual(message.value[1], -0.04)
+        return
+
+    def test_wait_response_1(self):
+        device = TestDevice()
+        device.wait_time = 0.0
+        device.timeout = 0.05
+
+        mock_serial = mock.Mock()
+        mock_serial.in_waiting = 0
+
+        device.serial = mock_serial
+
+        start = time.monotonic()
+        check = device.wait_response(start)
+        delta = time.monotonic() - start
+
+        self.assertFalse(check)
+        self.assertGreaterEqual(delta, 0.05)
+        return
+
+    def test_wait_response_2(self):
+        device = TestDevice()
+        device.wait_time = 0.02
+        device.timeout = 2
+
+        mock_serial = mock.Mock()
+        mock_serial.in_waiting = 3
+
+        device.serial = mock_serial
+
+        start = time.monotonic()
+        check = device.wait_response(start)
+        delta = time.monotonic() - start
+
+        self.assertTrue(check)
+        self.assertGreaterEqual(delta, 0.02)
+        self.assertLess(delta, 1.0)
+        return
+
+    def test_execute_3(self):
+        device = TestDevice()
+        device.wait_time = 0.0
+        device.timeout = 0.01
+
+        mock_serial = mock.Mock()
+        mock_serial.write = mock.Mock()
+        mock_serial.read = mock.Mock()
+        mock_serial.in_waiting = 0
+
+        device.serial = mock_serial
+
+        command = Command(name="Messwert lesen", code=0, address=1)
+
+        message = device.execute(command)
+
+        self.assertIsNone(message)
+        self.assertFalse(mock_serial.read.called)
+        return
+
+    def test_read_bulk_1(self):
+        data1 = bytes([0x72, 0xff, 0x84, 0x00, 0xfc, 0x05])
+        data2 = bytes([0x00, 0xfc, 0x05])
+
+        device = TestDevice()
+        device.serial = TestSerial(data1 + data2, 6)
+
+        result = device.read_bulk()
+
+        self.assertEqual(result, data1 + data2)
+        self.assertEqual(device.serial.reads, 2)
+        return
+
+    def test_read_bulk_2(self):
+        device = TestDevice()
+        device.timeout = 0.02
+        device.serial = TestSerial(bytes())
+
+        start = time.monotonic()
+        result = device.read_bulk()
+        delta = time.monotonic() - start
+
+        self.assertEqual(len(result), 0)
+        self.assertGreaterEqual(delta, 0.02)
+        return
+
+    def test_read_bulk_3(self):
+        device = TestDevice(read_limit=64)
+        device.serial = mock.Mock()
+        device.serial.in_waiting = 16
+        device.serial.read = lambda count: bytes(count)
+
+        result = device.read_bulk()
+
+        self.assertEqual(len(result), 64)
+        return
+
+    def test_read_bulk_4(self):
+        device = TestDevice(timeout=0.02, read_limit=1000000)
+        device.serial = mock.Mock()
+        device.serial.in_waiting = 1
+        device.serial.read = lambda count: bytes(count)
+
+        start = time.monotonic()
+        result = device.read_bulk()
+        delta = time.monotonic() - start
+
+        self.assertGreater(len(result), 0)
+        self.assertLess(len(result), 1000000)
+        self.assertGreaterEqual(delta, 0.04)
+        self.assertLess(delta, 0.5)
+        return
+
+    def test_read_gap_1(self):
+        device1 = TestDevice(baudrate=4800)
+        device2 = TestDevice(baudrate=4800, read_gap=0.05)
+
+        self.assertAlmostEqual(device1.get_read_gap(), 40.0 / 4800.0)
+        self.assertEqual(device2.get_read_gap(), 0.05)
+        return
+
+    def test_execute_4(self):
+        data = bytes([0xfe, 0x0d, 0x1e, 0x72, 0xff, 0x84, 0x00, 0xfc, 0x05])
+
+        device = TestDevice()
+        device.wait_time = 0.0
+        device.serial = TestSerial(data + data)
+
+        command = Command(name="Messwert lesen", code=0, address=1)
+
+        message1 = device.execute(command)
+        self.assertIsNotNone(message1)
+        self.assertEqual(command.response_size, 9)
+        self.assertEqual(device.serial.reads, 2)
+
+        message2 = device.execute(command)
+        self.assertIsNotNone(message2)
+        self.assertEqual(message2.stream.data, bytearray(data))
+        self.assertIs(message2.stream.length, Length.Byte9)
+        self.assertEqual(device.serial.reads, 3)
+        return
+
+    def test_execute_5(self):
+        data1 = bytes([0xfe, 0x0b, 0x0c, 0x72, 0xff, 0x84])
+        data2 = bytes([0x00, 0xfc, 0x05])
+
+        device = TestDevice()
+        device.wait_time = 0.0
+        device.serial = TestSerial(data1 + data2)
+
+        command = Command(name="Messwert lesen", code=0, address=1)
+        command.response_size = 9
+
+        message = device.execute(command)
+
+        self.assertIsNotNone(message)
+        self.assertIs(message.length, Length.Byte6)
+        self.assertEqual(message.stream.data, bytearray(data1))
+        self.assertEqual(command.response_size, 6)
+        return
+
+    def test_execute_6(self):
+        data = bytes([0xfe, 0x0d, 0x1e, 0x72, 0xff, 0x84, 0x00, 0xfc, 0x05])
+
+        device = TestDevice(timeout=0.5, adaptive=True, timeout_floor=0.01)
+        device.wait_time = 0.0
+        device.serial = TestSerial(data)
+
+        command = Command(name="Messwert lesen", code=0, address=1)
+
+        self.assertEqual(device.get_timeout(1), 0.5)
+
+        message = device.execute(command)
+
+        self.assertIsNotNone(message)
+        self.assertLess(device.get_timeout(1), 0.5)
+        self.assertGreaterEqual(device.get_timeout(1), 0.01)
+        return
+
+    def test_execute_7(self):
+        noise = bytes([0x00, 0x13, 0xfe, 0x0d])
+        data = bytes([0xfe, 0x0d, 0x1e, 0x72, 0xff, 0x84, 0x00, 0xfc, 0x05])
+
+        device = TestDevice()
+        device.wait_time = 0.0
+        device.serial = TestSerial(noise + data)
+
+        command = Command(name="Messwert lesen", code=0, address=1)
+
+        message = device.execute(command)
+
+        self.assertIsNotNone(message)
+        self.assertIs(message.length, Length.Byte9)
+        self.assertEqual(message.stream.data, bytearray(data))
+        self.assertEqual(command.response_size, 9)
+        self.assertEqual(device.parser.dropped, len(noise))
+        self.assertEqual(len(device.serial.buffer), 0)
+        return
+
+    def test_execute_8(self):
+        data = bytes([0xfe, 0x51, 0x8d])
+
+        device = TestDevice()
+        device.wait_time = 0.0
+        device.serial = TestSerial(data)
+        device.serial.read = mock.Mock(wraps=device.serial.read)
+
+        command = Command(name="Messwert lesen", code=0, address=1)
+        command.response_size = 9
+
+        message = device.execute(command)
+
+        self.assertIsNone(message)
+        self.assertEqual(command.response_size, 0)
+        self.assertEqual(len(device.serial.buffer), 0)
+
+        # never ask for more bytes than the short reply has, a real port would block until the timeout
+        for (args, _) in device.serial.read.call_args_list:
+            self.assertLessEqual(args[0], 3)
+        return
+
+    def test_execute_9(self):
+        data = bytes([0xfe, 0x0d, 0x1e, 0x72, 0xff, 0x84, 0x00, 0xfc, 0x05])
+
+        device = TestDevice(timeout=0.5, adaptive=True, timeout_floor=0.01)
+        device.wait_time = 0.0
+        device.serial = TestDelaySerial(data, 0.01)
+
+        command = Command(name="Messwert lesen", code=0, address=1)
+
+        for n in range(5):
+            self.assertIsNotNone(device.execute(command))
+        self.assertLess(device.get_timeout(1), 0.15)
+
+        # the device slows down, the first request is missed and the timeout falls back to the ceiling
+        device.serial.delay = 0.15
+
+        self.assertIsNone(device.execute(command))
+        self.assertEqual(device.get_timeout(1), 0.5)
+
+        self.assertIsNotNone(device.execute(command))
+        self.assertGreaterEqual(device.get_timeout(1), 0.3)
+        self.assertIsNotNone(device.execute(command))
+        return
+
+    def test_execute_11(self):
+        device = TestDevice(timeout=0.1, adaptive=True, timeout_floor=0.01)
+        device.wait_time = 0.0
+        device.serial = TestDelaySerial(bytes(), 0.0)
+
+        command = Command(name="Messwert lesen", code=0, address=1)
+
+        # a dead device is probed with the full timeout only 6 times in 20 requests
+        start = time.monotonic()
+        for n in range(20):
+            self.assertIsNone(device.execute(command))
+        delta = time.monotonic() - start
+
+        self.assertEqual(device.adaptive.get_misses(1), 20)
+        self.assertGreaterEqual(delta, 6 * 0.1 + 14 * 0.01)
+        self.assertLess(delta, 1.2)
+        return
+
+    def test_execute_10(self):
+        data = bytes([0xfe, 0x0d, 0x1e, 0x72, 0xff, 0x84, 0x00, 0xfc, 0x05])
+
+        device = TestDevice(timeout=0.5, read_gap=0.05)
+        device.wait_time = 0.0
+        device.serial = TestChunkSerial(data, 3, 0.01)
+
+        command = Command(name="Messwert lesen", code=0, address=1)
+
+        message1 = device.execute(command)
+        reads = device.serial.reads
+
+        message2 = device.execute(command)
+
+        self.assertIsNotNone(message1)
+        self.assertIsNotNone(message2)
+        self.assertEqual(reads, 2)
+        self.assertEqual(device.serial.reads, 3)
+        self.assertEqual(message2.stream.data, bytearray(data))
+        return
+
+    def test_receive_lazy_1(self):
+        noise = bytes([0xfe, 0x51, 0x00])
+        data = bytes([0xfe, 0x0d, 0x1e, 0x72, 0xff, 0x84, 0x00, 0xfc, 0x05])
+
+        device = TestDevice()
+        device.serial = TestSerial(noise + data)
+
+        message = device.receive_lazy()
+
+        self.assertIsInstance(message, easyb.message.LazyMessage)
+        self.assertTrue(message.valid)
+        self.assertEqual(message.code, 0)
+        self.assertEqual(message.data, data)
+        return
+
+    def test_decode_value_1(self):
+        header = bytes([0xfe, 0x0b, 0x0c])
+
+        error = easyb.config.Error()
+        error.load({"code": 16353, "text": "Value under measurement range"})
+
+        device = TestDevice()
+
+        message1 = device.create_message(header + bytes([0xf7, 0xfc, 0x7a]))
+        message2 = device.create_message(header + bytes([0xc0, 0xe1, 0xbb]))
+
+        self.assertIs(message1.length, Length.Byte6)
+        self.assertEqual(device.decode_value(message1), (None, 252.0))
+
+        with mock.patch.object(easyb.conf, "error", [error]):
+            self.assertEqual(device.decode_value(message2), (error, 0.0))
+            self.assertEqual(easyb.message.LazyMessage(message2.stream.bytes).value, (error, 0.0))
+        return
+
+    def test_decode_value_2(self):
+        error = easyb.config.Error()
+        error.load({"code": 16352, "text": "Value over measurement range"})
+
+        device = TestDevice()
+        message = device.create_message(bytes([0xfe, 0x0b, 0x0c, 0xc0, 0xe0, 0xbc]))
+
+        with mock.patch.object(easyb.conf, "error", [error]):
+            self.assertEqual(device.decode_value(message), (error, 0.0))
+        return
+
+    def test_run_loop_1(self):
+        device = TestDevice()
+        device.interval = 0.02
+
+        def run():
+            time.sleep(0.01)
+            if device.interval_counter == 4:
+                device.abort = True
+            return True
+
+        device.run = run
+
+        start = time.monotonic()
+        device.run_loop()
+        duration = time.monotonic() - start
+
+        self.assertTrue(device.status)
+        self.assertFalse(device.active)
+        self.assertEqual(device.interval_counter, 5)
+        self.assertEqual(device.ticker.ticks, 6)
+        self.assertLess(duration, 0.02 * 5 + 0.05)
+        return
+
     # def test_send_2(self):
     #     device = TestDevice()
     #
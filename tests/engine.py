@@ -0,0 +1,171 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import unittest
+import threading
+import time
+
+from easyb.data.base import Sample
+from easyb.engine import Engine, Sink
+from tests.bus import TestBusSerial
+
+
+class TestSlowSerial(TestBusSerial):
+    """Bus serial which answers after a delay and checks that requests do not overlap."""
+
+    def __init__(self, delay: float, silent: list = None):
+        TestBusSerial.__init__(self, silent)
+        self.delay = delay
+        self.ready = 0.0
+        self.overlap = False
+        return
+
+    @property
+    def in_waiting(self) -> int:
+        if time.monotonic() < self.ready:
+            return 0
+        return len(self.buffer)
+
+    def write(self, frame: bytes) -> int:
+        # the response of the last request is not read yet
+        if len(self.buffer) > 0:
+            self.overlap = True
+
+        self.ready = time.monotonic() + self.delay
+        return TestBusSerial.write(self, frame)
+
+
+def set_serial(engine: Engine, port: str, serial):
+    bus = engine.buses[port]
+    bus.serial = serial
+
+    for device in bus.devices.values():
+        device.serial = serial
+    return
+
+
+# noinspection DuplicatedCode
+class TestEngine(unittest.TestCase):
+    """Testing class for thread pool engine module."""
+
+    def setUp(self):
+        """set up test.
+        """
+        return
+
+    def tearDown(self):
+        """tear down test.
+        """
+        return
+
+    def test_sink_1(self):
+        sink = Sink()
+
+        def fill(port: str):
+            for n in range(1000):
+                sink.add(port, Sample(1, n, None, 0.0))
+            return
+
+        threads = [threading.Thread(target=fill, args=("PORT{0:d}".format(n),)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sink.len, 4000)
+        self.assertEqual(len(sink.get("PORT1")), 1000)
+
+        samples = sink.take()
+        self.assertEqual(len(samples), 4)
+        self.assertEqual(sink.len, 0)
+        return
+
+    def test_constructor_1(self):
+        specs = [
+            ("PORT1", 1, "GMH 3710"),
+            ("PORT1", 2, "GMH 3710"),
+            ("PORT2", 1, "GMH 3710")
+        ]
+
+        engine = Engine(specs, workers=2, timeout=0.1, interval=0.0)
+
+        bus1 = engine.buses["PORT1"]
+        bus2 = engine.buses["PORT2"]
+
+        self.assertEqual(len(engine.buses), 2)
+        self.assertEqual(bus1.addresses, [1, 2])
+        self.assertEqual(bus2.addresses, [1])
+        self.assertIs(bus1.devices[1].lock, bus1.devices[2].lock)
+        self.assertIsNot(bus1.devices[1].lock, bus2.devices[1].lock)
+        self.assertRaises(ValueError, Engine, specs, 0)
+        return
+
+    def test_run_1(self):
+        specs = []
+        for n in range(4):
+            for address in range(1, 4):
+                specs.append(("PORT{0:d}".format(n), address, "GMH 3710"))
+
+        engine = Engine(specs, workers=4, timeout=0.5, interval=0.0)
+
+        serials = []
+        for port in engine.buses.keys():
+            serial = TestSlowSerial(0.02)
+            serials.append(serial)
+            set_serial(engine, port, serial)
+
+        start = time.monotonic()
+        check = engine.run(2)
+        duration = time.monotonic() - start
+
+        self.assertTrue(check)
+        self.assertEqual(engine.sink.len, 24)
+        self.assertEqual(len(engine.sink.get("PORT2")), 6)
+        self.assertLess(duration, 4 * 6 * 0.02)
+        for serial in serials:
+            self.assertFalse(serial.overlap)
+        for throughput in engine.throughput.values():
+            self.assertEqual(throughput.cycles, 2)
+            self.assertEqual(throughput.samples, 6)
+            self.assertGreater(throughput.rate, 0.0)
+
+        # the samples are the values stored by run() of the devices
+        device = engine.buses["PORT2"].devices[3]
+        samples = [x for x in engine.sink.get("PORT2") if x.address == 3]
+        self.assertEqual([x.value for x in samples], [x.value for x in device.data.rows])
+        self.assertEqual([x.number for x in samples], [0, 1])
+        return
+
+    def test_run_2(self):
+        specs = [
+            ("PORT1", 1, "GMH 3710"),
+            ("PORT1", 2, "GMH 3710")
+        ]
+
+        engine = Engine(specs, workers=2, timeout=0.05, interval=0.0)
+        set_serial(engine, "PORT1", TestBusSerial(silent=[2]))
+
+        check = engine.run(1)
+        throughput = engine.throughput["PORT1"]
+
+        self.assertFalse(check)
+        self.assertEqual(engine.sink.len, 1)
+        self.assertEqual(throughput.samples, 1)
+        self.assertEqual(throughput.errors, 1)
+        self.assertFalse(engine.buses["PORT1"].devices[2].status)
+        return
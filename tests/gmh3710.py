@@ -105,7 +105,7 @@ class TestGMH3710(unittest.TestCase):
         self.assertEqual(device.address, 0)
         self.assertEqual(device.write_timeout, 2)
         self.assertEqual(device.timeout, 6)
-        self.assertEqual(device.wait_time, 0.1)
+        self.assertEqual(device.wait_time, 0.0)
         self.assertIsNone(device.serial)
         return
 
@@ -136,6 +136,47 @@ class TestGMH3710(unittest.TestCase):
         self.assertEqual(device.address, 0)
         self.assertEqual(device.write_timeout, 2)
         self.assertEqual(device.timeout, 6)
-        self.assertEqual(device.wait_time, 0.1)
+        self.assertEqual(device.wait_time, 0.0)
         self.assertIsNone(device.serial)
         return
+
+    def test_constructor_3(self):
+        """Test constructor.
+        """
+        device1 = GMH3710()
+        device2 = GMH3710(cache_size=16)
+
+        self.assertIsNone(device1.decode_cache)
+        self.assertIsNotNone(device2.decode_cache)
+        self.assertEqual(device2.decode_cache.size, 16)
+
+        error1, value1 = device1.decode_u32(0x72, 0xff, 0x00, 0xfc)
+        error2, value2 = device2.decode_u32(0x72, 0xff, 0x00, 0xfc)
+        error3, value3 = device2.decode_u32(0x72, 0xff, 0x00, 0xfc)
+
+        self.assertEqual(value1, value2)
+        self.assertEqual(value2, value3)
+        self.assertEqual(device2.decode_cache.hits, 1)
+        self.assertEqual(device2.decode_cache.misses, 1)
+        return
+
+    def test_constructor_4(self):
+        """Test constructor.
+        """
+        device1 = GMH3710()
+
+        for n in range(1000):
+            GMH3710(address=n & 0xff)
+
+        device2 = GMH3710()
+        device2.set_status(0xffff)
+
+        self.assertEqual(len(device2.commands), len(device1.commands))
+        self.assertEqual(len(device2.command_list), len(device1.command_list))
+        self.assertEqual(len(device2.data.columns), len(device1.data.columns))
+        self.assertEqual(len(device2.device_status), len(easyb.conf.status))
+        self.assertIsNot(device2.commands, device1.commands)
+        self.assertEqual(len(device1.get_status()), 0)
+        self.assertEqual(len(device2.get_status()), len(easyb.conf.status))
+        self.assertIs(device2.get_command(4), device2.commands[4])
+        return
@@ -83,6 +83,21 @@ class TestMessage(unittest.TestCase):
         self.assertIsNone(message.stream)
         return
 
+    def test_command_2(self):
+        param = [2, 0]
+        command = easyb.command.Command(name="Test", address=1, code=1, length=Length.Byte6, param=param)
+
+        param[0] = 3
+
+        self.assertEqual(command.param, (2, 0))
+
+        command.param = param
+        param[0] = 4
+
+        self.assertEqual(command.param, (3, 0))
+        self.assertIsNone(command.frame)
+        return
+
     def test_encode_1(self):
         message = easyb.message.Message(address=1, code=15, priority=Priority.NoPriority,
                                         length=Length.Byte6, direction=Direction.FromMaster,
@@ -190,3 +205,76 @@ class TestMessage(unittest.TestCase):
         check = message.decode(bytes(header))
         self.assertFalse(check)
         return
+
+    def test_header_table_1(self):
+        self.assertEqual(len(easyb.message.header_table), 256)
+        self.assertEqual(len(easyb.message.header_index), 256)
+
+        for byte1 in range(256):
+            code, priority, length, direction = easyb.message.header_table[byte1]
+
+            message = easyb.message.Message(address=1, code=code, priority=priority, length=length,
+                                            direction=direction)
+
+            self.assertEqual(message._encode_header(), byte1)
+        return
+
+    def test_header_table_2(self):
+        code, priority, length, direction = easyb.message.header_table[0xf5]
+
+        self.assertEqual(code, 15)
+        self.assertIs(priority, Priority.NoPriority)
+        self.assertIs(length, Length.Byte9)
+        self.assertIs(direction, Direction.FromSlave)
+        return
+
+    def test_lazy_1(self):
+        data = [0xfe, 0x05, 0x26, 0x72, 0xff, 0x84, 0x00, 0xfc, 0x05]
+
+        message = easyb.message.LazyMessage(bytes(data))
+
+        self.assertIsNone(message._stream)
+        self.assertFalse(message._decoded)
+
+        self.assertTrue(message.valid)
+        self.assertEqual(message.address, 1)
+        self.assertEqual(message.code, 0)
+        self.assertEqual(message.priority, Priority.NoPriority)
+        self.assertEqual(message.length, Length.Byte9)
+        self.assertEqual(message.direction, Direction.FromSlave)
+
+        error, value = message.value
+        self.assertIsNone(error)
+        self.assertEqual(value, -0.04)
+        self.assertIs(message.value, message.value)
+
+        self.assertEqual(message.stream.data, bytearray(data))
+        self.assertEqual(message.stream.len, 9)
+        return
+
+    def test_lazy_2(self):
+        data = [0xfe, 0x05, 0x26, 0x72, 0xff, 0x84, 0x00, 0xfc, 0x06]
+
+        message = easyb.message.LazyMessage(bytes(data))
+
+        self.assertFalse(message.valid)
+        self.assertEqual(message.length, Length.Byte9)
+        return
+
+    def test_lazy_3(self):
+        data = [0xfe, 0x05]
+
+        message = easyb.message.LazyMessage(bytes(data))
+
+        self.assertFalse(message.valid)
+        return
+
+    def test_lazy_4(self):
+        data = [0xfe, 0x05, 0x26, 0x72, 0xff, 0x84]
+
+        message = easyb.message.LazyMessage(bytes(data))
+
+        self.assertFalse(message.valid)
+        self.assertEqual(message.length, Length.Byte9)
+        self.assertEqual(message.value, (None, 0.0))
+        return
@@ -0,0 +1,267 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import unittest
+import os
+import time
+import socket
+
+from easyb.bit import create_crc
+from easyb.devices.gmh3710 import GMH3710
+from easyb.multiplexer import Multiplexer, State
+
+
+class TestPipeSerial(object):
+    """Serial port on a pipe, every request writes the measurement response into the pipe."""
+
+    def __init__(self, silent: bool = False):
+        self.rfd, self.wfd = os.pipe()
+        self.silent = silent
+        self.waiting = 0
+        self.frames = []
+        return
+
+    def fileno(self) -> int:
+        return self.rfd
+
+    @property
+    def in_waiting(self) -> int:
+        return self.waiting
+
+    def write(self, frame: bytes) -> int:
+        self.frames.append(bytes(frame))
+
+        if self.silent is True:
+            return len(frame)
+
+        byte1 = frame[0]
+        byte2 = 0x0d
+        data = bytes([byte1, byte2, create_crc(byte1, byte2), 0x72, 0xff, 0x84, 0x00, 0xfc, 0x05])
+
+        # send the response in two parts
+        os.write(self.wfd, data[0:4])
+        os.write(self.wfd, data[4:])
+        self.waiting += len(data)
+        return len(frame)
+
+    def read(self, count=1) -> bytes:
+        result = os.read(self.rfd, count)
+        self.waiting -= len(result)
+        return result
+
+    def close(self):
+        os.close(self.rfd)
+        os.close(self.wfd)
+        return
+
+
+class TestCountSerial(TestPipeSerial):
+    """Serial port on a pipe, which counts the reads."""
+
+    def __init__(self, silent: bool = False):
+        TestPipeSerial.__init__(self, silent)
+        self.reads = 0
+        return
+
+    def read(self, count=1) -> bytes:
+        self.reads += 1
+        return TestPipeSerial.read(self, count)
+
+
+class TestSlowSerial(object):
+    """Serial port on a socket, a non-blocking write takes only one byte."""
+
+    def __init__(self):
+        self.sock1, self.sock2 = socket.socketpair()
+        self.write_timeout = None
+        self.waiting = 0
+        self.request = bytearray()
+        self.writes = 0
+        return
+
+    def fileno(self) -> int:
+        return self.sock1.fileno()
+
+    @property
+    def in_waiting(self) -> int:
+        return self.waiting
+
+    def write(self, frame: bytes) -> int:
+        self.writes += 1
+
+        if self.write_timeout == 0:
+            frame = frame[0:1]
+
+        self.request.extend(frame)
+        if len(self.request) < 3:
+            return len(frame)
+
+        byte1 = self.request[0]
+        byte2 = 0x0d
+        data = bytes([byte1, byte2, create_crc(byte1, byte2), 0x72, 0xff, 0x84, 0x00, 0xfc, 0x05])
+        self.request.clear()
+
+        self.sock2.send(data)
+        self.waiting += len(data)
+        return len(frame)
+
+    def read(self, count=1) -> bytes:
+        result = self.sock1.recv(count)
+        self.waiting -= len(result)
+        return result
+
+    def close(self):
+        self.sock1.close()
+        self.sock2.close()
+        return
+
+
+def create_device(address: int, silent: bool = False) -> GMH3710:
+    device = GMH3710(address=address, timeout=0.05, interval=0.01)
+    device.serial = TestPipeSerial(silent)
+    return device
+
+
+# noinspection DuplicatedCode
+class TestMultiplexer(unittest.TestCase):
+    """Testing class for multiplexer module."""
+
+    def setUp(self):
+        """set up test.
+        """
+        self.devices = []
+        return
+
+    def tearDown(self):
+        """tear down test.
+        """
+        for device in self.devices:
+            device.serial.close()
+        return
+
+    def test_add_1(self):
+        device = create_device(1)
+        self.devices.append(device)
+
+        multiplexer = Multiplexer()
+
+        channel1 = multiplexer.add(device)
+        channel2 = multiplexer.add(device)
+        channel3 = multiplexer.add(device, 99)
+
+        self.assertIsNotNone(channel1)
+        self.assertIsNone(channel2)
+        self.assertIsNone(channel3)
+        self.assertIs(channel1.state, State.Idle)
+        self.assertEqual(len(multiplexer.channels), 1)
+
+        check1 = multiplexer.remove(device)
+        check2 = multiplexer.remove(device)
+
+        self.assertTrue(check1)
+        self.assertFalse(check2)
+        self.assertEqual(len(multiplexer.channels), 0)
+        multiplexer.close()
+        return
+
+    def test_poll_1(self):
+        multiplexer = Multiplexer()
+
+        for n in range(50):
+            device = create_device(n + 1)
+            self.devices.append(device)
+            multiplexer.add(device)
+
+        counter = 0
+        end = time.monotonic() + 2.0
+        while (counter < 100) and (time.monotonic() < end):
+            counter += multiplexer.poll(0.1)
+
+        multiplexer.close()
+
+        self.assertGreaterEqual(counter, 100)
+        for device in self.devices:
+            self.assertGreaterEqual(device.data.len, 1)
+            self.assertTrue(device.status)
+            self.assertEqual(device.get_command(0).response_size, 9)
+        return
+
+    def test_poll_2(self):
+        device1 = create_device(1)
+        device2 = create_device(2, True)
+        self.devices.append(device1)
+        self.devices.append(device2)
+
+        multiplexer = Multiplexer()
+        channel1 = multiplexer.add(device1)
+        channel2 = multiplexer.add(device2)
+
+        end = time.monotonic() + 1.0
+        while (channel2.timeouts == 0) and (time.monotonic() < end):
+            multiplexer.poll(0.1)
+
+        multiplexer.close()
+
+        self.assertEqual(channel2.timeouts, 1)
+        self.assertEqual(channel2.responses, 0)
+        self.assertFalse(device2.status)
+        self.assertGreaterEqual(channel1.responses, 1)
+        self.assertEqual(channel1.timeouts, 0)
+        self.assertEqual(device2.data.len, 0)
+        return
+
+    def test_poll_3(self):
+        device = create_device(1, True)
+        device.serial.close()
+        device.serial = TestCountSerial(True)
+        self.devices.append(device)
+
+        multiplexer = Multiplexer()
+        channel = multiplexer.add(device)
+
+        # readable without waiting data
+        os.write(device.serial.wfd, bytes([0]))
+        multiplexer.poll(0.01)
+
+        multiplexer.close()
+
+        self.assertEqual(channel.requests, 1)
+        self.assertEqual(device.serial.reads, 0)
+        return
+
+    def test_poll_4(self):
+        device = create_device(1)
+        device.serial.close()
+        device.serial = TestSlowSerial()
+        self.devices.append(device)
+
+        multiplexer = Multiplexer()
+        channel = multiplexer.add(device)
+
+        end = time.monotonic() + 1.0
+        while (channel.responses == 0) and (time.monotonic() < end):
+            multiplexer.poll(0.1)
+
+        self.assertEqual(device.serial.write_timeout, 0)
+        multiplexer.close()
+
+        self.assertEqual(channel.responses, 1)
+        self.assertEqual(channel.timeouts, 0)
+        self.assertEqual(device.serial.writes, 3)
+        self.assertIsNone(device.serial.write_timeout)
+        return
@@ -0,0 +1,127 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import unittest
+
+import easyb.message.parser
+
+from easyb.definitions import Length
+
+
+# noinspection DuplicatedCode
+class TestParser(unittest.TestCase):
+    """Testing class for message parser module."""
+
+    def setUp(self):
+        """set up test.
+        """
+        return
+
+    def tearDown(self):
+        """tear down test.
+        """
+        return
+
+    def test_feed_1(self):
+        data = [0xfe, 0x05, 0x26, 0x71, 0x00, 0x48, 0xe3, 0x54, 0x28]
+
+        parser = easyb.message.parser.Parser()
+
+        messages = parser.feed(bytes(data))
+
+        self.assertEqual(len(messages), 1)
+        self.assertEqual(messages[0].address, 1)
+        self.assertIs(messages[0].length, Length.Byte9)
+        self.assertEqual(messages[0].stream.data, bytearray(data))
+        self.assertEqual(parser.dropped, 0)
+        self.assertEqual(parser.messages, 1)
+        return
+
+    def test_feed_2(self):
+        data = [0xfe, 0x05, 0x26, 0x71, 0x00, 0x48, 0xe3, 0x54, 0x28]
+
+        parser = easyb.message.parser.Parser()
+
+        messages1 = parser.feed(bytes(data[0:2]))
+        messages2 = parser.feed(bytes(data[2:5]))
+        messages3 = parser.feed(bytes(data[5:]))
+
+        self.assertEqual(len(messages1), 0)
+        self.assertEqual(len(messages2), 0)
+        self.assertEqual(len(messages3), 1)
+        self.assertEqual(messages3[0].stream.data, bytearray(data))
+        self.assertEqual(len(parser.buffer), 0)
+        return
+
+    def test_feed_3(self):
+        data = [0xfe, 0x05, 0x26, 0x71, 0x00, 0x48, 0xe3, 0x54, 0x28]
+        noise = [0x13, 0xfe, 0x05]
+
+        parser = easyb.message.parser.Parser()
+
+        messages = parser.feed(bytes(noise + data + data))
+
+        self.assertEqual(len(messages), 2)
+        self.assertEqual(messages[0].stream.data, bytearray(data))
+        self.assertEqual(messages[1].stream.data, bytearray(data))
+        self.assertEqual(parser.dropped, 3)
+        return
+
+    def test_feed_4(self):
+        data1 = [0xfe, 0x05, 0x26, 0x71, 0x00, 0x48, 0xe3, 0x54, 0x29]
+        data2 = [0xfe, 0x05, 0x26, 0x71, 0x00, 0x48, 0xe3, 0x54, 0x28]
+
+        parser = easyb.message.parser.Parser()
+
+        messages = parser.feed(bytes(data1 + data2))
+
+        # the first body triplet of the broken message is a valid Byte3 message on its own
+        self.assertEqual(len(messages), 2)
+        self.assertEqual(messages[0].stream.data, bytearray(data1[3:6]))
+        self.assertEqual(messages[1].stream.data, bytearray(data2))
+        self.assertEqual(parser.dropped, 6)
+        return
+
+    def test_flush_1(self):
+        header = [0xfe, 0x07, 0x28]
+        data = [0x71, 0x00, 0x48, 0xe3, 0x54, 0x28]
+
+        parser = easyb.message.parser.Parser()
+
+        messages1 = parser.feed(bytes(header + data))
+        messages2 = parser.flush()
+
+        self.assertEqual(len(messages1), 0)
+        self.assertEqual(len(messages2), 1)
+        self.assertIs(messages2[0].length, Length.Variable)
+        self.assertEqual(messages2[0].stream.data, bytearray(header + data))
+        self.assertEqual(len(parser.buffer), 0)
+        return
+
+    def test_flush_2(self):
+        data = [0xfe, 0x05, 0x26, 0x71, 0x00]
+
+        parser = easyb.message.parser.Parser()
+
+        messages1 = parser.feed(bytes(data))
+        messages2 = parser.flush()
+
+        self.assertEqual(len(messages1), 0)
+        self.assertEqual(len(messages2), 0)
+        self.assertEqual(parser.dropped, 5)
+        return
@@ -0,0 +1,140 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import unittest
+
+from datetime import datetime
+
+from easyb.data.base import Sample
+from easyb.bit import ErrorCodes
+from easyb.config import Error
+from easyb.engine import Engine
+from easyb.process import ProcessEngine, RingBuffer, sample_type
+from tests.bus import TestBusSerial
+from tests.engine import set_serial
+
+
+def start_test(engine: Engine) -> bool:
+    # the fake line only answers with measurements, so only the start time of prepare() is set
+    for port in engine.buses.keys():
+        set_serial(engine, port, TestBusSerial())
+
+        for device in engine.buses[port].devices.values():
+            device.start_measure = datetime.now()
+    return True
+
+
+# noinspection DuplicatedCode
+class TestProcess(unittest.TestCase):
+    """Testing class for multi-process engine module."""
+
+    def setUp(self):
+        """set up test.
+        """
+        return
+
+    def tearDown(self):
+        """tear down test.
+        """
+        return
+
+    def test_ring_1(self):
+        ring = RingBuffer(4)
+
+        error = Error()
+        error.code = 5
+
+        check1 = ring.write(1, Sample(3, 0, None, 21.5))
+        check2 = ring.write(2, Sample(4, 1, error, 0.0))
+
+        samples = ring.read()
+
+        self.assertTrue(check1)
+        self.assertTrue(check2)
+        self.assertEqual(samples.dtype, sample_type)
+        self.assertEqual(list(samples["port"]), [1, 2])
+        self.assertEqual(list(samples["address"]), [3, 4])
+        self.assertEqual(list(samples["value"]), [21.5, 0.0])
+        self.assertEqual(list(samples["error"]), [-1, 5])
+        self.assertEqual(ring.len, 0)
+        ring.close()
+        return
+
+    def test_ring_2(self):
+        ring = RingBuffer(4)
+
+        for n in range(3):
+            ring.write(0, Sample(1, n, None, float(n)))
+        samples1 = ring.read()
+
+        for n in range(6):
+            ring.write(0, Sample(1, n, None, float(n + 10)))
+        samples2 = ring.read()
+
+        # same memory as seen by a worker process
+        other = RingBuffer(4, ring.memory)
+        other.write(0, Sample(2, 0, None, 1.0))
+        samples3 = ring.read()
+
+        self.assertEqual(list(samples1["value"]), [0.0, 1.0, 2.0])
+        self.assertEqual(list(samples2["value"]), [10.0, 11.0, 12.0, 13.0])
+        self.assertEqual(ring.dropped, 2)
+        self.assertEqual(list(samples3["address"]), [2])
+        self.assertRaises(ValueError, RingBuffer, 0)
+        ring.close()
+        return
+
+    def test_shards_1(self):
+        specs = [
+            ("PORT1", 1, "GMH 3710"),
+            ("PORT2", 1, "GMH 3710"),
+            ("PORT1", 2, "GMH 3710"),
+            ("PORT3", 1, "GMH 3710")
+        ]
+
+        engine = ProcessEngine(specs, processes=2)
+
+        self.assertEqual(engine.ports, ["PORT1", "PORT2", "PORT3"])
+        self.assertEqual(len(engine.shards), 2)
+        self.assertEqual([x[0] for x in engine.shards[0]], ["PORT1", "PORT1", "PORT3"])
+        self.assertEqual([x[0] for x in engine.shards[1]], ["PORT2"])
+        return
+
+    def test_run_1(self):
+        specs = []
+        for n in range(4):
+            for address in range(1, 3):
+                specs.append(("PORT{0:d}".format(n), address, "GMH 3710"))
+
+        engine = ProcessEngine(specs, processes=2, start=start_test, timeout=0.5, interval=0.0)
+        engine.start(3)
+        engine.join(20.0)
+
+        alive = engine.alive
+        exitcodes = engine.exitcodes
+        samples = engine.stop()
+        errors = ErrorCodes(samples["error"])
+
+        self.assertFalse(alive)
+        self.assertEqual(exitcodes, [0, 0])
+        self.assertEqual(len(samples), 24)
+        self.assertEqual(sorted(set(samples["port"])), [0, 1, 2, 3])
+        self.assertEqual(sorted(set(samples["address"])), [1, 2])
+        self.assertIsNone(errors[0])
+        self.assertEqual(engine.dropped, 0)
+        return
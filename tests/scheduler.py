@@ -0,0 +1,342 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import unittest
+import threading
+import time
+
+from easyb.command import Command
+from easyb.definitions import Priority
+from easyb.devices.gmh3710 import GMH3710
+from easyb.scheduler import Ticker, CommandScheduler
+from tests.bus import TestBusSerial
+
+
+class TestClock(object):
+    """Monotonic clock which only moves with sleep() and work()."""
+
+    def __init__(self):
+        self.time = 100.0
+        self.delay = 0.0
+        return
+
+    def now(self) -> float:
+        return self.time
+
+    def sleep(self, value: float):
+        # waking up is late by the delay
+        self.time += value + self.delay
+        return
+
+    def work(self, value: float):
+        self.time += value
+        return
+
+
+class TestScheduleDevice(object):
+    """Device which only records the commands, every command takes the given time."""
+
+    name = "TEST-DEVICE"
+
+    def __init__(self, clock: TestClock, duration: float):
+        self.clock = clock
+        self.duration = duration
+        self.calls = []
+        self.late = []
+        self.commands = []
+        self.status = False
+        self.interval_counter = 0
+        return
+
+    def add(self, number: int, period: float, priority: Priority = Priority.NoPriority) -> Command:
+        command = Command(name="Command {0:d}".format(number), number=number, period=period, priority=priority,
+                          sample=number == 0)
+        self.commands.append(command)
+        return command
+
+    def get_schedule(self):
+        return self.commands
+
+    def run_command(self, number: int) -> bool:
+        self.calls.append((self.clock.time, number))
+        self.clock.work(self.duration)
+        return number != 99
+
+    def run(self) -> bool:
+        check = self.run_command(0)
+        return check
+
+
+# noinspection DuplicatedCode
+class TestScheduler(unittest.TestCase):
+    """Testing class for scheduler module."""
+
+    def setUp(self):
+        """set up test.
+        """
+        return
+
+    def tearDown(self):
+        """tear down test.
+        """
+        return
+
+    def test_ticker_1(self):
+        clock = TestClock()
+        ticker = Ticker(2.0, clock=clock.now, sleep=clock.sleep)
+
+        for n in range(1800):
+            clock.work(0.3)
+            missed = ticker.wait()
+            self.assertEqual(missed, 0)
+
+        # no drift by the time of the measurement
+        self.assertEqual(clock.time, 100.0 + 1800 * 2.0)
+        self.assertEqual(ticker.ticks, 1801)
+        self.assertEqual(ticker.missed, 0)
+        self.assertAlmostEqual(ticker.rate, 0.5)
+        self.assertEqual(ticker.jitter_max, 0.0)
+        return
+
+    def test_ticker_2(self):
+        clock = TestClock()
+        clock.delay = 0.01
+        ticker = Ticker(1.0, clock=clock.now, sleep=clock.sleep)
+
+        for n in range(10):
+            clock.work(0.5)
+            ticker.wait()
+
+        self.assertAlmostEqual(ticker.jitter_mean, 0.01)
+        self.assertAlmostEqual(ticker.jitter_max, 0.01)
+        self.assertAlmostEqual(ticker.jitter_std, 0.0)
+        self.assertAlmostEqual(ticker.deadline, 110.0)
+        return
+
+    def test_ticker_3(self):
+        clock = TestClock()
+        ticker = Ticker(1.0, clock=clock.now, sleep=clock.sleep)
+
+        clock.work(3.5)
+        missed1 = ticker.wait()
+        deadline1 = ticker.deadline
+
+        clock.work(0.2)
+        missed2 = ticker.wait()
+
+        self.assertEqual(missed1, 2)
+        self.assertEqual(deadline1, 103.0)
+        self.assertEqual(missed2, 0)
+        self.assertEqual(clock.time, 104.0)
+        self.assertEqual(ticker.missed, 2)
+        return
+
+    def test_ticker_4(self):
+        clock = TestClock()
+        ticker = Ticker(1.0, skip=False, clock=clock.now, sleep=clock.sleep)
+
+        clock.work(3.5)
+        missed1 = ticker.wait()
+        missed2 = ticker.wait()
+        missed3 = ticker.wait()
+        missed4 = ticker.wait()
+
+        # the late ticks are run, none is dropped
+        self.assertEqual(missed1, 0)
+        self.assertEqual(missed2, 0)
+        self.assertEqual(missed3, 0)
+        self.assertEqual(missed4, 0)
+        self.assertEqual(ticker.missed, 0)
+        self.assertEqual(ticker.ticks, 5)
+        self.assertEqual(ticker.deadline, 104.0)
+        self.assertEqual(clock.time, 104.0)
+        self.assertRaises(ValueError, Ticker, -1.0)
+        return
+
+    def test_ticker_5(self):
+        clock1 = TestClock()
+        clock2 = TestClock()
+        ticker1 = Ticker(1.0, clock=clock1.now, sleep=clock1.sleep)
+        ticker2 = Ticker(1.0, skip=False, clock=clock2.now, sleep=clock2.sleep)
+
+        missed1 = []
+        missed2 = []
+        for n in range(4):
+            clock1.work(3.5)
+            clock2.work(3.5)
+            missed1.append(ticker1.wait())
+            missed2.append(ticker2.wait())
+
+        # a cycle of 3.5 ticks drops 2 or 3 ticks, the late ticks run one after another
+        self.assertEqual(missed1, [2, 3, 2, 3])
+        self.assertEqual(ticker1.missed, 10)
+        self.assertEqual(ticker1.ticks + ticker1.missed, 15)
+        self.assertEqual(missed2, [0, 0, 0, 0])
+        self.assertEqual(ticker2.missed, 0)
+        self.assertEqual(ticker2.deadline, 104.0)
+        self.assertAlmostEqual(ticker2.jitter_max, 10.0)
+        return
+
+    def test_schedule_1(self):
+        clock = TestClock()
+        device = TestScheduleDevice(clock, 0.05)
+        device.add(0, 0.2, Priority.Priority)
+        device.add(1, 30.0)
+        device.add(2, 600.0)
+        device.add(3, 600.0)
+
+        scheduler = CommandScheduler(clock=clock.now, sleep=clock.sleep)
+        counter = scheduler.add_device(device)
+
+        while clock.time < 159.0:
+            scheduler.step()
+
+        fast = [x[0] for x in device.calls if x[1] == 0]
+        status = [x for x in device.calls if x[1] == 1]
+        ranges = [x for x in device.calls if x[1] in [2, 3]]
+
+        self.assertEqual(counter, 4)
+        self.assertGreaterEqual(len(fast), 295)
+        self.assertEqual(len(status), 2)
+        self.assertEqual(len(ranges), 2)
+        self.assertEqual(device.calls[0][1], 0)
+
+        # the fast command is delayed at most by one other command
+        for (n, value) in enumerate(fast):
+            self.assertLessEqual(value - (100.0 + n * 0.2), 0.05 + 1e-9)
+        self.assertEqual(scheduler.jobs[0].missed, 0)
+        return
+
+    def test_schedule_2(self):
+        clock = TestClock()
+        device = TestScheduleDevice(clock, 0.3)
+        device.add(0, 1.0, Priority.Priority)
+        device.add(99, 10.0)
+
+        scheduler = CommandScheduler(clock=clock.now, sleep=clock.sleep)
+        scheduler.add_device(device)
+
+        check1 = scheduler.step()
+        check2 = scheduler.step()
+        check3 = scheduler.step()
+
+        # the next run takes longer than two periods
+        device.duration = 3.5
+        check4 = scheduler.step()
+
+        job1 = scheduler.jobs[0]
+        job2 = scheduler.jobs[1]
+
+        self.assertTrue(check1)
+        self.assertFalse(check2)
+        self.assertTrue(check3)
+        self.assertTrue(check4)
+        self.assertEqual([x[1] for x in device.calls], [0, 99, 0, 0])
+        self.assertEqual(job1.runs, 3)
+        self.assertEqual(device.interval_counter, 3)
+        self.assertEqual(job1.missed, 2)
+        self.assertEqual(job1.deadline, 105.0)
+        self.assertEqual(job2.errors, 1)
+        self.assertEqual(scheduler.get_deadline(), 105.0)
+        self.assertIsNone(scheduler.add(device, Command(name="Test")))
+        return
+
+    def test_schedule_3(self):
+        device = GMH3710(address=1, interval=0.2, timeout=0.1)
+        device.serial = TestBusSerial()
+        device.default_schedule()
+
+        schedule = device.get_schedule()
+
+        self.assertEqual([x.number for x in schedule], [0, 1, 2, 3, 5, 6, 12])
+        self.assertEqual(schedule[0].period, 0.2)
+        self.assertIs(schedule[0].priority, Priority.Priority)
+        self.assertEqual(schedule[1].period, 30.0)
+        self.assertIs(schedule[1].priority, Priority.NoPriority)
+        self.assertFalse(device.set_schedule(99, 1.0))
+        self.assertFalse(device.set_schedule(0, -1.0))
+
+        device.set_schedule(1, 0.0)
+        device.set_schedule(2, 0.0)
+        device.set_schedule(3, 0.0)
+        device.set_schedule(5, 0.0)
+        device.set_schedule(6, 0.0)
+        device.set_schedule(12, 0.0)
+        device.set_schedule(0, 0.01, Priority.Priority)
+
+        scheduler = CommandScheduler()
+        scheduler.add_device(device)
+
+        check1 = scheduler.step()
+        check2 = scheduler.step()
+
+        self.assertTrue(check1)
+        self.assertTrue(check2)
+        self.assertEqual(device.data.len, 2)
+        self.assertEqual(device.data.rows[1].number, 1)
+        self.assertEqual(device.interval_counter, 2)
+        self.assertTrue(device.status)
+
+        # the callback of the measurement command only logs the value
+        check3 = device.run_command(0)
+
+        self.assertTrue(check3)
+        self.assertEqual(device.data.len, 2)
+        self.assertEqual(device.interval_counter, 2)
+        return
+
+    def test_schedule_4(self):
+        clock = TestClock()
+        device = TestScheduleDevice(clock, 0.2)
+        device.add(0, 0.1, Priority.Priority)
+        device.add(1, 1.0)
+
+        scheduler = CommandScheduler(clock=clock.now, sleep=clock.sleep)
+        scheduler.add_device(device)
+
+        for n in range(30):
+            scheduler.step()
+
+        # the fast command is always due, the slow one still gets a run in every period
+        status = [x[0] for x in device.calls if x[1] == 1]
+
+        self.assertEqual(len(status), 6)
+        for (n, value) in enumerate(status):
+            self.assertLessEqual(value - (100.0 + n * 1.0), 0.2 + 1e-9)
+        self.assertEqual(device.interval_counter, 24)
+        return
+
+    def test_schedule_5(self):
+        device = GMH3710(address=1, interval=0.02, timeout=0.1)
+        device.serial = TestBusSerial()
+        device.default_schedule()
+
+        thread = threading.Thread(target=device.run_loop)
+        thread.start()
+
+        time.sleep(0.2)
+        device.abort = True
+        thread.join(2.0)
+
+        frames = set(device.serial.frames)
+
+        self.assertFalse(device.active)
+        self.assertGreaterEqual(device.data.len, 3)
+        self.assertEqual(device.data.len, device.interval_counter)
+        self.assertEqual(len(frames), 7)
+        return
@@ -4,7 +4,7 @@ import easyb.command
 import easyb.message.stream
 
 from easyb.definitions import Length
-from easyb.bit import debug_data
+from easyb.bit import debug_data, create_crc
 
 
 # noinspection DuplicatedCode
@@ -31,7 +31,7 @@ class TestStream(unittest.TestCase):
         self.assertIsNotNone(stream)
         self.assertEqual(stream.len, 3)
         self.assertIs(stream.length, Length.Byte3)
-        self.assertEqual(stream.data, data1)
+        self.assertEqual(stream.data, bytearray(data1))
         self.assertEqual(stream.bytes, data2)
         self.assertEqual(repr(stream), data3)
         self.assertEqual(str(stream), data3)
@@ -47,7 +47,7 @@ class TestStream(unittest.TestCase):
         self.assertIsNotNone(stream)
         self.assertEqual(stream.len, 6)
         self.assertIs(stream.length, Length.Byte6)
-        self.assertEqual(stream.data, data1)
+        self.assertEqual(stream.data, bytearray(data1))
         self.assertEqual(stream.bytes, data2)
         self.assertEqual(repr(stream), data3)
         self.assertEqual(str(stream), data3)
@@ -63,12 +63,75 @@ class TestStream(unittest.TestCase):
         self.assertIsNotNone(stream)
         self.assertEqual(stream.len, 9)
         self.assertIs(stream.length, Length.Byte9)
-        self.assertEqual(stream.data, data1)
+        self.assertEqual(stream.data, bytearray(data1))
         self.assertEqual(stream.bytes, data2)
         self.assertEqual(repr(stream), data3)
         self.assertEqual(str(stream), data3)
         return
 
+    def test_stream_4(self):
+        header = [0xfe, 0x05, 0x26]
+        data = [0x71, 0x00, 0x48, 0xe3, 0x54, 0x28]
+
+        stream = easyb.message.stream.Stream(Length.Byte3)
+        check1 = stream.decode(bytes(header))
+        check2 = stream.append(bytes(data))
+
+        self.assertTrue(check1)
+        self.assertTrue(check2)
+        self.assertIsInstance(stream.data, bytearray)
+        self.assertEqual(stream.header, bytes(header))
+        self.assertEqual(stream.payload, bytes(data))
+        self.assertEqual(stream.payload[3], 0xe3)
+        return
+
+    def test_stream_5(self):
+        header = [0xfe, 0x05, 0x26]
+        data = [0x71, 0x00, 0x48, 0xe3, 0x54, 0x28]
+
+        stream = easyb.message.stream.Stream(Length.Byte3)
+        check1 = stream.decode(bytes(header))
+
+        # the stream can still grow while the header is referenced
+        result = stream.header
+        check2 = stream.append(bytes(data))
+        stream.length = Length.Byte9
+
+        self.assertTrue(check1)
+        self.assertTrue(check2)
+        self.assertEqual(result, bytes(header))
+        self.assertEqual(stream.len, 9)
+        self.assertEqual(stream.payload, bytes(data))
+        return
+
+    def test_stream_6(self):
+        header = [0xfe, 0x05, 0x26]
+        data = [0x71, 0x00, 0x48, 0xe3, 0x54, 0x28]
+
+        stream = easyb.message.stream.Stream(Length.Byte3)
+        stream.decode(bytes(header + data))
+
+        with stream.views() as (view1, view2):
+            self.assertEqual(view1.tobytes(), bytes(header))
+            self.assertEqual(view2[3], 0xe3)
+
+            # the views share the memory of the stream
+            stream.data[4] = 0x55
+            self.assertEqual(view2[1], 0x55)
+            self.assertIs(view1.obj, stream.data)
+
+            with self.assertRaises(BufferError):
+                stream.data.extend(bytes(3))
+
+        check = stream.append(bytes(data))
+
+        self.assertTrue(check)
+        self.assertEqual(stream.len, 15)
+
+        with self.assertRaises(ValueError):
+            view1.tobytes()
+        return
+
     def test_encode_1(self):
         data = [1, 0, 0]
 
@@ -78,7 +141,7 @@ class TestStream(unittest.TestCase):
 
         self.assertTrue(check1)
         self.assertTrue(check2)
-        self.assertEqual(stream.data, [0xfe, 0, 0x3d])
+        self.assertEqual(stream.data, bytearray([0xfe, 0, 0x3d]))
         return
 
     def test_encode_2(self):
@@ -90,7 +153,7 @@ class TestStream(unittest.TestCase):
 
         self.assertTrue(check1)
         self.assertTrue(check2)
-        self.assertEqual(stream.data, [0xfc, 0xf2, 0xc7, 0x35, 0x0, 0x47])
+        self.assertEqual(stream.data, bytearray([0xfc, 0xf2, 0xc7, 0x35, 0x0, 0x47]))
         return
 
     def test_encode_3(self):
@@ -102,7 +165,7 @@ class TestStream(unittest.TestCase):
 
         self.assertFalse(check1)
         self.assertFalse(check2)
-        self.assertEqual(stream.data, [0, 0, 0, 0, 0, 0])
+        self.assertEqual(stream.data, bytearray([0, 0, 0, 0, 0, 0]))
         return
 
     def test_decode_1(self):
@@ -115,7 +178,7 @@ class TestStream(unittest.TestCase):
 
         self.assertTrue(check1)
         self.assertTrue(check2)
-        self.assertEqual(stream.data, header)
+        self.assertEqual(stream.data, bytearray(header))
         return
 
     def test_decode_2(self):
@@ -160,7 +223,7 @@ class TestStream(unittest.TestCase):
 
         self.assertTrue(check1)
         self.assertTrue(check2)
-        self.assertEqual(stream.data, header)
+        self.assertEqual(stream.data, bytearray(header))
 
         stream.append(bytes(data))
         stream.length = Length.Byte9
@@ -170,7 +233,7 @@ class TestStream(unittest.TestCase):
 
         self.assertTrue(check3)
         self.assertTrue(check4)
-        self.assertEqual(stream.data, all_data)
+        self.assertEqual(stream.data, bytearray(all_data))
         return
 
     def test_verify_length_1(self):
@@ -308,3 +371,100 @@ class TestStream(unittest.TestCase):
         check2 = stream.append(bytes(data))
         self.assertFalse(check2)
         return
+
+    def test_append_4(self):
+        header = [0xfe, 0x07, 0x28]
+        data = []
+
+        for n in range(32):
+            data.append(n)
+            data.append(255 - n)
+            data.append(create_crc(n, 255 - n))
+
+        stream = easyb.message.stream.Stream(Length.Byte3)
+        check1 = stream.decode(bytes(header))
+        self.assertTrue(check1)
+
+        check2 = stream.append(bytes(data))
+        self.assertTrue(check2)
+        self.assertEqual(stream.len, 99)
+        return
+
+    def test_append_5(self):
+        header = [0xfe, 0x07, 0x28]
+        data = []
+
+        for n in range(32):
+            data.append(n)
+            data.append(255 - n)
+            data.append(create_crc(n, 255 - n))
+
+        data[50] = data[50] ^ 0x01
+
+        stream = easyb.message.stream.Stream(Length.Byte3)
+        check1 = stream.decode(bytes(header))
+        self.assertTrue(check1)
+
+        check2 = stream.append(bytes(data))
+        self.assertFalse(check2)
+        return
+
+    def test_append_6(self):
+        header = [0xfe, 0x07, 0x28]
+        data = [0x71, 0x00, 0x48, 0xe3, 0x54, 0x28]
+
+        stream = easyb.message.stream.Stream(Length.Byte3)
+        check1 = stream.decode(bytes(header))
+        self.assertTrue(check1)
+        self.assertEqual(stream.verified, 3)
+
+        check2 = stream.append(bytes(data[0:3]))
+        self.assertTrue(check2)
+        self.assertEqual(stream.verified, 6)
+
+        # verified triplets are not checked again
+        stream.data[2] = 0x00
+
+        check3 = stream.append(bytes(data[3:6]))
+        self.assertTrue(check3)
+        self.assertEqual(stream.verified, 9)
+        self.assertEqual(stream.failed, -1)
+        return
+
+    def test_append_7(self):
+        header = [0xfe, 0x07, 0x28]
+        data1 = [0x71, 0x00, 0x48]
+        data2 = [0xe3, 0x54, 0x29, 0x71, 0x00, 0x48]
+
+        stream = easyb.message.stream.Stream(Length.Byte3)
+        check1 = stream.decode(bytes(header))
+        check2 = stream.append(bytes(data1))
+        check3 = stream.append(bytes(data2))
+
+        self.assertTrue(check1)
+        self.assertTrue(check2)
+        self.assertFalse(check3)
+        self.assertEqual(stream.failed, 2)
+        self.assertEqual(stream.verified, 6)
+        return
+
+    def test_append_8(self):
+        header = [0xfe, 0x07, 0x28]
+        data = []
+
+        for n in range(32):
+            data.append(n)
+            data.append(255 - n)
+            data.append(create_crc(n, 255 - n))
+
+        data[50] = data[50] ^ 0x01
+
+        stream = easyb.message.stream.Stream(Length.Byte3)
+        check1 = stream.decode(bytes(header))
+        check2 = stream.append(bytes(data))
+
+        self.assertTrue(check1)
+        self.assertFalse(check2)
+        self.assertEqual(stream.failed, 17)
+        self.assertEqual(stream.verified, 51)
+        return
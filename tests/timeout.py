@@ -0,0 +1,123 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+#
+#    Copyright (C) 2017, Kai Raphahn <kai.raphahn@laburec.de>
+#
+
+import unittest
+
+from easyb.timeout import AdaptiveTimeout
+
+
+# noinspection DuplicatedCode
+class TestTimeout(unittest.TestCase):
+    """Testing class for adaptive timeout module."""
+
+    def setUp(self):
+        """set up test.
+        """
+        return
+
+    def tearDown(self):
+        """tear down test.
+        """
+        return
+
+    def test_adaptive_1(self):
+        timeout = AdaptiveTimeout(floor=0.05, ceiling=2.0)
+
+        self.assertEqual(timeout.get(1), 2.0)
+        self.assertEqual(timeout.get_percentile(1), 0.0)
+        return
+
+    def test_adaptive_2(self):
+        timeout = AdaptiveTimeout(floor=0.05, ceiling=2.0, percentile=95.0, factor=2.0, window=20)
+
+        for n in range(19):
+            timeout.add(1, 0.1)
+        timeout.add(1, 0.3)
+
+        self.assertEqual(timeout.get_percentile(1), 0.1)
+        self.assertAlmostEqual(timeout.get(1), 0.2)
+        self.assertEqual(timeout.get(2), 2.0)
+        return
+
+    def test_adaptive_3(self):
+        timeout = AdaptiveTimeout(floor=0.05, ceiling=0.5)
+
+        timeout.add(1, 0.001)
+        timeout.add(2, 1.0)
+
+        self.assertEqual(timeout.get(1), 0.05)
+        self.assertEqual(timeout.get(2), 0.5)
+
+        timeout.reset(2)
+        self.assertEqual(timeout.get(2), 0.5)
+        return
+
+    def test_adaptive_4(self):
+        timeout = AdaptiveTimeout(window=4)
+
+        for n in range(4):
+            timeout.add(1, 1.0)
+
+        for n in range(4):
+            timeout.add(1, 0.1)
+
+        self.assertEqual(timeout.get_percentile(1), 0.1)
+        return
+
+    def test_adaptive_5(self):
+        with self.assertRaises(ValueError):
+            AdaptiveTimeout(floor=1.0, ceiling=0.5)
+
+        with self.assertRaises(ValueError):
+            AdaptiveTimeout(probe=0)
+        return
+
+    def test_adaptive_6(self):
+        timeout = AdaptiveTimeout(floor=0.05, ceiling=2.0, probe=8)
+
+        result = []
+        for n in range(20):
+            result.append(timeout.get(1))
+            timeout.miss(1)
+
+        probes = [n for (n, value) in enumerate(result) if value == 2.0]
+
+        self.assertEqual(probes, [0, 1, 2, 4, 8, 16])
+        self.assertEqual(result[3], 0.05)
+        self.assertEqual(timeout.get_misses(1), 20)
+
+        timeout.add(1, 0.1)
+
+        self.assertEqual(timeout.get_misses(1), 0)
+        self.assertAlmostEqual(timeout.get(1), 0.2)
+        return
+
+    def test_adaptive_7(self):
+        timeout = AdaptiveTimeout(floor=0.05, ceiling=2.0)
+
+        timeout.add(1, 0.1)
+        timeout.miss(1)
+        self.assertEqual(timeout.get(1), 2.0)
+
+        timeout.miss(1)
+        timeout.miss(1)
+        self.assertAlmostEqual(timeout.get(1), 0.2)
+
+        timeout.reset(1)
+        self.assertEqual(timeout.get_misses(1), 0)
+        return